@@ -0,0 +1,99 @@
+"""
+Workflow Artifact Hand-Off Benchmark
+
+Runs a four-stage pipeline (extraction -> pricing -> visualization -> report)
+over synthetic products, serializing every message as workflow checkpointing
+and DevUI tracing do. By value, each message carries the product list and the
+pricing and visualization stages each rebuild a DataFrame from dicts. By
+reference, messages carry an ArtifactStore reference and both stages share
+one DataFrame, loaded once from the products file. Extra analysis stages are
+added to show how cost grows with pipeline length.
+
+Usage:
+    python benchmarks/bench_artifacts.py [products]
+"""
+
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from competitive_artifacts import ArtifactStore  # noqa: E402
+from competitive_products import ProductWriter  # noqa: E402
+
+
+def make_products(count: int, seed: int = 2) -> list:
+    rng = random.Random(seed)
+    return [{
+        "product_name": f"Product {i}",
+        "sku": f"SKU-{i:07d}",
+        "price": round(rng.uniform(20, 3000), 2),
+        "category": rng.choice(["Seating", "Desks", "Storage", "Tables"]),
+        "manufacturer": f"Maker {i % 40}",
+        "source_file": f"catalog_{i % 200:03d}.pdf",
+    } for i in range(count)]
+
+
+def by_value(products: list, frame_stages: int) -> int:
+    message_bytes = 0
+    message = {"products": products}
+    for _ in range(frame_stages):
+        message_bytes += len(json.dumps(message))
+        frame = pd.DataFrame(products)
+        pd.to_numeric(frame["price"], errors="coerce").describe()
+        message = {"analysis": "...", "products": products}
+    message_bytes += len(json.dumps(message))
+    return message_bytes
+
+
+def by_reference(store: ArtifactStore, path: Path, rows: int, frame_stages: int) -> int:
+    message_bytes = 0
+    message = {"products": store.put_file(path, rows=rows, run="bench"), "product_count": rows}
+    for _ in range(frame_stages):
+        message_bytes += len(json.dumps(message))
+        frame = store.get(message["products"])
+        pd.to_numeric(frame["price"], errors="coerce").describe()
+        message = {**message, "analysis": "..."}
+    message_bytes += len(json.dumps(message))
+    store.release_run("bench")
+    return message_bytes
+
+
+def measure(fn, *args) -> tuple:
+    tracemalloc.start()
+    start = time.perf_counter()
+    message_bytes = fn(*args)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return seconds, peak, message_bytes
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    products = make_products(count)
+
+    print("=" * 78)
+    print(f"📦 ARTIFACT HAND-OFF ({count:,} products, messages serialized per stage)")
+    print("=" * 78)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "extracted_products.jsonl"
+        with ProductWriter(path) as writer:
+            for product in products:
+                writer.write(product)
+
+        for frame_stages in (2, 4, 8):
+            seconds, peak, message_bytes = measure(by_value, products, frame_stages)
+            print(f"by value      {frame_stages} frame stages  {seconds:>6.2f}s  peak {peak:>7.1f} MB  "
+                  f"messages {message_bytes / 1e6:>7.1f} MB")
+            seconds, peak, message_bytes = measure(by_reference, ArtifactStore(), path, count, frame_stages)
+            print(f"by reference  {frame_stages} frame stages  {seconds:>6.2f}s  peak {peak:>7.1f} MB  "
+                  f"messages {message_bytes / 1e3:>7.1f} kB")
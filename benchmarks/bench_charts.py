@@ -0,0 +1,90 @@
+"""
+Chart Rendering Benchmark
+
+Renders the visualization stage's charts for synthetic pricing data. In the
+event loop, charts are drawn one after another inside the async handler;
+with ChartRenderer, they are drawn in a process pool (cold: including worker
+start-up, warm: workers running) and unchanged charts come from the render
+cache. While rendering, a ticker task measures how long the event loop is
+blocked (the latency every other workflow task and DevUI request sees).
+
+Usage:
+    python benchmarks/bench_charts.py [products] [workers]
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_pricing import make_products  # noqa: E402
+from competitive_charts import ChartRenderer, chart_specs, render_chart  # noqa: E402
+from competitive_pricing import analyze_pricing  # noqa: E402
+
+
+async def with_ticker(coro) -> tuple:
+    """Run coro while a 10 ms ticker records the worst event-loop delay; returns (result, seconds, worst stall)."""
+    worst = 0.0
+    done = asyncio.Event()
+
+    async def ticker():
+        nonlocal worst
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            worst = max(worst, time.perf_counter() - start - 0.01)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    result = await coro
+    seconds = time.perf_counter() - start
+    done.set()
+    await task
+    return result, seconds, worst
+
+
+async def in_event_loop(specs: list, folder: Path) -> int:
+    """The blocking way: draw every chart inside the async handler."""
+    for spec in specs:
+        render_chart(spec, str(folder / f"{spec['name']}.png"))
+    return len(specs)
+
+
+async def main(count: int, workers: int) -> None:
+    pricing = analyze_pricing(make_products(count))
+    specs = chart_specs(pricing)
+
+    print("=" * 78)
+    print(f"📊 CHART RENDERING ({len(specs)} charts from {count:,} products, {workers} worker processes)")
+    print("=" * 78)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _, seconds, stall = await with_ticker(in_event_loop(specs, Path(tmp)))
+        print(f"{'in event loop':<24} {seconds:>6.2f}s  worst loop stall {stall * 1000:>7.0f} ms")
+
+    renderer = ChartRenderer(max_workers=workers)
+    with tempfile.TemporaryDirectory() as cold, tempfile.TemporaryDirectory() as warm:
+        for label, folder in (("process pool (cold)", cold), ("process pool (warm)", warm), ("unchanged (cache)", warm)):
+            result, seconds, stall = await with_ticker(renderer.render(specs, Path(folder)))
+            print(f"{label:<24} {seconds:>6.2f}s  worst loop stall {stall * 1000:>7.0f} ms  "
+                  f"{len(result.rendered)} rendered, {len(result.cached)} cached")
+
+        # New data for one category only: its chart and the cross-category charts are redrawn
+        products = make_products(count)
+        desks = products["category"] == "Desks"
+        products.loc[desks, "price"] = products.loc[desks, "price"].map(
+            lambda price: price * 1.1 if isinstance(price, float) else price)
+        result, seconds, stall = await with_ticker(renderer.render(chart_specs(analyze_pricing(products)), Path(warm)))
+        print(f"{'Desks prices changed':<24} {seconds:>6.2f}s  worst loop stall {stall * 1000:>7.0f} ms  "
+              f"{len(result.rendered)} rendered, {len(result.cached)} cached")
+    renderer.shutdown()
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    asyncio.run(main(count, workers))
@@ -0,0 +1,129 @@
+"""
+Agent Client Pool Benchmark
+
+Measures per-request setup overhead of the extraction executor against local
+stand-ins for the Azure AI project client and AzureCliCredential (token
+acquisition, connection setup and agent create/delete latencies). Before:
+every request builds a new credential and client for ingestion, a second
+credential and client for the agent, and creates and deletes the service
+agent. After: one AgentClientPool shared by all requests. A second section
+shows refresh-ahead: callers keep getting tokens without stalling while the
+cached token approaches expiry.
+
+Usage:
+    python benchmarks/bench_client_pool.py [requests]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from competitive_clients import (  # noqa: E402
+    AgentClientPool,
+    CachedTokenCredential,
+    LocalCredential,
+    LocalProjectClient,
+)
+
+TOKEN_LATENCY = 0.8
+CONNECT_LATENCY = 0.15
+NAME, INSTRUCTIONS = "DataExtractionAgent", "Extract ALL products from the named PDF catalog."
+
+
+def local_client(credential, backend=None) -> LocalProjectClient:
+    client = LocalProjectClient(credential, connect_latency=CONNECT_LATENCY)
+    if backend is not None:
+        # Separate clients, same service: share the stored resources
+        client.agents.stored_vector_stores = backend.stored_vector_stores
+        client.agents.stored_agents = backend.stored_agents
+    return client
+
+
+async def per_request_setup(requests: int) -> tuple:
+    """Original executor: new credentials, clients and agent on every request."""
+    backend = local_client(LocalCredential(latency=0)).agents
+    store = await backend.vector_stores.create_and_poll(name="competitive_intelligence_store")
+    latencies, acquisitions = [], 0
+    for _ in range(requests):
+        start = time.perf_counter()
+        credentials = [LocalCredential(latency=TOKEN_LATENCY), LocalCredential(latency=TOKEN_LATENCY)]
+        ingestion, agent_client = local_client(credentials[0], backend), local_client(credentials[1], backend)
+        await ingestion.agents.vector_stores.get(store.id)
+        agent = await agent_client.agents.create_agent(model="gpt-4o", name=NAME, instructions=INSTRUCTIONS)
+        # ... extraction runs here (same cost either way) ...
+        await agent_client.agents.delete_agent(agent.id)
+        await ingestion.close()
+        await agent_client.close()
+        latencies.append(time.perf_counter() - start)
+        acquisitions += sum(credential.acquisitions for credential in credentials)
+    return latencies, acquisitions, len(backend.stored_agents)
+
+
+async def pooled(requests: int) -> tuple:
+    """AgentClientPool: credential, client and agent definition shared across requests."""
+    credential = LocalCredential(latency=TOKEN_LATENCY)
+    pool = AgentClientPool(
+        endpoint="https://local", model="gpt-4o",
+        credential_factory=lambda: credential,
+        project_client_factory=lambda endpoint, cached: local_client(cached),
+        agent_factory=lambda project_client, agent_id, name: agent_id,
+    )
+    store = await pool.agents.vector_stores.create_and_poll(name="competitive_intelligence_store")
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        await pool.agents.vector_stores.get(store.id)
+        await pool.agent(NAME, INSTRUCTIONS, [store.id])
+        latencies.append(time.perf_counter() - start)
+    stats = pool.stats()
+    agents = pool.agents
+    await pool.aclose()
+    return latencies, credential.acquisitions, stats, len(agents.stored_agents)
+
+
+async def token_stalls(refresh_margin: float, seconds: float = 5.0, lifetime: float = 34) -> tuple:
+    """Call get_token every 100 ms while the token nears expiry; returns (worst call, acquisitions, background)."""
+    credential = CachedTokenCredential(LocalCredential(latency=TOKEN_LATENCY, lifetime=lifetime),
+                                       refresh_margin=refresh_margin)
+    await credential.get_token("https://ai.azure.com/.default")
+    worst, deadline = 0.0, time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        await credential.get_token("https://ai.azure.com/.default")
+        worst = max(worst, time.perf_counter() - start)
+        await asyncio.sleep(0.1)
+    stats = credential.stats()
+    await credential.close()
+    return worst, stats["acquisitions"], stats["background_refreshes"]
+
+
+async def main(requests: int) -> None:
+    print("=" * 78)
+    print(f"🔌 CLIENT POOL ({requests} requests, token {TOKEN_LATENCY * 1000:.0f} ms, "
+          f"connect {CONNECT_LATENCY * 1000:.0f} ms per new client)")
+    print("=" * 78)
+
+    latencies, acquisitions, leftover = await per_request_setup(requests)
+    print(f"{'per-request setup':<20} first {latencies[0] * 1000:>6.0f} ms  "
+          f"median {statistics.median(latencies) * 1000:>6.0f} ms  total {sum(latencies):>5.1f}s  "
+          f"{acquisitions} tokens, {requests} agents created")
+    latencies, acquisitions, stats, leftover = await pooled(requests)
+    print(f"{'AgentClientPool':<20} first {latencies[0] * 1000:>6.0f} ms  "
+          f"median {statistics.median(latencies) * 1000:>6.0f} ms  total {sum(latencies):>5.1f}s  "
+          f"{acquisitions} tokens, {stats['agents_created']} agents created, {stats['agent_reuses']} reused")
+    print(f"{'':<20} agents left after aclose(): {leftover}")
+
+    print("-" * 78)
+    print("🔑 Token nearing expiry (get_token every 100 ms for 5 s)")
+    for label, margin in (("refresh on expiry", 0), ("refresh ahead", 32)):
+        worst, acquisitions, background = await token_stalls(margin)
+        print(f"{label:<20} worst call {worst * 1000:>6.0f} ms  "
+              f"{acquisitions} acquisitions ({background} in background)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20))
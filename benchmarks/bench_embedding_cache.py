@@ -0,0 +1,70 @@
+"""
+Mem0 Embedding Cache Benchmark
+
+Runs concurrent embed() calls against the deterministic FakeEmbedder (with a
+simulated remote latency) directly and through CachedEmbedder, and reports
+wall time, upstream request count, hit rate and average batch size. A second
+cached pass reopens the on-disk cache to show warm-start behaviour.
+
+Usage:
+    python benchmarks/bench_embedding_cache.py
+"""
+
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mem0_embedding_cache import CachedEmbedder, EmbeddingStore, FakeEmbedder  # noqa: E402
+
+DIMS = 1536
+CALLS = 2_000
+DISTINCT_TEXTS = 300
+THREADS = 32
+REQUEST_LATENCY_MS = 40.0
+PER_TEXT_LATENCY_MS = 0.2
+
+
+def workload(seed: int = 7):
+    """Zipf-like mix of repeated memory texts, like a busy agent's add/search traffic."""
+    rng = random.Random(seed)
+    texts = [f"user {i % 40} prefers {['aisle', 'window'][i % 2]} seats and hotel tier {i}"
+             for i in range(DISTINCT_TEXTS)]
+    weights = [1 / (rank + 1) for rank in range(DISTINCT_TEXTS)]
+    return rng.choices(texts, weights, k=CALLS)
+
+
+def run(label: str, embed, texts, upstream: FakeEmbedder) -> None:
+    before = upstream.requests
+    start = time.perf_counter()
+    with ThreadPoolExecutor(THREADS) as pool:
+        list(pool.map(embed, texts))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {elapsed:>8.2f}s  {len(texts) / elapsed:>9.0f} embeds/s  "
+          f"{upstream.requests - before:>6} upstream requests")
+
+
+if __name__ == "__main__":
+    texts = workload()
+
+    print("=" * 78)
+    print(f"🧠 EMBEDDING CACHE ({CALLS} calls, {DISTINCT_TEXTS} distinct texts, {THREADS} threads)")
+    print("=" * 78)
+
+    upstream = FakeEmbedder(DIMS, REQUEST_LATENCY_MS, PER_TEXT_LATENCY_MS)
+    run("direct", upstream.embed, texts, upstream)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cached = CachedEmbedder(upstream, EmbeddingStore(cache_dir, DIMS), model="fake")
+        run("cached (cold)", cached.embed, texts, upstream)
+        print(f"{'':<22} {cached.stats()}")
+        cached.close()
+
+        warm = CachedEmbedder(upstream, EmbeddingStore(cache_dir, DIMS), model="fake")
+        run("cached (reopened)", warm.embed, texts, upstream)
+        print(f"{'':<22} {warm.stats()}")
+        warm.close()
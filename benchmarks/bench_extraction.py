@@ -0,0 +1,114 @@
+"""
+Product Extraction Benchmark
+
+Simulates the extraction agent as a token stream (fixed time to first token,
+then a steady output rate and a cap on output tokens per reply). Compares
+one reply covering every catalog, parsed by splitting on ``` fences like the
+original DataExtractionExecutor, against per-catalog fan-out through
+extract_per_file at several concurrency caps. Also reports raw
+ProductStreamParser throughput.
+
+Usage:
+    python benchmarks/bench_extraction.py
+"""
+
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from competitive_extraction import ProductStreamParser, extract_per_file  # noqa: E402
+
+CATALOGS = 24
+PRODUCTS_PER_CATALOG = 40
+SHARED_SKUS = 0.15            # fraction of products also listed in another catalog
+FIRST_TOKEN_S = 1.5
+TOKENS_PER_S = 2000           # simulated; real models are ~50-150 tok/s, scaled down to keep the run short
+MAX_OUTPUT_TOKENS = 16000
+CHARS_PER_TOKEN = 4
+
+
+def make_catalogs(seed: int = 9) -> dict:
+    rng = random.Random(seed)
+    catalogs = {}
+    for c in range(CATALOGS):
+        products = []
+        for p in range(PRODUCTS_PER_CATALOG):
+            shared = rng.random() < SHARED_SKUS
+            sku = f"SH-{rng.randrange(50):03d}" if shared else f"C{c:02d}-{p:04d}"
+            products.append({
+                "product_name": f"{rng.choice(['Oak', 'Walnut', 'Steel', 'Mesh'])} "
+                                f"{rng.choice(['Desk', 'Chair', 'Cabinet', 'Table'])} {p}",
+                "sku": sku,
+                "price": round(rng.uniform(50, 2500), 2),
+                "category": rng.choice(["Seating", "Desks", "Storage"]),
+                "manufacturer": f"Maker {c % 6}",
+                "source_file": f"catalog_{c:02d}.pdf",
+            })
+        catalogs[f"catalog_{c:02d}.pdf"] = products
+    return catalogs
+
+
+def reply_text(products: list) -> str:
+    return "Here are the products I found:\n```json\n" + json.dumps(products, indent=2) + "\n```\nLet me know..."
+
+
+async def stream(text: str):
+    """Yield the reply token by token at the simulated rate, cut at MAX_OUTPUT_TOKENS."""
+    await asyncio.sleep(FIRST_TOKEN_S)
+    text = text[:MAX_OUTPUT_TOKENS * CHARS_PER_TOKEN]
+    step = CHARS_PER_TOKEN * 50
+    for start in range(0, len(text), step):
+        await asyncio.sleep(50 / TOKENS_PER_S)
+        yield text[start:start + step]
+
+
+async def single_call(catalogs: dict) -> tuple:
+    everything = [product for products in catalogs.values() for product in products]
+    start = time.perf_counter()
+    text = "".join([chunk async for chunk in stream(reply_text(everything))])
+    if "```json" in text:
+        text = text.split("```json")[1].split("```")[0].strip()
+    try:
+        products = json.loads(text)
+    except json.JSONDecodeError:
+        products = []
+    return time.perf_counter() - start, len(products), 0
+
+
+async def fan_out(catalogs: dict, concurrency: int) -> tuple:
+    result = await extract_per_file(
+        list(catalogs), lambda source: stream(reply_text(catalogs[source])), max_concurrency=concurrency
+    )
+    return result.seconds, len(result.products), result.duplicates
+
+
+def parser_throughput(catalogs: dict) -> float:
+    text = reply_text([product for products in catalogs.values() for product in products]) * 20
+    start = time.perf_counter()
+    parser = ProductStreamParser()
+    for offset in range(0, len(text), 16):
+        parser.feed(text[offset:offset + 16])
+    parser.close()
+    return len(text) / 1e6 / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    catalogs = make_catalogs()
+    unique = len({product["sku"] for products in catalogs.values() for product in products})
+
+    print("=" * 78)
+    print(f"🔍 PRODUCT EXTRACTION ({CATALOGS} catalogs x {PRODUCTS_PER_CATALOG} products, {unique} unique SKUs, "
+          f"{MAX_OUTPUT_TOKENS} max output tokens)")
+    print("=" * 78)
+
+    seconds, products, duplicates = asyncio.run(single_call(catalogs))
+    print(f"{'single call':<16} {seconds:>6.2f}s  {products:>5} products  {duplicates:>4} duplicates merged")
+    for concurrency in (1, 4, 8):
+        seconds, products, duplicates = asyncio.run(fan_out(catalogs, concurrency))
+        print(f"{f'per-file x{concurrency}':<16} {seconds:>6.2f}s  {products:>5} products  {duplicates:>4} duplicates merged")
+    print(f"{'parser':<16} {parser_throughput(catalogs):.1f} MB/s streamed in 16-char chunks")
@@ -0,0 +1,54 @@
+"""
+Flight Inventory Lookup Benchmark
+
+Measures build time and (origin, destination, date) lookup latency of the
+indexed flight inventory at increasing table sizes.
+
+Usage:
+    python benchmarks/bench_flight_inventory.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from travel_flights import FlightInventory  # noqa: E402
+
+SIZES = [10_000, 100_000, 1_000_000]
+QUERIES = 20_000
+
+
+def bench(n_rows: int) -> None:
+    start = time.perf_counter()
+    inventory = FlightInventory.generate(n_rows)
+    build_s = time.perf_counter() - start
+
+    rng = np.random.default_rng(0)
+    origin = rng.integers(0, inventory.n_cities, QUERIES)
+    destination = (origin + rng.integers(1, inventory.n_cities, QUERIES)) % inventory.n_cities
+    day = rng.integers(0, inventory.days, QUERIES)
+    passengers = rng.integers(1, 5, QUERIES)
+
+    latencies = np.empty(QUERIES)
+    hits = 0
+    for i in range(QUERIES):
+        t0 = time.perf_counter()
+        hits += len(inventory.lookup(int(origin[i]), int(destination[i]), int(day[i]), int(passengers[i])))
+        latencies[i] = time.perf_counter() - t0
+
+    us = latencies * 1e6
+    print(f"{n_rows:>10,} rows | build {build_s * 1000:8.1f} ms | "
+          f"p50 {np.percentile(us, 50):6.1f} us | p99 {np.percentile(us, 99):6.1f} us | "
+          f"avg results {hits / QUERIES:5.2f}")
+
+
+if __name__ == "__main__":
+    print("=" * 90)
+    print("✈️  FLIGHT INVENTORY LOOKUP BENCHMARK")
+    print("=" * 90)
+    for size in SIZES:
+        bench(size)
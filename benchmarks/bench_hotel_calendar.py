@@ -0,0 +1,58 @@
+"""
+Hotel Availability Benchmark
+
+Measures memory footprint and multi-night stay query latency of the hotel
+availability calendar over a 365-night horizon.
+
+Usage:
+    python benchmarks/bench_hotel_calendar.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from travel_cities import CITIES  # noqa: E402
+from travel_hotels import HotelCalendar  # noqa: E402
+
+SIZES = [1_000, 10_000, 50_000]
+STAY_LENGTHS = [1, 3, 7, 14]
+HORIZON = 365
+QUERIES = 2_000
+
+
+def bench(n_hotels: int) -> None:
+    start = time.perf_counter()
+    calendar = HotelCalendar.generate(n_hotels, days=HORIZON)
+    build_s = time.perf_counter() - start
+    print(f"\n{n_hotels:,} hotels | build {build_s:.2f} s | {calendar.nbytes / 1e6:.1f} MB")
+
+    rng = np.random.default_rng(0)
+    for nights in STAY_LENGTHS:
+        city = rng.integers(0, len(CITIES), QUERIES)
+        first = rng.integers(0, HORIZON - nights, QUERIES)
+        guests = rng.integers(1, 6, QUERIES)
+
+        latencies = np.empty(QUERIES)
+        hits = 0
+        for i in range(QUERIES):
+            t0 = time.perf_counter()
+            positions, _ = calendar.lookup(int(city[i]), int(first[i]), int(first[i]) + nights, int(guests[i]))
+            latencies[i] = time.perf_counter() - t0
+            hits += len(positions)
+
+        us = latencies * 1e6
+        print(f"   {nights:>2} nights | p50 {np.percentile(us, 50):7.1f} us | "
+              f"p99 {np.percentile(us, 99):7.1f} us | avg results {hits / QUERIES:7.1f}")
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("🏨 HOTEL AVAILABILITY BENCHMARK")
+    print("=" * 70)
+    for size in SIZES:
+        bench(size)
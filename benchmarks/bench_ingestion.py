@@ -0,0 +1,110 @@
+"""
+Catalog Ingestion Benchmark
+
+Uploads a batch of synthetic PDF-sized files to the LocalAgentsClient stand-in
+(fixed per-request latency plus per-MB transfer time, a few simulated 503s),
+creates a vector store and deletes everything again, first one file at a time
+like the original DataExtractionExecutor loop and then through
+ParallelIngestor at increasing concurrency. Then replays repeat runs in
+incremental mode (IngestionManifest + persistent vector store): unchanged
+inputs, a few edited catalogs, and some removed.
+
+Usage:
+    python benchmarks/bench_ingestion.py [files]
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from competitive_ingestion import IngestionManifest, LocalAgentsClient, ParallelIngestor  # noqa: E402
+
+FAILURE_RATE = 0.02
+
+
+def make_catalogs(directory: Path, count: int, seed: int = 5) -> list:
+    rng = np.random.default_rng(seed)
+    paths = []
+    for i in range(count):
+        path = directory / f"catalog_{i:04d}.pdf"
+        path.write_bytes(rng.bytes(int(rng.integers(200_000, 2_000_000))))
+        paths.append(path)
+    return paths
+
+
+async def serial(paths: list) -> tuple:
+    agents = LocalAgentsClient(failure_rate=FAILURE_RATE)
+    start = time.perf_counter()
+    files = []
+    for path in paths:
+        try:
+            files.append(await agents.files.upload_and_poll(file_path=str(path), purpose="assistants"))
+        except Exception:
+            pass  # the original loop had no retry: a transient error loses the file
+    store = await agents.vector_stores.create_and_poll(file_ids=[f.id for f in files], name="bench")
+    await agents.vector_stores.delete(store.id)
+    for file in files:
+        try:
+            await agents.files.delete(file.id)
+        except Exception:
+            pass
+    return time.perf_counter() - start, len(files), 0, agents.max_inflight
+
+
+async def parallel(paths: list, concurrency: int) -> tuple:
+    agents = LocalAgentsClient(failure_rate=FAILURE_RATE)
+    ingestor = ParallelIngestor(agents, max_concurrency=concurrency, retry_delay=0.05, progress=None)
+    start = time.perf_counter()
+    files, failures = await ingestor.upload_files(paths)
+    store = await ingestor.create_vector_store([f.id for f in files], name="bench")
+    await ingestor.delete_vector_store(store.id)
+    await ingestor.delete_files([f.id for f in files])
+    return time.perf_counter() - start, len(files), ingestor.stats()["retries"], agents.max_inflight
+
+
+async def incremental(paths: list, manifest_path: Path) -> None:
+    agents = LocalAgentsClient()
+    ingestor = ParallelIngestor(agents, max_concurrency=16, progress=None)
+    steps = [
+        ("first run", lambda: None),
+        ("unchanged", lambda: None),
+        ("5 edited", lambda: [path.write_bytes(path.read_bytes() + b"rev2") for path in paths[:5]]),
+        ("3 removed", lambda: [path.unlink() for path in paths[-3:]]),
+    ]
+    for label, change in steps:
+        change()
+        current = sorted(path for path in paths if path.exists())
+        requests = agents.requests
+        start = time.perf_counter()
+        result = await ingestor.sync_vector_store(current, IngestionManifest(manifest_path), name="bench")
+        seconds = time.perf_counter() - start
+        print(f"{label:<14} {seconds:>7.2f}s  {len(result.added):>4} uploaded  {len(result.unchanged):>4} unchanged  "
+              f"{result.removed:>3} removed  {agents.requests - requests:>4} requests")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+
+    print("=" * 78)
+    print(f"⬆️  CATALOG INGESTION ({count} files, {FAILURE_RATE:.0%} transient failures)")
+    print("=" * 78)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = make_catalogs(Path(tmp), count)
+        runs = [("serial", serial(paths))] + [
+            (f"parallel x{concurrency}", parallel(paths, concurrency)) for concurrency in (4, 16, 32)
+        ]
+        for label, run in runs:
+            seconds, uploaded, retries, inflight = asyncio.run(run)
+            print(f"{label:<14} {seconds:>7.2f}s  {uploaded / seconds:>7.1f} files/s  "
+                  f"{uploaded:>4}/{count} uploaded  {retries:>3} retries  max in flight {inflight}")
+
+        print("-" * 78)
+        print("🔁 Incremental runs (content-hash manifest, persistent vector store)")
+        asyncio.run(incremental(paths, Path(tmp) / "manifest.json"))
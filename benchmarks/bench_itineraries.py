@@ -0,0 +1,112 @@
+"""
+Itinerary Routing Benchmark
+
+Measures itinerary search latency, explored search states and how often the
+search finishes inside its budget on synthetic airport networks of growing
+size, per stop limit and objective. Each network places airports at random
+on the globe, links every airport to its nearest neighbours and nearest
+hubs, links the hubs with each other, and schedules flights on every route
+every day.
+
+Usage:
+    python benchmarks/bench_itineraries.py
+    BENCH_AIRPORTS=500,5000 BENCH_FLIGHTS_PER_DAY=3 python benchmarks/bench_itineraries.py
+"""
+
+import os
+import random
+import sys
+import time
+from datetime import date
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from travel_flights import AIRLINES, FlightInventory, haversine_matrix_km  # noqa: E402
+from travel_routes import RouteGraph  # noqa: E402
+
+AIRPORTS = [int(n) for n in os.getenv("BENCH_AIRPORTS", "24,250,1000,2500").split(",")]
+FLIGHTS_PER_DAY = int(os.getenv("BENCH_FLIGHTS_PER_DAY", "2"))
+DAYS = 30
+NEIGHBOURS = 6
+HUB_SHARE = 0.04
+HUBS_PER_AIRPORT = 2
+QUERIES = 100
+STOPS = [0, 1, 2, 3]
+OBJECTIVES = ["price", "duration"]
+
+
+def synthetic_network(n_airports: int, days: int = DAYS, flights_per_day: int = FLIGHTS_PER_DAY,
+                      seed: int = 7) -> Tuple[FlightInventory, np.ndarray]:
+    """A flight table over n_airports synthetic airports, and their distance matrix."""
+    rng = np.random.default_rng(seed)
+    latitude = np.degrees(np.arcsin(rng.uniform(-0.75, 0.95, n_airports)))
+    longitude = rng.uniform(-180, 180, n_airports)
+    distance = haversine_matrix_km(latitude, longitude)
+
+    by_distance = np.argsort(distance, axis=1)
+    hubs = rng.choice(n_airports, max(2, int(n_airports * HUB_SHARE)), replace=False)
+    nearest_hubs = hubs[np.argsort(distance[:, hubs], axis=1)[:, :HUBS_PER_AIRPORT]]
+    routes = np.zeros((n_airports, n_airports), dtype=bool)
+    rows = np.arange(n_airports)[:, None]
+    routes[rows, by_distance[:, 1:NEIGHBOURS + 1]] = True
+    routes[rows, nearest_hubs] = True
+    routes[np.ix_(hubs, hubs)] = True
+    routes |= routes.T
+    np.fill_diagonal(routes, False)
+    route_origin, route_destination = np.nonzero(routes)
+
+    # flights_per_day departures on every route, every day
+    n_rows = len(route_origin) * days * flights_per_day
+    slot = np.arange(n_rows) // flights_per_day
+    route = slot % len(route_origin)
+    origin, destination = route_origin[route], route_destination[route]
+    flown = distance[origin, destination]
+    duration = (flown / 820.0 * 60 + 40) * rng.uniform(0.95, 1.15, n_rows)
+    price = (60 + 0.11 * flown) * rng.lognormal(0.0, 0.25, n_rows)
+    columns = {
+        "origin": origin.astype(np.uint16),
+        "destination": destination.astype(np.uint16),
+        "day": (slot // len(route_origin)).astype(np.uint16),
+        "dep_minute": (rng.integers(6 * 4, 22 * 4, n_rows) * 15).astype(np.uint16),
+        "duration": duration.astype(np.uint16),
+        "price": np.round(price, 2).astype(np.float32),
+        "seats": rng.integers(0, 60, n_rows).astype(np.uint16),
+        "airline": rng.integers(0, len(AIRLINES), n_rows).astype(np.uint8),
+        "number": rng.integers(100, 10000, n_rows).astype(np.uint16),
+    }
+    return FlightInventory(date.today(), days, columns, n_cities=n_airports), distance
+
+
+if __name__ == "__main__":
+    print("=" * 86)
+    print("🧭 ITINERARY SEARCH ON SYNTHETIC AIRPORT NETWORKS")
+    print("=" * 86)
+    for n_airports in AIRPORTS:
+        start = time.perf_counter()
+        inventory, distance = synthetic_network(n_airports)
+        graph = RouteGraph(inventory, distance_km=distance)
+        routes = len(np.unique(inventory.key // (inventory.days * 24 * 60)))
+        print(f"\n{n_airports:,} airports, {routes:,} routes, {len(inventory):,} flights "
+              f"(graph built in {time.perf_counter() - start:.2f}s)")
+
+        rng = random.Random(7)
+        queries = [(*rng.sample(range(n_airports), 2), rng.randint(0, DAYS - 5)) for _ in range(QUERIES)]
+        print(f"{'objective':>9} | {'stops':>5} | {'p50 ms':>8} | {'p99 ms':>8} | {'states p50':>10} | "
+              f"{'complete':>8} | {'found':>5}")
+        for optimize in OBJECTIVES:
+            for max_stops in STOPS:
+                latencies, states, complete, found = [], [], 0, 0
+                for origin, destination, day in queries:
+                    t0 = time.perf_counter()
+                    result = graph.search(origin, destination, day, max_stops=max_stops, optimize=optimize)
+                    latencies.append((time.perf_counter() - t0) * 1000)
+                    states.append(result["explored_states"])
+                    complete += result["complete"]
+                    found += bool(result["itineraries"])
+                print(f"{optimize:>9} | {max_stops:>5} | {np.percentile(latencies, 50):>8.2f} | "
+                      f"{np.percentile(latencies, 99):>8.2f} | {int(np.percentile(states, 50)):>10,} | "
+                      f"{complete / QUERIES:>7.0%} | {found / QUERIES:>4.0%}")
@@ -0,0 +1,129 @@
+"""
+Pricing Analytics Benchmark
+
+Runs analyze_pricing() over synthetic products: prices as numbers or text in
+several currencies and formats, and about a third of the products listed
+again in other catalogs with reformatted SKUs or names. Compares it with a
+row-by-row baseline (per-row price parsing, dict-of-lists statistics and
+pairwise matching) on a sample, checks both find the same matches, and
+extrapolates the pairwise matching cost to the full dataset.
+
+Usage:
+    python benchmarks/bench_pricing.py [products] [baseline sample]
+"""
+
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from competitive_pricing import DEFAULT_RATES, analyze_pricing  # noqa: E402
+
+CATEGORIES = ["Seating", "Desks", "Storage", "Tables", "Lighting", "Acoustics"]
+FORMATS = {
+    "USD": lambda amount: f"${amount:,.2f}",
+    "EUR": lambda amount: f"{amount:,.2f}".replace(",", " ").replace(".", ",").replace(" ", ".") + " EUR",
+    "GBP": lambda amount: f"£{amount:.2f}",
+    "SEK": lambda amount: f"{amount:.0f} SEK",
+}
+
+
+def make_products(count: int, seed: int = 23) -> pd.DataFrame:
+    rng = random.Random(seed)
+    rows = []
+    while len(rows) < count:
+        i = len(rows)
+        category = rng.choice(CATEGORIES)
+        usd = rng.lognormvariate(6, 0.8) * (50 if rng.random() < 0.002 else 1)
+        listings = 1 + (rng.random() < 0.35) + (rng.random() < 0.1)
+        for listing in range(listings):
+            currency = rng.choice(list(FORMATS)) if listing or rng.random() < 0.3 else "USD"
+            amount = round(usd * rng.uniform(0.85, 1.15) / DEFAULT_RATES[currency], 2)
+            sku = f"SKU-{i:07d}" if listing == 0 else rng.choice([f"sku {i:07d}", f"SKU{i:07d}", ""])
+            rows.append({
+                "product_name": f"Model {i} {category} Pro" if listing == 0 else f"model {i} {category.lower()}  pro",
+                "sku": sku or None,
+                "price": amount if currency == "USD" and listing == 0 else FORMATS[currency](amount),
+                "category": category,
+                "manufacturer": f"Maker {i % 40}" if listing == 0 else f"Dealer {rng.randrange(10)}",
+                "source_file": f"catalog_{rng.randrange(200):03d}.pdf",
+            })
+    return pd.DataFrame(rows[:count])
+
+
+def baseline(rows: list) -> dict:
+    """Row-by-row: parse and convert each price, group in dicts, compare every pair of products."""
+    parsed = []
+    for row in rows:
+        price = row["price"]
+        if isinstance(price, str):
+            currency = next((code for symbol, code in (("$", "USD"), ("€", "EUR"), ("£", "GBP")) if symbol in price),
+                            (re.findall(r"\b[A-Z]{3}\b", price) or ["USD"])[0])
+            digits = re.sub(r"[^\d,.\-]", "", price)
+            digits = digits.replace(".", "").replace(",", ".") if re.search(r",\d{1,2}$", digits) else digits.replace(",", "")
+            if re.fullmatch(r"-?[1-9]\d{0,2}(?:\.\d{3})+", digits):
+                digits = digits.replace(".", "")
+            price = float(digits) * DEFAULT_RATES[currency]
+        parsed.append({**row, "usd": price})
+
+    by_manufacturer = {}
+    for row in parsed:
+        by_manufacturer.setdefault(row["manufacturer"], []).append(row["usd"])
+    stats = {maker: (len(prices), statistics.median(prices), statistics.quantiles(prices, n=10) if len(prices) > 1 else [])
+             for maker, prices in by_manufacturer.items()}
+
+    def same(a, b):
+        sku_a = re.sub(r"[^0-9a-z]", "", a["sku"].lower() if isinstance(a["sku"], str) else "")
+        sku_b = re.sub(r"[^0-9a-z]", "", b["sku"].lower() if isinstance(b["sku"], str) else "")
+        if sku_a or sku_b:
+            return sku_a == sku_b
+        name_a = " ".join(re.sub(r"[^0-9a-z]+", " ", a["product_name"].lower()).split())
+        name_b = " ".join(re.sub(r"[^0-9a-z]+", " ", b["product_name"].lower()).split())
+        return a["category"] == b["category"] and name_a == name_b
+
+    matched = set()
+    for x in range(len(parsed)):
+        for y in range(x + 1, len(parsed)):
+            if parsed[x]["source_file"] != parsed[y]["source_file"] and same(parsed[x], parsed[y]):
+                matched.update((x, y))
+    return {"stats": stats, "matched": len(matched)}
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    sample = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+    frame = make_products(count)
+
+    print("=" * 78)
+    print(f"💰 PRICING ANALYTICS ({count:,} products, {frame['source_file'].nunique()} catalogs)")
+    print("=" * 78)
+
+    pricing, seconds = timed(analyze_pricing, frame)
+    s = pricing.summary
+    print(f"{'vectorized':<22} {seconds:>7.2f}s  {s['priced']:,} priced in {s['currencies']} currencies, "
+          f"{s['matched_groups']:,} matched products, {s['outliers']:,} outliers")
+    print(f"{'':<22} {len(pricing.by_manufacturer)} manufacturers, {len(pricing.by_category)} categories, "
+          f"{len(pricing.by_segment)} segments")
+
+    print("-" * 78)
+    head = frame.head(sample)
+    pricing, fast = timed(analyze_pricing, head)
+    vectorized_matched = int((pricing.products["match_catalogs"] > 1).sum())
+    result, slow = timed(baseline, head.to_dict("records"))
+    print(f"{'vectorized':<22} {fast:>7.2f}s  on {sample:,} products, {vectorized_matched:,} listings matched")
+    print(f"{'row-by-row + pairwise':<22} {slow:>7.2f}s  on {sample:,} products, {result['matched']:,} listings matched")
+    # Pairwise matching grows with n^2, the rest linearly
+    estimate = slow * (count / sample) ** 2
+    print(f"{'pairwise at full size':<22} ~{estimate / 3600:>6.1f}h  (extrapolated, n^2)")
@@ -0,0 +1,93 @@
+"""
+Product File Benchmark
+
+Compares the original hand-off (all products kept in a list, json.dump with
+indent=2 at the end, pricing from pd.DataFrame(list)) with appending products
+to JSON Lines as they are extracted and computing the pricing summary from
+chunked reads. Reports wall time and peak Python memory (tracemalloc) of the
+pricing step, and how many products survive a crash at 90% of extraction.
+
+Usage:
+    python benchmarks/bench_product_files.py [products]
+"""
+
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from competitive_products import ProductWriter, read_product_chunks  # noqa: E402
+
+
+def products(count: int, seed: int = 4):
+    rng = random.Random(seed)
+    for i in range(count):
+        yield {
+            "product_name": f"Product {i}",
+            "sku": f"SKU-{i:07d}",
+            "price": round(rng.uniform(20, 3000), 2),
+            "category": rng.choice(["Seating", "Desks", "Storage", "Tables"]),
+            "manufacturer": f"Maker {i % 40}",
+            "source_file": f"catalog_{i % 200:03d}.pdf",
+        }
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    crash_at = int(count * 0.9)
+
+    print("=" * 78)
+    print(f"💾 PRODUCT HAND-OFF ({count:,} products)")
+    print("=" * 78)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = Path(tmp) / "extracted_products.json"
+        jsonl_path = Path(tmp) / "extracted_products.jsonl"
+
+        def in_memory():
+            extracted = list(products(count))
+            with open(json_path, "w", encoding="utf-8") as f:
+                json.dump(extracted, f, indent=2)
+            prices = pd.to_numeric(pd.DataFrame(extracted)["price"], errors="coerce").dropna()
+            return len(prices), prices.min(), prices.max()
+
+        def streamed():
+            with ProductWriter(jsonl_path) as writer:
+                for product in products(count):
+                    writer.write(product)
+            total, low, high = 0, float("inf"), float("-inf")
+            for chunk in read_product_chunks(jsonl_path):
+                prices = pd.to_numeric(chunk["price"], errors="coerce").dropna()
+                total, low, high = total + len(prices), min(low, prices.min()), max(high, prices.max())
+            return total, low, high
+
+        for label, fn in (("list + json.dump", in_memory), ("JSONL + chunks", streamed)):
+            (total, low, high), seconds, peak = measure(fn)
+            print(f"{label:<18} {seconds:>6.2f}s  peak {peak:>7.1f} MB  {total:,} priced (${low:.2f} - ${high:.2f})")
+
+        # Crash at 90%: the list approach never reaches json.dump; JSON Lines keeps every written line
+        writer = ProductWriter(jsonl_path)
+        for i, product in enumerate(products(count)):
+            if i == crash_at:
+                break
+            writer.write(product)
+        survived = sum(len(chunk) for chunk in read_product_chunks(jsonl_path))
+        writer.close()
+        print(f"{'crash at 90%':<18} list: 0 products on disk, JSONL: {survived:,} products on disk")
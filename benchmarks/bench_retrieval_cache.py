@@ -0,0 +1,80 @@
+"""
+Mem0 Retrieval Cache Benchmark
+
+Simulates conversations where each agent turn looks up the user's memories
+(a couple of recurring context queries plus the turn's own question) and
+every few turns stores a new fact. A stand-in Memory charges a fixed
+vector-search round-trip. Reports lookup latency with and without
+CachedMemory, hit rate and time saved.
+
+Usage:
+    python benchmarks/bench_retrieval_cache.py
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mem0_retrieval_cache import CachedMemory, RetrievalCache  # noqa: E402
+
+USERS = 50
+TURNS = 12
+WRITE_EVERY = 4
+SEARCH_LATENCY_S = 0.015
+CONTEXT_QUERIES = ["travel preferences", "Travel preferences?", "dietary restrictions", "budget"]
+QUESTIONS = ["hotels in Paris", "flights to Tokyo", "beach resorts", "museum passes", "train vs flight"]
+
+
+class SimulatedMemory:
+    def __init__(self):
+        self.facts = {}
+        self.searches = 0
+
+    def search(self, query, **kwargs):
+        self.searches += 1
+        time.sleep(SEARCH_LATENCY_S)
+        user = kwargs["filters"]["user_id"]
+        return {"results": [{"memory": fact, "score": 0.5} for fact in self.facts.get(user, [])[-5:]]}
+
+    def add(self, messages, **kwargs):
+        self.facts.setdefault(kwargs["user_id"], []).append(str(messages))
+
+
+def conversations(memory, seed: int = 3) -> np.ndarray:
+    rng = random.Random(seed)
+    latencies = []
+    for turn in range(TURNS):
+        for user in range(USERS):
+            filters = {"user_id": f"user-{user}"}
+            for query in rng.sample(CONTEXT_QUERIES, 2) + [rng.choice(QUESTIONS)]:
+                start = time.perf_counter()
+                memory.search(query, filters=filters, top_k=5)
+                latencies.append((time.perf_counter() - start) * 1000)
+            if turn % WRITE_EVERY == WRITE_EVERY - 1:
+                memory.add(f"fact {turn}", user_id=f"user-{user}")
+    return np.asarray(latencies)
+
+
+if __name__ == "__main__":
+    print("=" * 78)
+    print(f"🗂️  MEM0 RETRIEVAL CACHE ({USERS} users x {TURNS} turns, write every {WRITE_EVERY} turns)")
+    print("=" * 78)
+
+    direct = SimulatedMemory()
+    latencies = conversations(direct)
+    print(f"{'direct':<8} p50 {np.percentile(latencies, 50):>7.3f} ms  p99 {np.percentile(latencies, 99):>7.3f} ms  "
+          f"total {latencies.sum() / 1000:>6.2f}s  {direct.searches} vector searches")
+
+    inner = SimulatedMemory()
+    cached = CachedMemory(inner, RetrievalCache())
+    latencies = conversations(cached)
+    print(f"{'cached':<8} p50 {np.percentile(latencies, 50):>7.3f} ms  p99 {np.percentile(latencies, 99):>7.3f} ms  "
+          f"total {latencies.sum() / 1000:>6.2f}s  {inner.searches} vector searches")
+    stats = cached.cache.stats()
+    print(f"{'':<8} hit rate {stats['hit_rate']:.1%}, saved {stats['saved_ms'] / 1000:.2f}s, "
+          f"{stats['invalidations']} invalidations")
@@ -0,0 +1,95 @@
+"""
+DevUI Startup Benchmark
+
+Profiles `import launch_devui` in fresh interpreters with -X importtime and
+prints the import-time report: median wall time, the slowest modules by
+cumulative import time, and which heavy dependencies were loaded. For
+comparison it also times the import followed by the modules the script used
+to load eagerly (pandas, numpy, matplotlib, seaborn, the Azure AI client and
+credentials), and building the workflow through create_workflow().
+
+Usage:
+    python benchmarks/bench_startup.py [--python PATH] [--runs N] [--top N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+EAGER_MODULES = [
+    "pandas", "numpy", "matplotlib.pyplot", "seaborn",
+    "agent_framework_azure_ai", "azure.identity.aio", "azure.ai.agents.models",
+]
+HEAVY_MODULES = ["pandas", "numpy", "matplotlib", "seaborn", "agent_framework_azure_ai", "azure.identity"]
+
+
+def run(python: str, code: str, importtime: bool = False) -> tuple:
+    """Run code in a fresh interpreter; returns (wall seconds, stdout, stderr)."""
+    env = {**os.environ, "AZURE_AI_PROJECT_ENDPOINT": os.getenv("AZURE_AI_PROJECT_ENDPOINT", "https://example")}
+    wrapped = (
+        "import time; _t = time.perf_counter()\n"
+        f"{code}\n"
+        "print('__wall__', time.perf_counter() - _t)"
+    )
+    args = [python] + (["-X", "importtime"] if importtime else []) + ["-c", wrapped]
+    with tempfile.TemporaryDirectory() as cwd:  # create_workflow() makes folders under the cwd
+        result = subprocess.run(args, cwd=cwd, env={**env, "PYTHONPATH": str(ROOT)}, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else "failed")
+    wall = float(next(line.split()[1] for line in result.stdout.splitlines() if line.startswith("__wall__")))
+    return wall, result.stdout, result.stderr
+
+
+def parse_importtime(stderr: str) -> list:
+    """[(cumulative us, self us, module)] from -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|", 2)
+        rows.append((int(cumulative_us), int(self_us), module.rstrip()))
+    return rows
+
+
+def median_wall(python: str, code: str, runs: int) -> float:
+    return statistics.median(run(python, code)[0] for _ in range(runs))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--python", default=sys.executable, help="Interpreter with the tutorial requirements")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    print("=" * 78)
+    print(f"🚀 DEVUI STARTUP ({args.runs} fresh interpreters per measurement)")
+    print("=" * 78)
+
+    try:
+        _, stdout, stderr = run(args.python, "import launch_devui, sys\n"
+                                f"print('__loaded__', [m for m in {HEAVY_MODULES!r} if m in sys.modules])",
+                                importtime=True)
+    except RuntimeError as e:
+        sys.exit(f"❌ import launch_devui failed: {e}")
+
+    rows = parse_importtime(stderr)
+    total = next(cumulative for cumulative, _, module in rows if module.strip() == "launch_devui")
+    loaded = next(line.split(" ", 1)[1] for line in stdout.splitlines() if line.startswith("__loaded__"))
+    print(f"-X importtime: launch_devui cumulative {total / 1000:.0f} ms; heavy modules loaded: {loaded}")
+    print(f"{'cumulative ms':>14} {'self ms':>8}  module")
+    for cumulative, self_us, module in sorted(rows, reverse=True)[:args.top]:
+        print(f"{cumulative / 1000:>14.1f} {self_us / 1000:>8.1f}  {module}")
+
+    print("-" * 78)
+    lazy = median_wall(args.python, "import launch_devui", args.runs)
+    eager = median_wall(args.python, "import launch_devui, " + ", ".join(EAGER_MODULES), args.runs)
+    build = median_wall(args.python, "import launch_devui; launch_devui.create_workflow()", args.runs)
+    print(f"{'import (lazy)':<34} {lazy * 1000:>8.0f} ms")
+    print(f"{'import + formerly eager modules':<34} {eager * 1000:>8.0f} ms")
+    print(f"{'import + create_workflow()':<34} {build * 1000:>8.0f} ms")
@@ -0,0 +1,65 @@
+"""
+Tool Result Serialization Benchmark
+
+Compares the per-row cost of turning inventory rows into an MCP tool result:
+
+    validated  - Flight(**row) per row in a FlightPage, then FastMCP serializes it (old path)
+    construct  - Flight.model_construct(**row) per row, then FastMCP serializes the page
+    direct     - page dict encoded to JSON once and returned as a ToolResult (current path)
+
+Usage:
+    python benchmarks/bench_tool_serialization.py
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastmcp.tools import Tool  # noqa: E402
+
+from travel_flights import FlightInventory  # noqa: E402
+from travel_mcp_server import Flight, FlightPage, _encoded_result  # noqa: E402
+
+SIZES = [10, 1_000, 100_000]
+
+
+def flights_tool() -> FlightPage:
+    """Stand-in with the same return annotation as search_flights."""
+    return FlightPage(flights=[], total=0)
+
+
+def bench(name: str, fn, rows: List[dict]) -> float:
+    repeat = max(1, 20_000 // len(rows))
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(rows)
+    return (time.perf_counter() - start) / repeat / len(rows) * 1e6
+
+
+if __name__ == "__main__":
+    tool = Tool.from_function(flights_tool)
+    paths = {
+        "validated": lambda rows: tool.convert_result(
+            FlightPage(flights=[Flight(**r) for r in rows], total=len(rows))
+        ),
+        "construct": lambda rows: tool.convert_result(
+            FlightPage.model_construct(flights=[Flight.model_construct(**r) for r in rows], total=len(rows))
+        ),
+        "direct": lambda rows: _encoded_result({"flights": rows, "total": len(rows), "next_cursor": None}),
+    }
+
+    inventory = FlightInventory.generate(max(SIZES))
+
+    print("=" * 70)
+    print("📦 TOOL RESULT SERIALIZATION (us per row)")
+    print("=" * 70)
+    print(f"{'rows':>10} | " + " | ".join(f"{name:>10}" for name in paths))
+    for size in SIZES:
+        rows = inventory.rows(np.arange(size))
+        timings = [bench(name, fn, rows) for name, fn in paths.items()]
+        print(f"{size:>10,} | " + " | ".join(f"{t:>10.2f}" for t in timings))
@@ -0,0 +1,118 @@
+"""
+Workflow Topology Benchmark
+
+Runs the competitive-intelligence workflow end to end with a local
+extraction stage (synthetic products written after a simulated agent
+latency) and compares the fan-out/fan-in graph built by create_workflow()
+with running the same stages one after another, as the SequentialBuilder
+chain did. The chart cache is cleared before every run so visualization
+always renders. Needs an interpreter with the tutorial requirements
+(agent-framework with WorkflowBuilder).
+
+Usage:
+    python benchmarks/bench_workflow.py [products] [extraction seconds] [runs]
+"""
+
+import asyncio
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("AZURE_AI_PROJECT_ENDPOINT", "https://local")
+
+import launch_devui  # noqa: E402
+from bench_pricing import make_products  # noqa: E402
+from competitive_artifacts import artifact_store, new_run_id  # noqa: E402
+from competitive_products import ProductWriter, products_message  # noqa: E402
+
+
+class LocalExtractionExecutor(launch_devui.DataExtractionExecutor):
+    """Extraction stage without Azure: waits like the agent runs, then writes synthetic products."""
+
+    products = 50_000
+    latency = 1.0
+
+    async def _extract_data(self, query: str, run_id: str, partial: dict = None) -> dict:
+        await asyncio.sleep(self.latency)
+        path = Path(launch_devui.FOLDERS["data"]) / f"extracted_products_{run_id}.jsonl"
+        with ProductWriter(path) as writer:
+            for product in make_products(self.products).to_dict("records"):
+                writer.write(product)
+        ref = artifact_store.put_file(path, rows=writer.count, run=run_id)
+        return products_message(path, writer.count, products=ref, run=run_id)
+
+
+async def sequential(stages: dict) -> dict:
+    """Every stage after the previous one (the former SequentialBuilder chain)."""
+    start = time.time()
+    run_id = new_run_id()
+    message = products_message(None, 0, run=run_id, started_at=start)
+    message = await stages["extraction"]._run_stage(message, stages["extraction"]._extract_data("bench", run_id))
+    message = await stages["pricing"]._run_stage(message, stages["pricing"]._analyze(message))
+    message = await stages["visualization"]._run_stage(message, stages["visualization"]._visualize(message))
+    message = await stages["report"]._run_stage(message, stages["report"]._report(message))
+    artifact_store.release_run(run_id)
+    return {**message["timings"], "end_to_end": time.time() - start}
+
+
+async def fan_out(workflow) -> dict:
+    start = time.time()
+    result = await workflow.run("bench")
+    output = result.get_outputs()[-1][0].text
+    timings = {}
+    for line in output.splitlines():
+        cells = [cell.strip(" *") for cell in line.strip("|").split("|")]
+        if len(cells) == 2 and cells[0] in launch_devui.STAGE_TIMEOUTS:
+            timings[cells[0]] = float(cells[1])
+    return {**timings, "end_to_end": time.time() - start}
+
+
+def clear_charts() -> None:
+    shutil.rmtree(launch_devui.FOLDERS["charts"], ignore_errors=True)
+
+
+async def main(products: int, latency: float, runs: int) -> None:
+    LocalExtractionExecutor.products = products
+    LocalExtractionExecutor.latency = latency
+    launch_devui.DataExtractionExecutor = LocalExtractionExecutor
+    workflow = launch_devui.create_workflow()
+    stages = {
+        "extraction": LocalExtractionExecutor(id="data_extraction", pool=workflow.client_pool),
+        "pricing": launch_devui.PricingAnalysisExecutor(id="pricing_analysis"),
+        "visualization": launch_devui.VisualizationExecutor(id="visualization"),
+        "report": launch_devui.ReportGeneratorExecutor(id="report_generation"),
+    }
+
+    # Warm up the chart worker processes so both topologies render with running workers
+    clear_charts()
+    await fan_out(workflow)
+
+    results = {"sequential": [], "fan-out/fan-in": []}
+    for _ in range(runs):
+        clear_charts()
+        results["sequential"].append(await sequential(stages))
+        clear_charts()
+        results["fan-out/fan-in"].append(await fan_out(workflow))
+
+    print("=" * 78)
+    print(f"🔀 WORKFLOW TOPOLOGY ({products:,} products, extraction {latency:.1f}s, median of {runs} runs)")
+    print("=" * 78)
+    columns = list(launch_devui.STAGE_TIMEOUTS) + ["end_to_end"]
+    print(f"{'':<16}" + "".join(f"{column:>19}" for column in columns))
+    for label, rows in results.items():
+        print(f"{label:<16}" + "".join(f"{statistics.median(row.get(column, 0) for row in rows):>18.2f}s"
+                                       for column in columns))
+
+
+if __name__ == "__main__":
+    products = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+    runs = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+    with tempfile.TemporaryDirectory() as cwd:
+        os.chdir(cwd)  # create_workflow() makes the competitive_analysis folders here
+        asyncio.run(main(products, latency, runs))
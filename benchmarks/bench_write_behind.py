@@ -0,0 +1,85 @@
+"""
+Mem0 Write-Behind Benchmark
+
+Simulates concurrent agent sessions that store facts after every turn, with a
+stand-in Memory whose add() costs a fixed round-trip (LLM extraction +
+embedding + vector store) plus a little per message. Compares the latency the
+user sees per turn when writing synchronously vs through MemoryWriteBehind,
+and how many upstream add() calls each approach makes.
+
+Usage:
+    python benchmarks/bench_write_behind.py
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mem0_write_behind import MemoryWriteBehind  # noqa: E402
+
+SESSIONS = 20
+TURNS = 15
+ADD_LATENCY_S = 0.300
+PER_MESSAGE_S = 0.005
+TURN_THINK_S = 0.050
+
+
+class SimulatedMemory:
+    """Blocking memory.add with remote-like latency."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def add(self, messages, **kwargs):
+        self.calls += 1
+        time.sleep(ADD_LATENCY_S + PER_MESSAGE_S * len(messages))
+
+
+async def session(user: int, write, turn_ms: list) -> None:
+    for turn in range(TURNS):
+        await asyncio.sleep(TURN_THINK_S)  # the agent's own response
+        start = time.perf_counter()
+        await write(f"user {user} fact {turn}", user_id=f"user-{user}")
+        turn_ms.append((time.perf_counter() - start) * 1000)
+
+
+async def run_sync(memory: SimulatedMemory) -> list:
+    turn_ms: list = []
+
+    async def write(messages, **kwargs):
+        await asyncio.to_thread(memory.add, [{"role": "user", "content": messages}], **kwargs)
+
+    await asyncio.gather(*[session(user, write, turn_ms) for user in range(SESSIONS)])
+    return turn_ms
+
+
+async def run_write_behind(memory: SimulatedMemory) -> tuple:
+    turn_ms: list = []
+    writer = MemoryWriteBehind(memory, max_batch=10, flush_interval=0.5)
+    await asyncio.gather(*[session(user, writer.add, turn_ms) for user in range(SESSIONS)])
+    start = time.perf_counter()
+    await writer.close()
+    return turn_ms, (time.perf_counter() - start) * 1000, writer.stats()
+
+
+if __name__ == "__main__":
+    print("=" * 78)
+    print(f"✍️  MEM0 WRITE-BEHIND ({SESSIONS} sessions x {TURNS} turns)")
+    print("=" * 78)
+
+    memory = SimulatedMemory()
+    turn_ms = asyncio.run(run_sync(memory))
+    print(f"{'synchronous':<14} per-turn write p50 {np.percentile(turn_ms, 50):>8.2f} ms  "
+          f"p99 {np.percentile(turn_ms, 99):>8.2f} ms  {memory.calls} add() calls")
+
+    memory = SimulatedMemory()
+    turn_ms, close_ms, stats = asyncio.run(run_write_behind(memory))
+    print(f"{'write-behind':<14} per-turn write p50 {np.percentile(turn_ms, 50):>8.2f} ms  "
+          f"p99 {np.percentile(turn_ms, 99):>8.2f} ms  {memory.calls} add() calls")
+    print(f"{'':<14} shutdown flush {close_ms:.0f} ms, flush p50 {stats['flush_p50_ms']} ms, "
+          f"max queue depth {stats['max_queue_depth']}")
@@ -0,0 +1,324 @@
+"""
+Travel MCP Server Load Test
+
+Starts travel_mcp_server:app under uvicorn (or targets an existing server),
+drives it over streamable HTTP with concurrent MCP clients calling a weighted
+tool mix, and reports latency percentiles, throughput and server CPU/RSS.
+Results are written as JSON (tagged with the git commit) so runs can be
+compared between commits.
+
+Usage:
+    python benchmarks/load_test_mcp_server.py --clients 16 --duration 30
+    python benchmarks/load_test_mcp_server.py --mix search_flights=1 --compare old.json
+    python benchmarks/load_test_mcp_server.py --url https://your-app.azurecontainerapps.io/mcp
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from fastmcp import Client
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from travel_cities import CITY_NAMES  # noqa: E402
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+DEFAULT_MIX = "search_flights=5,check_hotel_availability=3,convert_currency=2"
+CURRENCIES = ["USD", "EUR", "GBP", "JPY"]
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """Parse "tool=weight,tool=weight" into a weight dict."""
+    weights = {}
+    for part in mix.split(","):
+        tool, _, weight = part.partition("=")
+        weights[tool.strip()] = float(weight or 1)
+    return weights
+
+
+def inventory_start() -> date:
+    """
+    First day both the flight schedule and the hotel calendar cover, picked
+    the way the server picks them (FLIGHT_INVENTORY_START / HOTEL_CALENDAR_START,
+    else the day it starts). The started server inherits this environment.
+    """
+    starts = [os.getenv("FLIGHT_INVENTORY_START"), os.getenv("HOTEL_CALENDAR_START")]
+    return max(date.fromisoformat(start) if start else date.today() for start in starts)
+
+
+def build_query_pool(size: int, seed: int, start: date) -> Dict[str, List[Dict[str, Any]]]:
+    """Pre-generate a fixed pool of arguments per tool; smaller pools mean more cache hits."""
+    rng = random.Random(seed)
+
+    def day(offset: int) -> str:
+        return (start + timedelta(days=offset)).isoformat()
+
+    pool: Dict[str, List[Dict[str, Any]]] = {
+        "search_flights": [],
+        "check_hotel_availability": [],
+        "convert_currency": [],
+        "convert_currency_batch": [],
+        "search_itineraries": [],
+        "plan_trip": [],
+        "get_server_info": [{}],
+    }
+    for _ in range(size):
+        origin, destination = rng.sample(CITY_NAMES, 2)
+        first = rng.randint(0, 60)
+        pool["search_flights"].append({
+            "origin": origin, "destination": destination,
+            "departure_date": day(first), "passengers": rng.randint(1, 4),
+        })
+        pool["search_itineraries"].append({
+            "origin": origin, "destination": destination,
+            "departure_date": day(first), "max_stops": rng.randint(0, 2),
+        })
+        pool["plan_trip"].append({
+            "origin": origin, "destination": destination, "departure_date": day(first),
+            "return_date": day(first + rng.randint(2, 10)), "travelers": rng.randint(1, 4),
+            "currency": rng.choice(CURRENCIES),
+        })
+        pool["check_hotel_availability"].append({
+            "location": destination, "check_in": day(first),
+            "check_out": day(first + rng.randint(1, 7)), "guests": rng.randint(1, 4),
+        })
+        pool["convert_currency"].append({
+            "amount": round(rng.uniform(10, 2000), 2),
+            "from_currency": rng.choice(CURRENCIES), "to_currency": rng.choice(CURRENCIES),
+        })
+        pool["convert_currency_batch"].append({
+            "amounts": [round(rng.uniform(10, 2000), 2) for _ in range(100)],
+            "from_currency": rng.choice(CURRENCIES), "to_currency": rng.choice(CURRENCIES),
+        })
+    return pool
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int) -> subprocess.Popen:
+    """Start uvicorn serving travel_mcp_server:app and wait until it accepts connections."""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "travel_mcp_server:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=REPO_ROOT,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("MCP server exited during startup")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("MCP server did not start within 60s")
+
+
+class ResourceSampler:
+    """Samples CPU % and RSS of the server process while the load runs."""
+
+    def __init__(self, pid: Optional[int], interval: float = 0.5):
+        self.process = psutil.Process(pid) if psutil and pid else None
+        self.interval = interval
+        self.cpu: List[float] = []
+        self.rss: List[int] = []
+
+    async def run(self) -> None:
+        if self.process is None:
+            return
+        self.process.cpu_percent(None)
+        while True:
+            await asyncio.sleep(self.interval)
+            self.cpu.append(self.process.cpu_percent(None))
+            self.rss.append(self.process.memory_info().rss)
+
+    def summary(self) -> Optional[Dict[str, float]]:
+        if not self.cpu:
+            return None
+        return {
+            "cpu_percent_avg": round(float(np.mean(self.cpu)), 1),
+            "cpu_percent_max": round(float(np.max(self.cpu)), 1),
+            "rss_mb_avg": round(float(np.mean(self.rss)) / 1e6, 1),
+            "rss_mb_max": round(float(np.max(self.rss)) / 1e6, 1),
+        }
+
+
+async def client_worker(url: str, weights: Dict[str, float], pool: Dict[str, List[Dict]],
+                        deadline: float, seed: int, samples: Dict[str, List[float]],
+                        errors: Dict[str, int]) -> None:
+    """One MCP session issuing calls back-to-back until the deadline."""
+    rng = random.Random(seed)
+    tools, tool_weights = list(weights), list(weights.values())
+    async with Client(url) as client:
+        while time.monotonic() < deadline:
+            tool = rng.choices(tools, tool_weights)[0]
+            arguments = rng.choice(pool[tool])
+            start = time.perf_counter()
+            try:
+                await client.call_tool(tool, arguments)
+            except Exception:
+                errors[tool] = errors.get(tool, 0) + 1
+                continue
+            samples.setdefault(tool, []).append(time.perf_counter() - start)
+
+
+def latency_summary(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    ms = np.asarray(latencies) * 1000
+    return {
+        "requests": len(ms),
+        "rps": round(len(ms) / elapsed, 1),
+        "p50_ms": round(float(np.percentile(ms, 50)), 2),
+        "p95_ms": round(float(np.percentile(ms, 95)), 2),
+        "p99_ms": round(float(np.percentile(ms, 99)), 2),
+        "max_ms": round(float(ms.max()), 2),
+    }
+
+
+async def run_load(url: str, args: argparse.Namespace, server_pid: Optional[int]) -> Dict[str, Any]:
+    weights = parse_mix(args.mix)
+    pool = build_query_pool(args.query_pool, args.seed, args.start)
+    unknown = set(weights) - set(pool)
+    if unknown:
+        raise ValueError(f"Unknown tools in --mix: {', '.join(sorted(unknown))}")
+
+    # Warm up: one call per tool so inventory build and imports aren't measured
+    async with Client(url) as client:
+        for tool in weights:
+            await client.call_tool(tool, pool[tool][0])
+
+    samples: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    sampler = ResourceSampler(server_pid)
+    sampler_task = asyncio.create_task(sampler.run())
+    start = time.monotonic()
+    deadline = start + args.duration
+    await asyncio.gather(*[
+        client_worker(url, weights, pool, deadline, args.seed + i, samples, errors)
+        for i in range(args.clients)
+    ])
+    elapsed = time.monotonic() - start
+    sampler_task.cancel()
+
+    all_latencies = [latency for values in samples.values() for latency in values]
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "commit": git_commit(),
+        "config": {
+            "url": url, "clients": args.clients, "duration_s": args.duration,
+            "mix": weights, "query_pool": args.query_pool, "seed": args.seed,
+            "start": args.start.isoformat(),
+        },
+        "overall": latency_summary(all_latencies, elapsed) if all_latencies else None,
+        "tools": {tool: latency_summary(values, elapsed) for tool, values in samples.items()},
+        "errors": errors,
+        "server": sampler.summary(),
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(result: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> None:
+    print("=" * 78)
+    print(f"🚀 MCP LOAD TEST  commit={result['commit']}  clients={result['config']['clients']}  "
+          f"duration={result['config']['duration_s']}s")
+    print("=" * 78)
+    rows = [("overall", result["overall"])] + sorted(result["tools"].items())
+    for name, stats in rows:
+        if not stats:
+            continue
+        line = (f"{name:<26} {stats['requests']:>7} req  {stats['rps']:>8.1f} rps  "
+                f"p50 {stats['p50_ms']:>7.2f}  p95 {stats['p95_ms']:>7.2f}  p99 {stats['p99_ms']:>7.2f} ms")
+        print(line)
+        if baseline:
+            before = baseline["overall"] if name == "overall" else baseline["tools"].get(name)
+            if before:
+                print(f"{'':<26} vs {baseline['commit']}: rps {stats['rps'] - before['rps']:+.1f}  "
+                      f"p50 {stats['p50_ms'] - before['p50_ms']:+.2f}  "
+                      f"p95 {stats['p95_ms'] - before['p95_ms']:+.2f}  "
+                      f"p99 {stats['p99_ms'] - before['p99_ms']:+.2f} ms")
+    if result["errors"]:
+        print(f"⚠️  Errors: {result['errors']}")
+    if result["server"]:
+        s = result["server"]
+        print(f"🖥️  Server CPU avg {s['cpu_percent_avg']}% (max {s['cpu_percent_max']}%), "
+              f"RSS avg {s['rss_mb_avg']} MB (max {s['rss_mb_max']} MB)")
+    elif result["config"]["url"].startswith("http://127.0.0.1"):
+        print("ℹ️  Install psutil to record server CPU/RSS")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent MCP client sessions")
+    parser.add_argument("--duration", type=float, default=15, help="Seconds of load after warm-up")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Weighted tool mix, e.g. search_flights=3,convert_currency=1")
+    parser.add_argument("--query-pool", type=int, default=200, help="Distinct argument sets per tool")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--start", type=date.fromisoformat, default=None,
+                        help="First travel date in the query pool, YYYY-MM-DD (default: the inventory start)")
+    parser.add_argument("--url", help="Target an already running server instead of starting one")
+    parser.add_argument("--output", help="Result JSON path (default: benchmarks/results/load_test_<commit>_<time>.json)")
+    parser.add_argument("--compare", help="Previous result JSON to print deltas against")
+    args = parser.parse_args()
+    args.start = args.start or inventory_start()
+
+    server = None
+    url = args.url
+    if not url:
+        port = free_port()
+        print(f"Starting travel_mcp_server:app on port {port}...")
+        server = start_server(port)
+        url = f"http://127.0.0.1:{port}/mcp"
+
+    try:
+        result = asyncio.run(run_load(url, args, server.pid if server else None))
+    finally:
+        if server:
+            server.terminate()
+            server.wait(timeout=10)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(result, baseline)
+
+    output = Path(args.output) if args.output else (
+        REPO_ROOT / "benchmarks" / "results"
+        / f"load_test_{result['commit'] or 'local'}_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"💾 Saved to: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Competitive Analysis Artifact Store
+Process-wide store for large workflow payloads, passed between executors by reference
+"""
+
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+import pandas as pd
+
+from competitive_products import DEFAULT_CHUNK_SIZE, read_product_chunks
+
+# A reference as carried in workflow messages: {"artifact": key, "kind": ..., "rows": ..., "run": ..., "path": ...}
+ArtifactRef = Dict[str, Any]
+
+# Low-cardinality text columns stored as pandas categoricals
+CATEGORY_COLUMNS = ("category", "manufacturer", "source_file", "currency")
+
+
+def new_run_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def load_products_frame(path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> pd.DataFrame:
+    """Read a products JSON Lines file into one compact DataFrame."""
+    chunks = list(read_product_chunks(Path(path), chunk_size))
+    frame = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+    for column in CATEGORY_COLUMNS:
+        if column in frame.columns:
+            try:
+                frame[column] = frame[column].astype("category")
+            except TypeError:
+                pass  # unhashable values (lists) in this column
+    return frame
+
+
+@dataclass
+class _Artifact:
+    value: Any
+    loader: Optional[Callable[[], Any]]
+    kind: str
+    rows: int
+    run: Optional[str]
+    path: Optional[str]
+    nbytes: int = 0
+    created: float = 0.0
+    reads: int = 0
+
+
+def _nbytes(value: Any) -> int:
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    return int(getattr(value, "nbytes", 0))
+
+
+class ArtifactStore:
+    """
+    Holds each large payload once; executors exchange small references.
+
+    put() stores a value (typically the products DataFrame) and returns a
+    JSON-friendly reference dict for ctx.send_message. put_file() registers a
+    file-backed artifact that is only loaded on the first get(), once for all
+    readers; until then chunks() streams it from disk. DataFrames come back
+    as shallow copies: no data is copied, and with pandas copy-on-write a
+    reader that modifies its frame never affects the stored one or other
+    readers. Artifacts are released per run, with least-recently-used
+    eviction above max_bytes as a safety net (file-backed artifacts can be
+    reloaded; in-memory ones are lost).
+    """
+
+    def __init__(self, max_bytes: int = 2 * 1024 ** 3):
+        self.max_bytes = max_bytes
+        self._artifacts: "OrderedDict[str, _Artifact]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._stats = {"puts": 0, "loads": 0, "reads": 0, "evictions": 0, "released": 0}
+
+    def put(self, value: Any, kind: Optional[str] = None, run: Optional[str] = None,
+            path: Optional[Path] = None) -> ArtifactRef:
+        """
+        Store a value and return its reference.
+
+        Args:
+            value: Payload to share (DataFrame, array, list, ...)
+            kind: Label for the reference (defaults to the value's type name)
+            run: Workflow run the artifact belongs to, for release_run()
+            path: File the value was loaded from, if any
+
+        Returns:
+            Reference dict to put in workflow messages
+        """
+        artifact = _Artifact(value=value, loader=None, kind=kind or type(value).__name__.lower(),
+                             rows=len(value) if hasattr(value, "__len__") else 0, run=run,
+                             path=str(path) if path else None, nbytes=_nbytes(value), created=time.time())
+        return self._add(artifact)
+
+    def put_file(self, path: Path, loader: Callable[[Path], Any] = load_products_frame, rows: int = 0,
+                 kind: str = "dataframe", run: Optional[str] = None) -> ArtifactRef:
+        """Register a file-backed artifact, loaded with loader(path) on first get()."""
+        path = Path(path)
+        artifact = _Artifact(value=None, loader=lambda: loader(path), kind=kind, rows=rows, run=run,
+                             path=str(path), created=time.time())
+        return self._add(artifact)
+
+    def put_lazy(self, loader: Callable[[], Any], key: Optional[str] = None, kind: str = "value",
+                 run: Optional[str] = None) -> ArtifactRef:
+        """
+        Register an artifact computed by loader() on first get(), once for all readers.
+
+        With a key, the first caller registers the artifact and later callers
+        get a reference to the same one, so executors running concurrently
+        can share one computation without coordinating.
+        """
+        artifact = _Artifact(value=None, loader=loader, kind=kind, rows=0, run=run, path=None, created=time.time())
+        return self._add(artifact, key)
+
+    def _add(self, artifact: _Artifact, key: Optional[str] = None) -> ArtifactRef:
+        with self._lock:
+            if key is not None and key in self._artifacts:
+                artifact = self._artifacts[key]
+            else:
+                key = key or uuid.uuid4().hex
+                self._artifacts[key] = artifact
+                self._stats["puts"] += 1
+                self._evict()
+        return {"artifact": key, "kind": artifact.kind, "rows": artifact.rows, "run": artifact.run,
+                "path": artifact.path}
+
+    def _entry(self, ref: Union[ArtifactRef, str]) -> _Artifact:
+        key = ref["artifact"] if isinstance(ref, dict) else ref
+        with self._lock:
+            artifact = self._artifacts.get(key)
+            if artifact is None:
+                raise KeyError(f"Unknown or released artifact {key}")
+            self._artifacts.move_to_end(key)
+            artifact.reads += 1
+            self._stats["reads"] += 1
+            return artifact
+
+    def get(self, ref: Union[ArtifactRef, str]) -> Any:
+        """The stored value (DataFrames as zero-copy, copy-on-write shallow copies)."""
+        key = ref["artifact"] if isinstance(ref, dict) else ref
+        artifact = self._entry(ref)
+        if artifact.value is None and artifact.loader is not None:
+            with self._lock:
+                load_lock = self._load_locks.setdefault(key, threading.Lock())
+            with load_lock:
+                if artifact.value is None:
+                    artifact.value = artifact.loader()
+                    if hasattr(artifact.value, "__len__"):
+                        artifact.rows = len(artifact.value)
+                    with self._lock:
+                        self._stats["loads"] += 1
+                        if self._artifacts.get(key) is not artifact:
+                            # Released while loading (its run ended): the caller gets the value, the store keeps nothing
+                            if self._load_locks.get(key) is load_lock:
+                                del self._load_locks[key]
+                        else:
+                            artifact.nbytes = _nbytes(artifact.value)
+                            self._evict(keep=key)
+        value = artifact.value
+        return value.copy(deep=False) if isinstance(value, pd.DataFrame) else value
+
+    def chunks(self, ref: Union[ArtifactRef, str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+        """
+        DataFrame chunks of an artifact: zero-copy row slices once it is in
+        memory, otherwise read straight from its file without loading it whole.
+        """
+        artifact = self._entry(ref)
+        value = artifact.value
+        if value is None and artifact.path is not None:
+            yield from read_product_chunks(Path(artifact.path), chunk_size)
+            return
+        if not isinstance(value, pd.DataFrame):
+            value = pd.DataFrame.from_records(value or [])
+        for start in range(0, len(value), chunk_size):
+            yield value.iloc[start:start + chunk_size]
+
+    def release(self, ref: Union[ArtifactRef, str]) -> None:
+        key = ref["artifact"] if isinstance(ref, dict) else ref
+        with self._lock:
+            if self._artifacts.pop(key, None) is not None:
+                self._stats["released"] += 1
+            self._load_locks.pop(key, None)
+
+    def release_run(self, run: str) -> int:
+        """Drop every artifact of a workflow run; returns how many were released."""
+        with self._lock:
+            keys = [key for key, artifact in self._artifacts.items() if artifact.run == run]
+        for key in keys:
+            self.release(key)
+        return len(keys)
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        """Caller holds the lock."""
+        total = sum(artifact.nbytes for artifact in self._artifacts.values())
+        for key in list(self._artifacts):
+            if total <= self.max_bytes:
+                break
+            artifact = self._artifacts[key]
+            if key == keep or not artifact.nbytes:
+                continue
+            total -= artifact.nbytes
+            if artifact.loader is not None:
+                # File-backed: unload, the next get() reloads it
+                artifact.value, artifact.nbytes = None, 0
+            else:
+                del self._artifacts[key]
+            self._stats["evictions"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Artifact count, resident bytes and counters."""
+        with self._lock:
+            artifacts: List[_Artifact] = list(self._artifacts.values())
+            return {
+                **self._stats,
+                "artifacts": len(artifacts),
+                "resident_bytes": sum(artifact.nbytes for artifact in artifacts),
+            }
+
+
+artifact_store = ArtifactStore(max_bytes=int(os.getenv("ARTIFACT_STORE_MAX_MB", "2048")) * 1024 ** 2)
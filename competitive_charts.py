@@ -0,0 +1,302 @@
+"""
+Competitive Analysis Charts
+Chart rendering in a process pool (Agg backend) with a content-hash render cache
+"""
+
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Bump when render_chart() output changes for the same data, so cached charts are redrawn
+RENDER_VERSION = 1
+CACHE_INDEX = ".render_cache.json"
+TOP_MANUFACTURERS = 20
+
+# A chart: {"name", "kind", "title", "style", "figsize", "data": {...}}, JSON-serializable and picklable
+ChartSpec = Dict[str, Any]
+
+
+def chart_digest(spec: ChartSpec) -> str:
+    """Content hash of a chart spec (data, styling and renderer version)."""
+    payload = json.dumps({"version": RENDER_VERSION, "spec": spec}, sort_keys=True, default=float)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _init_worker() -> None:
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def render_chart(spec: ChartSpec, path: str) -> str:
+    """
+    Draw one chart spec to a PNG file (runs in a worker process).
+
+    The file is written next to its final path and moved into place, so a
+    reader never sees a half-written chart.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    sns.set_style(spec.get("style", "whitegrid"))
+    data = spec["data"]
+    fig, ax = plt.subplots(figsize=tuple(spec.get("figsize", (12, 6))))
+    try:
+        kind = spec["kind"]
+        if kind == "box":
+            # Boxes from precomputed percentiles: whiskers at p10/p90
+            stats = [{"label": label, "whislo": p10, "q1": p25, "med": p50, "q3": p75, "whishi": p90, "fliers": []}
+                     for label, p10, p25, p50, p75, p90 in zip(data["labels"], *data["percentiles"])]
+            ax.bxp(stats, showfliers=False, patch_artist=True,
+                   boxprops={"facecolor": sns.color_palette()[0], "alpha": 0.6})
+        elif kind == "barh":
+            y = np.arange(len(data["labels"]))
+            error = None
+            if data.get("low") is not None:
+                values = np.asarray(data["values"])
+                error = [values - np.asarray(data["low"]), np.asarray(data["high"]) - values]
+            ax.barh(y, data["values"], xerr=error, color=sns.color_palette()[0], alpha=0.8, capsize=2)
+            ax.set_yticks(y, data["labels"])
+            ax.invert_yaxis()
+            if data.get("reference") is not None:
+                ax.axvline(data["reference"], color="gray", linestyle="--", linewidth=1)
+        elif kind == "hist":
+            edges = np.asarray(data["edges"])
+            bottom = np.zeros(len(edges) - 1)
+            for label, counts in zip(data["labels"], data["counts"]):
+                ax.bar(edges[:-1], counts, width=np.diff(edges), bottom=bottom, align="edge", label=label, alpha=0.85)
+                bottom += np.asarray(counts)
+            if data.get("log_x"):
+                ax.set_xscale("log")
+            if len(data["labels"]) > 1:
+                ax.legend(fontsize=8)
+        elif kind == "heatmap":
+            matrix = pd.DataFrame(data["values"], index=data["rows"], columns=data["columns"])
+            sns.heatmap(matrix, ax=ax, cmap="viridis", annot=matrix.shape[1] <= 12, fmt=".0f",
+                        cbar_kws={"label": data.get("label", "")})
+        else:
+            raise ValueError(f"Unknown chart kind {kind!r}")
+        ax.set_title(spec["title"])
+        ax.set_xlabel(data.get("xlabel", ""))
+        ax.set_ylabel(data.get("ylabel", ""))
+        fig.tight_layout()
+        temp = f"{path}.{os.getpid()}.tmp.png"
+        fig.savefig(temp, dpi=spec.get("dpi", 100))
+        os.replace(temp, path)
+    finally:
+        plt.close(fig)
+    return path
+
+
+def _slug(text: str) -> str:
+    return "".join(c if c.isalnum() else "_" for c in str(text).lower()).strip("_") or "unnamed"
+
+
+def chart_specs(pricing: Any, style: str = "whitegrid", figsize: Tuple[int, int] = (12, 6),
+                top: int = TOP_MANUFACTURERS) -> List[ChartSpec]:
+    """
+    Chart specs for a PricingAnalysis.
+
+    Only aggregates travel to the workers: percentiles and indexes come from
+    the grouped statistics, histograms are binned here with NumPy.
+    """
+    products = pricing.products
+    if products.empty:
+        return []
+    base = pricing.base_currency
+    common = {"style": style, "figsize": list(figsize)}
+    specs: List[ChartSpec] = []
+    prices = products["price_normalized"].to_numpy()
+    category = products["category"] if "category" in products.columns else pd.Series("All", index=products.index)
+
+    # Price distribution per category, log-spaced bins
+    edges = np.geomspace(max(prices.min(), 0.01), prices.max() * 1.0001, 41)
+    labels, counts = [], []
+    for label, values in products["price_normalized"].groupby(category, observed=True):
+        labels.append(str(label))
+        counts.append(np.histogram(values.to_numpy(), bins=edges)[0].tolist())
+    specs.append({**common, "name": "price_distribution", "kind": "hist",
+                  "title": f"Price distribution by category ({base})",
+                  "data": {"edges": edges.tolist(), "labels": labels, "counts": counts, "log_x": True,
+                           "xlabel": f"Price ({base})", "ylabel": "Products"}})
+
+    stats = pricing.by_category
+    if not stats.empty:
+        specs.append({**common, "name": "category_price_ranges", "kind": "box",
+                      "title": f"Price ranges by category (p10-p90, {base})",
+                      "data": {"labels": [str(label) for label in stats.index],
+                               "percentiles": [stats[column].round(2).tolist()
+                                               for column in ("p10", "p25", "p50", "p75", "p90")],
+                               "ylabel": f"Price ({base})"}})
+
+    makers = pricing.by_manufacturer.head(top)
+    if not makers.empty:
+        specs.append({**common, "name": "manufacturer_median_prices", "kind": "barh",
+                      "title": f"Median price by manufacturer (p25-p75, top {len(makers)} by products)",
+                      "data": {"labels": [str(label) for label in makers.index], "values": makers["p50"].round(2).tolist(),
+                               "low": makers["p25"].round(2).tolist(), "high": makers["p75"].round(2).tolist(),
+                               "xlabel": f"Price ({base})"}})
+        specs.append({**common, "name": "manufacturer_price_index", "kind": "barh",
+                      "title": "Price index vs category median (100 = category median)",
+                      "data": {"labels": [str(label) for label in makers.index],
+                               "values": makers["category_index"].round(1).tolist(), "reference": 100,
+                               "xlabel": "Median category index"}})
+
+    competitor = products["competitor_index"].dropna()
+    if not competitor.empty:
+        clipped = competitor.clip(competitor.quantile(0.01), competitor.quantile(0.99)).to_numpy()
+        edges = np.linspace(clipped.min(), clipped.max() + 1e-9, 41)
+        specs.append({**common, "name": "competitor_price_index", "kind": "hist",
+                      "title": f"Price vs other listings of the same product ({len(competitor)} matched listings)",
+                      "data": {"edges": edges.tolist(), "labels": ["Matched listings"],
+                               "counts": [np.histogram(clipped, bins=edges)[0].tolist()],
+                               "xlabel": "Competitor index (100 = mean of other listings)", "ylabel": "Listings"}})
+
+    segments = pricing.by_segment
+    if not segments.empty and not makers.empty:
+        medians = segments["p50"].unstack("manufacturer").reindex(columns=makers.index)
+        specs.append({**common, "name": "segment_median_prices", "kind": "heatmap",
+                      "title": f"Median price by category and manufacturer ({base})",
+                      "data": {"values": medians.round(0).to_numpy().tolist(), "rows": [str(r) for r in medians.index],
+                               "columns": [str(c) for c in medians.columns], "label": f"Median price ({base})"}})
+
+        # One chart per category: its manufacturers' price ranges
+        for label, group in segments.groupby(level="category", observed=True):
+            group = group.droplevel("category").head(top)
+            specs.append({**common, "name": f"category_{_slug(label)}_manufacturers", "kind": "barh",
+                          "title": f"{label}: median price by manufacturer (p25-p75, {base})",
+                          "data": {"labels": [str(maker) for maker in group.index],
+                                   "values": group["p50"].round(2).tolist(), "low": group["p25"].round(2).tolist(),
+                                   "high": group["p75"].round(2).tolist(), "xlabel": f"Price ({base})"}})
+    return specs
+
+
+@dataclass
+class RenderResult:
+    paths: List[Path] = field(default_factory=list)
+    rendered: List[str] = field(default_factory=list)
+    cached: List[str] = field(default_factory=list)
+    failures: List[Tuple[str, str]] = field(default_factory=list)
+    seconds: float = 0.0
+
+
+class ChartRenderer:
+    """
+    Renders chart specs off the event loop, in parallel, skipping unchanged charts.
+
+    matplotlib is CPU-bound and holds the GIL, so drawing inside an async
+    handler stalls the whole workflow. Charts are drawn in a spawned process
+    pool with the Agg backend (max_workers=0 draws in one background thread
+    instead, as pyplot is not thread-safe).
+    Each chart's content hash is recorded in the output folder; a chart
+    whose spec (data, styling, renderer version) is unchanged and whose file
+    still exists is reused without rendering.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = min(4, os.cpu_count() or 1) if max_workers is None else max_workers
+        self._pool: Optional[Executor] = None
+        self._index_lock = asyncio.Lock()
+        self._stats = {"rendered": 0, "cached": 0, "failed": 0, "render_seconds": 0.0}
+
+    @property
+    def pool(self) -> Executor:
+        if self._pool is None:
+            if self.max_workers > 0:
+                # spawn: never fork a process running an event loop and threads
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=1, initializer=_init_worker)
+        return self._pool
+
+    async def render(self, specs: Sequence[ChartSpec], folder: Path) -> RenderResult:
+        """
+        Render every spec to folder/<name>.png, reusing unchanged charts.
+
+        Args:
+            specs: Chart specs with unique names
+            folder: Output folder (also holds the render cache index)
+
+        Returns:
+            RenderResult with the chart paths in spec order
+        """
+        start = time.perf_counter()
+        folder = Path(folder)
+        folder.mkdir(parents=True, exist_ok=True)
+        result = RenderResult()
+        async with self._index_lock:
+            index = self._load_index(folder)
+            digests = {spec["name"]: chart_digest(spec) for spec in specs}
+            pending = []
+            for spec in specs:
+                path = folder / f"{spec['name']}.png"
+                if index.get(spec["name"]) == digests[spec["name"]] and path.exists():
+                    result.cached.append(spec["name"])
+                else:
+                    pending.append((spec, path))
+
+            outcomes = await asyncio.gather(
+                *(self._render_one(spec, path) for spec, path in pending), return_exceptions=True
+            )
+            if any(isinstance(outcome, BrokenProcessPool) for outcome in outcomes):
+                # A worker died (e.g. killed for memory); start a fresh pool for the next render
+                self.shutdown()
+            failed = set()
+            for (spec, _), outcome in zip(pending, outcomes):
+                if isinstance(outcome, BaseException):
+                    failed.add(spec["name"])
+                    result.failures.append((spec["name"], str(outcome)))
+                    index.pop(spec["name"], None)
+                else:
+                    result.rendered.append(spec["name"])
+                    index[spec["name"]] = digests[spec["name"]]
+            self._save_index(folder, index)
+
+        result.paths = [folder / f"{spec['name']}.png" for spec in specs if spec["name"] not in failed]
+        result.seconds = time.perf_counter() - start
+        self._stats["rendered"] += len(result.rendered)
+        self._stats["cached"] += len(result.cached)
+        self._stats["failed"] += len(result.failures)
+        self._stats["render_seconds"] += result.seconds
+        return result
+
+    async def _render_one(self, spec: ChartSpec, path: Path) -> str:
+        return await asyncio.get_running_loop().run_in_executor(self.pool, render_chart, spec, str(path))
+
+    @staticmethod
+    def _load_index(folder: Path) -> Dict[str, str]:
+        try:
+            return json.loads((folder / CACHE_INDEX).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _save_index(folder: Path, index: Dict[str, str]) -> None:
+        temp = folder / (CACHE_INDEX + ".tmp")
+        temp.write_text(json.dumps(index, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(temp, folder / CACHE_INDEX)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "render_seconds": round(self._stats["render_seconds"], 3),
+                "workers": self.max_workers}
+
+
+chart_renderer = ChartRenderer(max_workers=int(os.environ["CHART_WORKERS"]) if os.getenv("CHART_WORKERS") else None)
@@ -0,0 +1,304 @@
+"""
+Competitive Analysis Client Pool
+Long-lived Azure AI project client, cached credential and reusable agent definitions
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from azure.core.credentials import AccessToken, AccessTokenInfo
+
+from competitive_ingestion import LocalAgentsClient
+
+# (scopes, tenant_id, enable_cae)
+_TokenKey = Tuple[Tuple[str, ...], Optional[str], bool]
+
+
+class CachedTokenCredential:
+    """
+    Async credential wrapper that caches tokens and refreshes them ahead of expiry.
+
+    AzureCliCredential starts an `az` subprocess for every token it hands
+    out; each new client that gets its own credential pays for that again.
+    This wrapper serves tokens from a per-scope cache, refreshes a token in
+    the background once it is within refresh_margin seconds of expiry (or
+    past the service's refresh_on hint), and only blocks callers when the
+    token has actually expired. Concurrent callers share one acquisition.
+    Claims challenges always go to the inner credential.
+    """
+
+    def __init__(self, credential: Any, refresh_margin: float = 300, close_inner: bool = True):
+        self.credential = credential
+        self.refresh_margin = refresh_margin
+        self.close_inner = close_inner
+        self._tokens: Dict[_TokenKey, AccessTokenInfo] = {}
+        self._locks: Dict[_TokenKey, asyncio.Lock] = {}
+        self._refreshes: Dict[_TokenKey, asyncio.Task] = {}
+        self._stats = {"acquisitions": 0, "hits": 0, "background_refreshes": 0, "acquire_seconds": 0.0}
+
+    async def get_token(self, *scopes: str, claims: Optional[str] = None, tenant_id: Optional[str] = None,
+                        enable_cae: bool = False, **kwargs: Any) -> AccessToken:
+        options = {"claims": claims, "tenant_id": tenant_id, "enable_cae": enable_cae}
+        info = await self.get_token_info(*scopes, options={key: value for key, value in options.items() if value})
+        return AccessToken(info.token, info.expires_on)
+
+    async def get_token_info(self, *scopes: str, options: Optional[Dict[str, Any]] = None) -> AccessTokenInfo:
+        options = options or {}
+        key = (scopes, options.get("tenant_id"), bool(options.get("enable_cae")))
+        if options.get("claims"):
+            return await self._acquire(key, options)
+        info = self._tokens.get(key)
+        now = time.time()
+        if info is not None and now < info.expires_on - 30:
+            self._stats["hits"] += 1
+            if now >= self._refresh_at(info) and key not in self._refreshes:
+                self._refreshes[key] = asyncio.ensure_future(self._refresh_in_background(key, options))
+            return info
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            # Another caller may have refreshed it while we waited
+            info = self._tokens.get(key)
+            if info is not None and time.time() < info.expires_on - 30:
+                self._stats["hits"] += 1
+                return info
+            return await self._acquire(key, options)
+
+    def _refresh_at(self, info: AccessTokenInfo) -> float:
+        refresh_at = info.expires_on - self.refresh_margin
+        return min(refresh_at, info.refresh_on) if info.refresh_on else refresh_at
+
+    async def _acquire(self, key: _TokenKey, options: Dict[str, Any]) -> AccessTokenInfo:
+        start = time.perf_counter()
+        if hasattr(self.credential, "get_token_info"):
+            info = await self.credential.get_token_info(*key[0], options=options or None)
+        else:
+            token = await self.credential.get_token(*key[0], **options)
+            info = AccessTokenInfo(token.token, token.expires_on)
+        self._stats["acquisitions"] += 1
+        self._stats["acquire_seconds"] += time.perf_counter() - start
+        self._tokens[key] = info
+        return info
+
+    async def _refresh_in_background(self, key: _TokenKey, options: Dict[str, Any]) -> None:
+        try:
+            async with self._locks.setdefault(key, asyncio.Lock()):
+                await self._acquire(key, options)
+            self._stats["background_refreshes"] += 1
+        except Exception as e:
+            # The cached token is still valid; the next call past expiry retries in the foreground
+            print(f"   ⚠️  Background token refresh failed: {e}")
+        finally:
+            self._refreshes.pop(key, None)
+
+    async def close(self) -> None:
+        for task in list(self._refreshes.values()):
+            task.cancel()
+        self._refreshes.clear()
+        self._tokens.clear()
+        if self.close_inner and hasattr(self.credential, "close"):
+            await self.credential.close()
+
+    async def __aenter__(self) -> "CachedTokenCredential":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "acquire_seconds": round(self._stats["acquire_seconds"], 3)}
+
+
+def agent_fingerprint(name: str, instructions: str, model: Optional[str], vector_store_ids: Sequence[str]) -> str:
+    """Stable hash of an agent definition used as the pool key."""
+    payload = json.dumps({"name": name, "instructions": instructions, "model": model,
+                          "vector_store_ids": sorted(vector_store_ids)}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class AgentClientPool:
+    """
+    One credential, one project client and a cache of agent definitions for a workflow.
+
+    Creating an AzureAIAgentClient and credential per request re-ran token
+    acquisition, opened new HTTPS connections and created and deleted the
+    service-side agent each time. The pool creates them once: the
+    CachedTokenCredential keeps tokens fresh ahead of expiry, the shared
+    AIProjectClient keeps its connection pool warm, and each distinct agent
+    definition (name, instructions, model, vector stores) is created once and
+    reused by later runs. Least-recently-used definitions above max_agents
+    are deleted; aclose() deletes the rest.
+    """
+
+    def __init__(
+        self,
+        endpoint: Optional[str] = None,
+        model: Optional[str] = None,
+        credential_factory: Optional[Callable[[], Any]] = None,
+        project_client_factory: Optional[Callable[[str, Any], Any]] = None,
+        agent_factory: Optional[Callable[[Any, str, str], Any]] = None,
+        refresh_margin: float = 300,
+        max_agents: int = 16
+    ):
+        self.endpoint = endpoint
+        self.model = model
+        self.credential_factory = credential_factory or _cli_credential
+        self.project_client_factory = project_client_factory or _project_client
+        self.agent_factory = agent_factory or _chat_agent
+        self.refresh_margin = refresh_margin
+        self.max_agents = max_agents
+        self._credential: Optional[CachedTokenCredential] = None
+        self._project_client: Any = None
+        self._agents: "OrderedDict[str, Tuple[str, Any, Tuple[str, ...]]]" = OrderedDict()
+        self._agent_locks: Dict[str, asyncio.Lock] = {}
+        self._stats = {"agents_created": 0, "agent_reuses": 0, "agents_deleted": 0, "agent_setup_seconds": 0.0}
+
+    @property
+    def credential(self) -> CachedTokenCredential:
+        """Shared token-caching credential for every client the pool creates."""
+        if self._credential is None:
+            self._credential = CachedTokenCredential(self.credential_factory(), refresh_margin=self.refresh_margin)
+        return self._credential
+
+    @property
+    def project_client(self) -> Any:
+        """Shared AIProjectClient (one HTTP connection pool)."""
+        if self._project_client is None:
+            endpoint = self.endpoint or os.getenv("AZURE_AI_PROJECT_ENDPOINT")
+            self._project_client = self.project_client_factory(endpoint, self.credential)
+        return self._project_client
+
+    @property
+    def agents(self) -> Any:
+        """project_client.agents, for file and vector store operations."""
+        return self.project_client.agents
+
+    async def agent(self, name: str, instructions: str, vector_store_ids: Sequence[str] = ()) -> Any:
+        """
+        Get a chat agent for this definition, creating the service agent on first use.
+
+        Args:
+            name: Agent name
+            instructions: Agent instructions
+            vector_store_ids: Vector stores the agent's file search tool reads
+
+        Returns:
+            ChatAgent bound to the shared project client and the pooled agent id
+        """
+        model = self.model or os.getenv("AZURE_AI_MODEL_DEPLOYMENT_NAME")
+        key = agent_fingerprint(name, instructions, model, vector_store_ids)
+        async with self._agent_locks.setdefault(key, asyncio.Lock()):
+            if key in self._agents:
+                self._agents.move_to_end(key)
+                self._stats["agent_reuses"] += 1
+                return self._agents[key][1]
+
+            from azure.ai.agents.models import FileSearchTool
+
+            start = time.perf_counter()
+            tools: Dict[str, Any] = {}
+            if vector_store_ids:
+                file_search = FileSearchTool(vector_store_ids=list(vector_store_ids))
+                tools = {"tools": file_search.definitions, "tool_resources": file_search.resources}
+            definition = await self.agents.create_agent(model=model, name=name, instructions=instructions, **tools)
+            chat_agent = self.agent_factory(self.project_client, definition.id, name)
+            self._agents[key] = (definition.id, chat_agent, tuple(vector_store_ids))
+            self._stats["agents_created"] += 1
+            self._stats["agent_setup_seconds"] += time.perf_counter() - start
+
+        while len(self._agents) > self.max_agents:
+            evicted, _ = next(iter(self._agents.items()))
+            await self._delete_agent(evicted)
+        return chat_agent
+
+    async def _delete_agent(self, key: str) -> bool:
+        entry = self._agents.pop(key, None)
+        self._agent_locks.pop(key, None)
+        if entry is None:
+            return False
+        try:
+            await self.agents.delete_agent(entry[0])
+        except Exception as e:
+            print(f"   ⚠️  Could not delete agent {entry[0]}: {e}")
+            return False
+        self._stats["agents_deleted"] += 1
+        return True
+
+    async def release_agents(self, vector_store_id: str) -> int:
+        """Delete pooled agents that search a vector store (before the store is deleted); returns how many."""
+        keys = [key for key, (_, _, store_ids) in self._agents.items() if vector_store_id in store_ids]
+        return sum([await self._delete_agent(key) for key in keys])
+
+    async def aclose(self) -> None:
+        """Delete pooled agents and close the project client and credential."""
+        for key in list(self._agents):
+            await self._delete_agent(key)
+        if self._project_client is not None:
+            await self._project_client.close()
+            self._project_client = None
+        if self._credential is not None:
+            await self._credential.close()
+            self._credential = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Agent counters plus the credential's token counters."""
+        return {
+            **self._stats,
+            "agent_setup_seconds": round(self._stats["agent_setup_seconds"], 3),
+            "agents": len(self._agents),
+            "credential": self._credential.stats() if self._credential is not None else None,
+        }
+
+
+def _cli_credential() -> Any:
+    from azure.identity.aio import AzureCliCredential
+    return AzureCliCredential()
+
+
+def _project_client(endpoint: str, credential: Any) -> Any:
+    from azure.ai.projects.aio import AIProjectClient
+    return AIProjectClient(endpoint=endpoint, credential=credential)
+
+
+def _chat_agent(project_client: Any, agent_id: str, name: str) -> Any:
+    # The client neither owns the project client nor the agent (an agent_id is given), so it never closes or deletes them
+    from agent_framework_azure_ai import AzureAIAgentClient
+    return AzureAIAgentClient(project_client=project_client, agent_id=agent_id, agent_name=name).create_agent(name=name)
+
+
+class LocalCredential:
+    """
+    In-memory stand-in for AzureCliCredential: every token costs latency
+    seconds (the `az` subprocess) and lives for lifetime seconds.
+    """
+
+    def __init__(self, latency: float = 0.8, lifetime: float = 3600):
+        self.latency = latency
+        self.lifetime = lifetime
+        self.acquisitions = 0
+        self.closed = False
+
+    async def get_token(self, *scopes: str, **kwargs: Any) -> AccessToken:
+        await asyncio.sleep(self.latency)
+        self.acquisitions += 1
+        return AccessToken(f"token-{self.acquisitions}", int(time.time() + self.lifetime))
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class LocalProjectClient:
+    """
+    In-memory stand-in for AIProjectClient: a LocalAgentsClient that fetches
+    tokens from credential and pays connect_latency on its first request.
+    """
+
+    def __init__(self, credential: Any, connect_latency: float = 0.15, **latencies: Any):
+        self.agents = LocalAgentsClient(credential=credential, connect_latency=connect_latency, **latencies)
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
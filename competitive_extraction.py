@@ -0,0 +1,309 @@
+"""
+Competitive Analysis Extraction
+Per-catalog, concurrent product extraction merged into one SKU-deduplicated list
+"""
+
+import asyncio
+import inspect
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Union
+
+# Keys that mark a JSON object as a product rather than a wrapper or a nested attribute
+PRODUCT_KEYS = frozenset(("sku", "product_name", "name", "price"))
+
+# Returns the agent's reply for one catalog, either streamed or in one piece
+ExtractFn = Callable[[str], Union[AsyncIterator[str], Awaitable[str]]]
+
+_STRUCTURAL = re.compile(r'["{}\[\]]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+_SKU_NOISE = re.compile(r"[\s\-_./]+")
+_NAME_NOISE = re.compile(r"[^\w]+")
+_MISSING = (None, "", "n/a", "N/A", "none", "null", "unknown")
+
+
+def _is_product(value: Any) -> bool:
+    return isinstance(value, dict) and not PRODUCT_KEYS.isdisjoint(value)
+
+
+class ProductStreamParser:
+    """
+    Incremental parser that pulls product objects out of streamed agent text.
+
+    The reply may wrap its JSON in prose or ``` fences, return a bare array or
+    a {"products": [...]} wrapper, and may be cut off mid-object. feed()
+    tracks bracket nesting (ignoring brackets inside strings) and returns
+    every complete product object as soon as its closing brace arrives;
+    products nested inside another product (bundles, variants) stay part of
+    their parent. A truncated tail costs only the object it cut through.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._base = 0        # absolute offset of _buffer[0] in the stream
+        self._pos = 0         # absolute scan position
+        self._in_string = False
+        # Open containers: [bracket, absolute start, products waiting on this object to close]
+        self._stack: List[List[Any]] = []
+        self.products = 0
+        self.errors = 0
+        self.truncated = False
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        """Consume the next chunk and return the products it completed."""
+        self._buffer += text
+        found: List[Dict[str, Any]] = []
+        end = self._base + len(self._buffer)
+        while self._pos < end:
+            offset = self._pos - self._base
+            if self._in_string:
+                match = _STRING_SPECIAL.search(self._buffer, offset)
+                if match is None:
+                    self._pos = end
+                    break
+                if match.group() == "\\":
+                    self._pos = self._base + match.start() + 2
+                    continue
+                self._in_string = False
+                self._pos = self._base + match.end()
+                continue
+
+            match = _STRUCTURAL.search(self._buffer, offset)
+            if match is None:
+                self._pos = end
+                break
+            char, position = match.group(), self._base + match.start()
+            self._pos = position + 1
+            if char == '"':
+                # Quotes in prose outside any JSON container are not strings
+                self._in_string = bool(self._stack)
+            elif char in "{[":
+                self._stack.append([char, position, []])
+            elif not self._stack or self._stack[-1][0] != ("{" if char == "}" else "["):
+                # Unbalanced bracket: not JSON after all, start over
+                self.errors += bool(self._stack)
+                self._stack.clear()
+            else:
+                bracket, start, pending = self._stack.pop()
+                if bracket == "{":
+                    self._close_object(start, position, pending, found)
+                else:
+                    self._hand_up(pending, found)
+        self._compact()
+        return found
+
+    def close(self) -> List[Dict[str, Any]]:
+        """End of stream: return products still held by unclosed wrappers."""
+        found: List[Dict[str, Any]] = []
+        if self._stack:
+            self.truncated = True
+            for _, _, pending in self._stack:
+                found.extend(pending)
+            self.products += len(found)
+            self._stack.clear()
+        self._compact()
+        return found
+
+    def _close_object(self, start: int, end: int, pending: List[Dict], found: List[Dict]) -> None:
+        try:
+            value = json.loads(self._buffer[start - self._base:end - self._base + 1])
+        except json.JSONDecodeError:
+            self.errors += 1
+            value = None
+        if _is_product(value):
+            # Products nested inside this one belong to it
+            self._hand_up([value], found)
+        else:
+            self._hand_up(pending, found)
+
+    def _hand_up(self, products: List[Dict], found: List[Dict]) -> None:
+        """Give products to the nearest enclosing object, or emit them if there is none."""
+        for bracket, _, pending in reversed(self._stack):
+            if bracket == "{":
+                pending.extend(products)
+                return
+        self.products += len(products)
+        found.extend(products)
+
+    def _compact(self) -> None:
+        # Only text of still-open objects can be needed again
+        keep = min((start for bracket, start, _ in self._stack if bracket == "{"),
+                   default=min(self._pos, self._base + len(self._buffer)))
+        if keep > self._base:
+            self._buffer = self._buffer[keep - self._base:]
+            self._base = keep
+
+
+def parse_products(text: str) -> List[Dict[str, Any]]:
+    """All product objects found in a complete agent reply."""
+    parser = ProductStreamParser()
+    return parser.feed(text) + parser.close()
+
+
+def product_key(product: Dict[str, Any]) -> Optional[str]:
+    """
+    Deduplication key: the SKU with case, spaces and separators removed, or
+    manufacturer + product name when the SKU is missing.
+    """
+    sku = product.get("sku")
+    if sku not in _MISSING and str(sku).strip() not in _MISSING:
+        return "sku:" + _SKU_NOISE.sub("", str(sku)).upper()
+    name = product.get("product_name") or product.get("name")
+    if name in _MISSING:
+        return None
+    manufacturer = product.get("manufacturer") or ""
+    return "name:" + _NAME_NOISE.sub(" ", f"{manufacturer}|{name}".lower()).strip()
+
+
+class ProductMerger:
+    """
+    Reduce step: merges products from all catalogs, one record per key.
+
+    A product seen again (same SKU in two catalogs, or the agent repeating
+    itself) only fills fields the first record left empty, and every catalog
+    it appeared in is listed under source_files. Products without SKU or name
+    cannot be matched and are kept as they are.
+    """
+
+    def __init__(self):
+        self._products: Dict[str, Dict[str, Any]] = {}
+        self._unkeyed: List[Dict[str, Any]] = []
+        self.duplicates = 0
+        # Duplicates that changed an already merged record (filled a field or added a source)
+        self.updated = 0
+
+    def add(self, product: Dict[str, Any], source_file: Optional[str] = None) -> bool:
+        """
+        Merge one product.
+
+        Returns:
+            True if it is new, False if it was merged into an existing record
+        """
+        if source_file and product.get("source_file") in _MISSING:
+            product["source_file"] = source_file
+        key = product_key(product)
+        if key is None:
+            self._unkeyed.append(product)
+            return True
+        existing = self._products.get(key)
+        if existing is None:
+            product.setdefault("source_files", [product["source_file"]] if product.get("source_file") else [])
+            self._products[key] = product
+            return True
+        self.duplicates += 1
+        changed = False
+        for name, value in product.items():
+            if existing.get(name) in _MISSING and value not in _MISSING:
+                existing[name] = value
+                changed = True
+        source = product.get("source_file")
+        if source and source not in existing["source_files"]:
+            existing["source_files"].append(source)
+            changed = True
+        self.updated += changed
+        return False
+
+    @property
+    def products(self) -> List[Dict[str, Any]]:
+        return list(self._products.values()) + self._unkeyed
+
+    def __len__(self) -> int:
+        return len(self._products) + len(self._unkeyed)
+
+
+@dataclass
+class FileExtraction:
+    source_file: str
+    products: int = 0
+    new_products: int = 0
+    seconds: float = 0.0
+    truncated: bool = False
+    parse_errors: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class ExtractionResult:
+    products: List[Dict[str, Any]]
+    files: List[FileExtraction]
+    duplicates: int
+    seconds: float
+    failures: List[FileExtraction] = field(default_factory=list)
+
+
+async def _chunks(reply: Union[AsyncIterator[str], Awaitable[str]]) -> AsyncIterator[str]:
+    if inspect.isawaitable(reply):
+        yield await reply
+    else:
+        async for chunk in reply:
+            yield chunk
+
+
+async def extract_per_file(
+    sources: Sequence[str],
+    extract: ExtractFn,
+    max_concurrency: int = 4,
+    timeout: Optional[float] = None,
+    merger: Optional[ProductMerger] = None,
+    on_product: Optional[Callable[[Dict[str, Any]], Any]] = None
+) -> ExtractionResult:
+    """
+    Map-reduce extraction: one agent call per catalog, merged as replies stream in.
+
+    Args:
+        sources: Catalog file names, one extraction task each
+        extract: Returns the agent reply for one catalog (async iterator of text chunks or awaitable text)
+        max_concurrency: Catalog extractions running at once
+        timeout: Seconds allowed per catalog; products streamed before the deadline are kept
+        merger: Reduce step to merge into (a new ProductMerger by default)
+        on_product: Called with every new product as soon as it is merged (may be async)
+
+    Returns:
+        ExtractionResult with the merged products and per-catalog statistics
+    """
+    merger = merger or ProductMerger()
+    slots = asyncio.Semaphore(max_concurrency)
+    started = time.perf_counter()
+
+    async def merge(products: List[Dict[str, Any]], stats: FileExtraction) -> None:
+        for product in products:
+            stats.products += 1
+            if merger.add(product, stats.source_file):
+                stats.new_products += 1
+                if on_product is not None:
+                    result = on_product(product)
+                    if inspect.isawaitable(result):
+                        await result
+
+    async def run(source: str) -> FileExtraction:
+        stats = FileExtraction(source_file=source)
+        parser = ProductStreamParser()
+
+        async def consume() -> None:
+            async for chunk in _chunks(extract(source)):
+                await merge(parser.feed(chunk), stats)
+
+        async with slots:
+            file_started = time.perf_counter()
+            try:
+                await asyncio.wait_for(consume(), timeout)
+            except asyncio.TimeoutError:
+                stats.error = f"timed out after {timeout:.0f}s"
+            except Exception as e:
+                stats.error = str(e)
+            await merge(parser.close(), stats)
+            stats.truncated = parser.truncated
+            stats.parse_errors = parser.errors
+            stats.seconds = time.perf_counter() - file_started
+        return stats
+
+    files = await asyncio.gather(*[run(source) for source in sources])
+    return ExtractionResult(
+        products=merger.products,
+        files=list(files),
+        duplicates=merger.duplicates,
+        seconds=time.perf_counter() - started,
+        failures=[stats for stats in files if stats.error],
+    )
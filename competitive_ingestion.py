@@ -0,0 +1,541 @@
+"""
+Competitive Analysis Ingestion
+Concurrent, retrying and incremental ingestion of catalog files for Azure AI file search
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+
+# (operation, item name, succeeded, done, total)
+ProgressFn = Callable[[str, str, bool, int, int], None]
+
+# Most file ids one vector store create / file batch call accepts
+VECTOR_STORE_BATCH_LIMIT = 500
+
+
+def print_progress(operation: str, name: str, ok: bool, done: int, total: int) -> None:
+    """Default progress reporter: one line per finished file, like the serial loop printed."""
+    print(f"   {'✅' if ok else '❌'} {name} ({done}/{total})")
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Throttling, server errors and transport failures are retried; bad requests and local I/O errors are not."""
+    if isinstance(error, (FileNotFoundError, PermissionError, IsADirectoryError, ResourceNotFoundError)):
+        return False
+    if isinstance(error, HttpResponseError):
+        status = getattr(error, "status_code", None)
+        return status is None or status in (408, 429) or status >= 500
+    return True
+
+
+class ParallelIngestor:
+    """
+    Uploads, indexes and deletes agent files concurrently.
+
+    Every operation runs under one semaphore of max_concurrency slots, so a
+    few hundred catalogs upload in parallel without opening hundreds of
+    connections at once. Transient failures are retried with jittered
+    exponential backoff; a file that still fails is reported and skipped
+    instead of aborting the whole batch.
+    """
+
+    def __init__(
+        self,
+        agents: Any,
+        max_concurrency: int = 8,
+        max_retries: int = 3,
+        retry_delay: float = 0.5,
+        progress: Optional[ProgressFn] = print_progress
+    ):
+        """
+        Args:
+            agents: Agents operations client (client.project_client.agents or LocalAgentsClient)
+            max_concurrency: Upload/delete requests in flight at once
+            max_retries: Extra attempts per file after the first failure
+            retry_delay: Base backoff in seconds (doubled per attempt)
+            progress: Called after each file finishes; None for silent runs
+        """
+        self.agents = agents
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.progress = progress
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._stats = {"uploaded": 0, "upload_failures": 0, "deleted": 0, "delete_failures": 0,
+                       "retries": 0, "bytes": 0, "upload_seconds": 0.0}
+
+    async def _call(self, operation: Callable[[], Any]) -> Any:
+        async with self._slots:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    return await operation()
+                except Exception as e:
+                    if attempt == self.max_retries or not _is_retryable(e):
+                        raise
+                    self._stats["retries"] += 1
+                    await asyncio.sleep(self.retry_delay * 2 ** attempt * random.uniform(0.5, 1.5))
+
+    async def upload_files(self, paths: Sequence[Path]) -> Tuple[List[Any], List[Tuple[Path, Exception]]]:
+        """
+        Upload files for assistants/file search concurrently.
+
+        Args:
+            paths: Local files to upload
+
+        Returns:
+            Tuple of (uploaded FileInfo objects in input order, [(path, error)] for files that failed)
+        """
+        results, failures = await self._upload_many(paths)
+        return [file for file in results if file is not None], failures
+
+    async def _upload_many(self, paths: Sequence[Path]) -> Tuple[List[Any], List[Tuple[Path, Exception]]]:
+        """Like upload_files, but results line up with paths (None where an upload failed)."""
+        started = time.perf_counter()
+        done = 0
+        results: List[Any] = [None] * len(paths)
+        failures: List[Tuple[Path, Exception]] = []
+
+        async def upload(index: int, path: Path) -> None:
+            nonlocal done
+            try:
+                results[index] = await self._call(
+                    lambda: self.agents.files.upload_and_poll(file_path=str(path), purpose="assistants")
+                )
+                self._stats["uploaded"] += 1
+                self._stats["bytes"] += os.path.getsize(path)
+            except Exception as e:
+                failures.append((path, e))
+                self._stats["upload_failures"] += 1
+            done += 1
+            if self.progress is not None:
+                self.progress("upload", Path(path).name, results[index] is not None, done, len(paths))
+
+        await asyncio.gather(*[upload(i, Path(path)) for i, path in enumerate(paths)])
+        self._stats["upload_seconds"] += time.perf_counter() - started
+        return results, failures
+
+    async def create_vector_store(self, file_ids: List[str], name: str) -> Any:
+        """Create a vector store over already uploaded files and wait until it is indexed."""
+        first, rest = file_ids[:VECTOR_STORE_BATCH_LIMIT], file_ids[VECTOR_STORE_BATCH_LIMIT:]
+        store = await self._call(
+            lambda: self.agents.vector_stores.create_and_poll(file_ids=first, name=name)
+        )
+        await self.add_to_vector_store(store.id, rest)
+        return store
+
+    async def add_to_vector_store(self, vector_store_id: str, file_ids: List[str]) -> None:
+        """Index more uploaded files into an existing vector store, in batches, and wait for them."""
+        batches = [file_ids[i:i + VECTOR_STORE_BATCH_LIMIT] for i in range(0, len(file_ids), VECTOR_STORE_BATCH_LIMIT)]
+        await asyncio.gather(*[
+            self._call(lambda batch=batch: self.agents.vector_store_file_batches.create_and_poll(
+                vector_store_id=vector_store_id, file_ids=batch
+            ))
+            for batch in batches
+        ])
+
+    async def remove_from_vector_store(self, vector_store_id: str, file_ids: Sequence[str]) -> int:
+        """
+        Detach files from a vector store and delete them; failures are counted, never raised.
+
+        Returns:
+            Number of files deleted
+        """
+        async def detach(file_id: str) -> None:
+            try:
+                await self._call(lambda: self.agents.vector_store_files.delete(
+                    vector_store_id=vector_store_id, file_id=file_id
+                ))
+            except Exception:
+                pass  # already gone from the store; deleting the file below detaches it anyway
+
+        await asyncio.gather(*[detach(file_id) for file_id in file_ids])
+        return await self.delete_files(file_ids)
+
+    async def sync_vector_store(self, paths: Sequence[Path], manifest: "IngestionManifest", name: str) -> "SyncResult":
+        """
+        Bring a persistent vector store in line with the given files, uploading only what changed.
+
+        Files are identified by content hash. Content already in the manifest is
+        reused (even under a new file name), new content is uploaded and
+        indexed, and content no file refers to any more is detached and
+        deleted. A changed file whose upload fails keeps its previous content
+        in the store until a later run indexes the replacement. If the
+        manifest's vector store no longer exists it is rebuilt from scratch. The manifest is saved after every step, so an interrupted
+        run resumes without re-uploading.
+
+        Args:
+            paths: Current input files
+            manifest: Manifest of earlier runs (updated and saved in place)
+            name: Vector store name used when one has to be created
+
+        Returns:
+            SyncResult with the vector store id and what was added/removed
+        """
+        paths = [Path(path) for path in paths]
+        previous = {name: entry["sha256"] for name, entry in manifest.paths.items()}
+        digests = await asyncio.gather(*[asyncio.to_thread(manifest.digest, path) for path in paths])
+        manifest.forget_missing(paths)
+
+        store_exists = False
+        if manifest.vector_store_id:
+            try:
+                await self._call(lambda: self.agents.vector_stores.get(manifest.vector_store_id))
+                store_exists = True
+            except ResourceNotFoundError:
+                # Deleted or expired on the service side; anything else (auth, outage) propagates
+                print(f"⚠️  Vector store {manifest.vector_store_id} no longer exists; rebuilding")
+                orphaned = manifest.reset()
+                if orphaned:
+                    await self.delete_files(orphaned)
+
+        # Identical content under several names is uploaded once
+        new: Dict[str, Path] = {}
+        for path, digest in zip(paths, digests):
+            if digest not in manifest.blobs and digest not in new:
+                new[digest] = path
+        results, failures = await self._upload_many(list(new.values()))
+        for digest, file in zip(new, results):
+            if file is not None:
+                manifest.blobs[digest] = {"file_id": file.id, "indexed": False}
+        manifest.save()
+
+        wanted = [digest for digest in dict.fromkeys(digests) if digest in manifest.blobs]
+        pending = [manifest.blobs[digest]["file_id"] for digest in wanted if not manifest.blobs[digest]["indexed"]]
+        created = not store_exists
+        if created:
+            store = await self.create_vector_store([manifest.blobs[digest]["file_id"] for digest in wanted], name)
+            manifest.vector_store_id = store.id
+        elif pending:
+            await self.add_to_vector_store(manifest.vector_store_id, pending)
+        for digest in wanted:
+            manifest.blobs[digest]["indexed"] = True
+        manifest.save()
+
+        # A changed file whose new content failed to upload keeps its old blob until a later run replaces it
+        current = set(digests) | {previous[path.name] for path, digest in zip(paths, digests)
+                                  if digest not in manifest.blobs and path.name in previous}
+        stale = [digest for digest in manifest.blobs if digest not in current]
+        if stale:
+            await self.remove_from_vector_store(manifest.vector_store_id,
+                                                [manifest.blobs[digest]["file_id"] for digest in stale])
+            for digest in stale:
+                del manifest.blobs[digest]
+            manifest.save()
+
+        return SyncResult(
+            vector_store_id=manifest.vector_store_id,
+            file_ids=[manifest.blobs[digest]["file_id"] for digest in wanted],
+            added=[path.name for path, digest in zip(paths, digests) if digest in new and digest in manifest.blobs],
+            unchanged=[path.name for path, digest in zip(paths, digests) if digest not in new],
+            removed=len(stale),
+            failures=failures,
+            created_store=created,
+        )
+
+    async def delete_files(self, file_ids: Sequence[str]) -> int:
+        """
+        Delete uploaded files concurrently; failures are counted, never raised.
+
+        Returns:
+            Number of files deleted
+        """
+        done = 0
+
+        async def delete(file_id: str) -> None:
+            nonlocal done
+            ok = True
+            try:
+                await self._call(lambda: self.agents.files.delete(file_id))
+                self._stats["deleted"] += 1
+            except Exception:
+                ok = False
+                self._stats["delete_failures"] += 1
+            done += 1
+            if self.progress is not None:
+                self.progress("delete", file_id, ok, done, len(file_ids))
+
+        deleted_before = self._stats["deleted"]
+        await asyncio.gather(*[delete(file_id) for file_id in file_ids])
+        return self._stats["deleted"] - deleted_before
+
+    async def delete_vector_store(self, vector_store_id: str) -> bool:
+        try:
+            await self._call(lambda: self.agents.vector_stores.delete(vector_store_id))
+            return True
+        except Exception:
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters plus upload throughput."""
+        seconds = self._stats["upload_seconds"]
+        return {
+            **self._stats,
+            "upload_seconds": round(seconds, 3),
+            "files_per_second": round(self._stats["uploaded"] / seconds, 2) if seconds else 0.0,
+            "mb_per_second": round(self._stats["bytes"] / 1e6 / seconds, 2) if seconds else 0.0,
+        }
+
+
+def file_digest(path: Path, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's content, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class SyncResult:
+    vector_store_id: str
+    file_ids: List[str]
+    added: List[str]
+    unchanged: List[str]
+    removed: int
+    failures: List[Tuple[Path, Exception]]
+    created_store: bool
+
+
+class IngestionManifest:
+    """
+    Local record of what is uploaded and indexed, keyed by content hash.
+
+    blobs maps a file's SHA-256 to its uploaded file id and whether it is in
+    the vector store; paths maps each input file name to its hash plus the
+    size and mtime it had when hashed, so unchanged files are recognised
+    without reading them again. Written atomically (temp file + rename).
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.vector_store_id: Optional[str] = None
+        self.blobs: Dict[str, Dict[str, Any]] = {}
+        self.paths: Dict[str, Dict[str, Any]] = {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            data = {}
+        if data.get("version") == self.VERSION:
+            self.vector_store_id = data.get("vector_store_id")
+            self.blobs = data.get("blobs", {})
+            self.paths = data.get("paths", {})
+
+    def digest(self, path: Path) -> str:
+        """Content hash of path, recomputed only if its size or mtime changed."""
+        stat = path.stat()
+        entry = self.paths.get(path.name)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return entry["sha256"]
+        digest = file_digest(path)
+        self.paths[path.name] = {"sha256": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        return digest
+
+    def forget_missing(self, paths: Sequence[Path]) -> None:
+        names = {path.name for path in paths}
+        for name in [name for name in self.paths if name not in names]:
+            del self.paths[name]
+
+    def reset(self) -> List[str]:
+        """Forget the vector store and uploads (hash cache is kept); returns the forgotten file ids."""
+        orphaned = [blob["file_id"] for blob in self.blobs.values()]
+        self.vector_store_id = None
+        self.blobs = {}
+        return orphaned
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.path.with_suffix(self.path.suffix + ".tmp")
+        temp.write_text(json.dumps({
+            "version": self.VERSION,
+            "vector_store_id": self.vector_store_id,
+            "blobs": self.blobs,
+            "paths": self.paths,
+        }, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(temp, self.path)
+
+
+# --- Local stand-in for the Azure AI agents file / vector store API ---
+
+@dataclass
+class LocalFile:
+    id: str
+    filename: str
+    bytes: int
+    purpose: str = "assistants"
+    status: str = "processed"
+
+
+@dataclass
+class LocalVectorStore:
+    id: str
+    name: str
+    file_ids: List[str] = field(default_factory=list)
+    status: str = "completed"
+
+
+class _LocalFiles:
+    def __init__(self, service: "LocalAgentsClient"):
+        self._service = service
+
+    async def upload_and_poll(self, file_path: str, purpose: str = "assistants", **kwargs: Any) -> LocalFile:
+        size = os.path.getsize(file_path)
+        await self._service._request(self._service.upload_latency + size / 1e6 * self._service.per_mb_latency)
+        file = LocalFile(id=f"assistant-{uuid.uuid4().hex[:24]}", filename=Path(file_path).name,
+                         bytes=size, purpose=purpose)
+        self._service.stored_files[file.id] = file
+        return file
+
+    async def delete(self, file_id: str) -> None:
+        await self._service._request(self._service.delete_latency)
+        if self._service.stored_files.pop(file_id, None) is None:
+            raise ResourceNotFoundError(f"File {file_id} not found")
+
+
+class _LocalVectorStores:
+    def __init__(self, service: "LocalAgentsClient"):
+        self._service = service
+
+    async def create_and_poll(self, file_ids: Optional[List[str]] = None, name: str = "", **kwargs: Any) -> LocalVectorStore:
+        file_ids = list(file_ids or [])
+        missing = [file_id for file_id in file_ids if file_id not in self._service.stored_files]
+        if missing:
+            raise HttpResponseError(f"Unknown file ids: {missing[:3]}")
+        await self._service._request(self._service.index_latency_per_file * len(file_ids))
+        store = LocalVectorStore(id=f"vs_{uuid.uuid4().hex[:24]}", name=name, file_ids=file_ids)
+        self._service.stored_vector_stores[store.id] = store
+        return store
+
+    async def delete(self, vector_store_id: str) -> None:
+        await self._service._request(self._service.delete_latency)
+        if self._service.stored_vector_stores.pop(vector_store_id, None) is None:
+            raise ResourceNotFoundError(f"Vector store {vector_store_id} not found")
+
+    async def get(self, vector_store_id: str, **kwargs: Any) -> LocalVectorStore:
+        await self._service._request(self._service.delete_latency)
+        store = self._service.stored_vector_stores.get(vector_store_id)
+        if store is None:
+            raise ResourceNotFoundError(f"Vector store {vector_store_id} not found")
+        return store
+
+
+class _LocalVectorStoreFiles:
+    def __init__(self, service: "LocalAgentsClient"):
+        self._service = service
+
+    async def delete(self, vector_store_id: str, file_id: str, **kwargs: Any) -> None:
+        await self._service._request(self._service.delete_latency)
+        store = self._service.stored_vector_stores.get(vector_store_id)
+        if store is None or file_id not in store.file_ids:
+            raise ResourceNotFoundError(f"File {file_id} not in vector store {vector_store_id}")
+        store.file_ids.remove(file_id)
+
+
+class _LocalVectorStoreFileBatches:
+    def __init__(self, service: "LocalAgentsClient"):
+        self._service = service
+
+    async def create_and_poll(self, vector_store_id: str, file_ids: Optional[List[str]] = None, **kwargs: Any) -> Dict[str, Any]:
+        file_ids = list(file_ids or [])
+        store = self._service.stored_vector_stores.get(vector_store_id)
+        if store is None:
+            raise ResourceNotFoundError(f"Vector store {vector_store_id} not found")
+        await self._service._request(self._service.index_latency_per_file * len(file_ids))
+        store.file_ids.extend(file_id for file_id in file_ids if file_id not in store.file_ids)
+        return {"vector_store_id": vector_store_id, "status": "completed", "file_counts": {"completed": len(file_ids)}}
+
+
+class LocalAgentsClient:
+    """
+    In-memory stand-in for client.project_client.agents (files, vector stores,
+    vector store files, file batches and agent definitions).
+
+    Each request sleeps for a latency model of the real service, and a
+    fraction of requests fail with a retryable 503 so retry behaviour and
+    ingestion throughput can be measured offline. With a credential, the
+    first request (and any after the token expires) fetches a bearer token
+    like the SDK's authentication policy, and the first request also pays
+    connect_latency for DNS/TLS setup of the client's connection pool.
+    """
+
+    def __init__(
+        self,
+        upload_latency: float = 0.25,
+        per_mb_latency: float = 0.05,
+        delete_latency: float = 0.08,
+        index_latency_per_file: float = 0.01,
+        failure_rate: float = 0.0,
+        seed: int = 0,
+        credential: Any = None,
+        connect_latency: float = 0.0,
+        agent_latency: float = 0.3
+    ):
+        self.upload_latency = upload_latency
+        self.per_mb_latency = per_mb_latency
+        self.delete_latency = delete_latency
+        self.index_latency_per_file = index_latency_per_file
+        self.failure_rate = failure_rate
+        self.credential = credential
+        self.connect_latency = connect_latency
+        self.agent_latency = agent_latency
+        self.stored_files: Dict[str, LocalFile] = {}
+        self.stored_vector_stores: Dict[str, LocalVectorStore] = {}
+        self.stored_agents: Dict[str, Dict[str, Any]] = {}
+        self.requests = 0
+        self.max_inflight = 0
+        self._inflight = 0
+        self._connected = False
+        self._token: Any = None
+        self._auth_lock = asyncio.Lock()
+        self._rng = random.Random(seed)
+        self.files = _LocalFiles(self)
+        self.vector_stores = _LocalVectorStores(self)
+        self.vector_store_files = _LocalVectorStoreFiles(self)
+        self.vector_store_file_batches = _LocalVectorStoreFileBatches(self)
+
+    async def create_agent(self, model: str, name: Optional[str] = None, instructions: Optional[str] = None,
+                           tools: Any = None, tool_resources: Any = None, **kwargs: Any) -> SimpleNamespace:
+        await self._request(self.agent_latency)
+        agent = SimpleNamespace(id=f"asst_{uuid.uuid4().hex[:24]}", model=model, name=name,
+                                instructions=instructions, tools=tools, tool_resources=tool_resources)
+        self.stored_agents[agent.id] = vars(agent)
+        return agent
+
+    async def delete_agent(self, agent_id: str, **kwargs: Any) -> None:
+        await self._request(self.delete_latency)
+        if self.stored_agents.pop(agent_id, None) is None:
+            raise ResourceNotFoundError(f"Agent {agent_id} not found")
+
+    async def _authenticate(self) -> None:
+        async with self._auth_lock:
+            if not self._connected:
+                await asyncio.sleep(self.connect_latency)
+                self._connected = True
+            if self.credential is not None and (self._token is None or self._token.expires_on - time.time() < 300):
+                self._token = await self.credential.get_token("https://ai.azure.com/.default")
+
+    async def _request(self, seconds: float) -> None:
+        self.requests += 1
+        self._inflight += 1
+        self.max_inflight = max(self.max_inflight, self._inflight)
+        try:
+            await self._authenticate()
+            await asyncio.sleep(seconds)
+            if self.failure_rate and self._rng.random() < self.failure_rate:
+                error = HttpResponseError("Service unavailable (simulated)")
+                error.status_code = 503
+                raise error
+        finally:
+            self._inflight -= 1
@@ -0,0 +1,257 @@
+"""
+Competitive Analysis Pricing
+Vectorized price normalization, cross-catalog product matching and grouped price statistics
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Value of one unit of each currency in USD; override or extend with PRICING_FX_RATES='{"EUR": 1.1}'
+DEFAULT_RATES: Dict[str, float] = {
+    "USD": 1.0, "EUR": 1.08, "GBP": 1.27, "CAD": 0.73, "AUD": 0.66, "JPY": 0.0067,
+    "CHF": 1.13, "SEK": 0.095, "NOK": 0.093, "DKK": 0.145, "PLN": 0.25, "CNY": 0.14,
+}
+CURRENCY_SYMBOLS = {"$": "USD", "€": "EUR", "£": "GBP", "¥": "JPY"}
+PERCENTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+# Tukey fences on log prices: beyond OUTLIER_IQR interquartile ranges outside the quartiles of their category
+OUTLIER_IQR = 1.5
+
+_CURRENCY_PATTERN = "([" + "".join(CURRENCY_SYMBOLS) + r"]|\b[A-Z]{3}\b)"
+
+
+def currency_rates() -> Dict[str, float]:
+    """DEFAULT_RATES with any overrides from the PRICING_FX_RATES environment variable."""
+    rates = dict(DEFAULT_RATES)
+    rates.update({code.upper(): float(rate) for code, rate in json.loads(os.getenv("PRICING_FX_RATES", "{}")).items()})
+    return rates
+
+
+def parse_prices(prices: pd.Series) -> pd.DataFrame:
+    """
+    Split raw price values into amount and currency columns.
+
+    Numbers pass through unchanged; strings like "$1,299.00", "€ 899",
+    "1.299,00 EUR", "1.299 EUR" or "2499 SEK" are parsed with vectorized
+    string operations. The currency is NaN when the value names none.
+    """
+    text_rows = prices.map(lambda value: isinstance(value, str), na_action="ignore").fillna(False).astype(bool)
+    amount = pd.to_numeric(prices.where(~text_rows), errors="coerce")
+    currency = pd.Series(np.nan, index=prices.index, dtype="object")
+    if text_rows.any():
+        text = prices[text_rows].str.strip()
+        found = text.str.extract(_CURRENCY_PATTERN, expand=False)
+        currency[text_rows] = found.replace(CURRENCY_SYMBOLS)
+        digits = text.str.replace(r"[^\d,.\-]", "", regex=True)
+        # A comma followed by 1-2 trailing digits is a decimal comma ("1.299,00"), and dots
+        # between groups of three digits are thousands separators ("1.299", "1.299.000")
+        decimal_comma = digits.str.contains(r",\d{1,2}$", regex=True)
+        digits = digits.where(decimal_comma, digits.str.replace(",", "", regex=False))
+        grouping_dots = decimal_comma | digits.str.fullmatch(r"-?[1-9]\d{0,2}(?:\.\d{3})+")
+        digits = digits.where(~grouping_dots, digits.str.replace(".", "", regex=False))
+        digits = digits.where(~decimal_comma, digits.str.replace(",", ".", regex=False))
+        amount[text_rows] = pd.to_numeric(digits, errors="coerce")
+    return pd.DataFrame({"amount": amount, "currency": currency})
+
+
+def normalize_prices(frame: pd.DataFrame, rates: Optional[Dict[str, float]] = None,
+                     base: str = "USD", default_currency: Optional[str] = None) -> pd.DataFrame:
+    """
+    Add price_amount, currency and price_normalized (in base) columns to a products frame.
+
+    Args:
+        frame: Products with a price column and optionally a currency column
+        rates: Value of one unit of each currency in a common unit (defaults to currency_rates())
+        base: Currency to normalize to
+        default_currency: Currency of prices that name none (defaults to base)
+
+    Returns:
+        New frame; prices in unknown currencies get a NaN price_normalized
+    """
+    rates = rates or currency_rates()
+    parsed = parse_prices(frame["price"])
+    currency = parsed["currency"]
+    if "currency" in frame.columns:
+        # An explicit currency field wins over a symbol in the price text
+        explicit = frame["currency"].astype("object").where(frame["currency"].notna())
+        currency = explicit.str.upper().str.strip().replace(CURRENCY_SYMBOLS).fillna(currency)
+    currency = currency.fillna(default_currency or base)
+    factors = currency.map({code: rate / rates[base] for code, rate in rates.items()}).astype(float)
+    return frame.assign(
+        price_amount=parsed["amount"],
+        currency=currency.astype("category"),
+        price_normalized=parsed["amount"] * factors,
+    )
+
+
+def _normalize_text(values: pd.Series, pattern: str) -> pd.Series:
+    return values.astype("string").str.lower().str.replace(pattern, " ", regex=True).str.strip().fillna("")
+
+
+def match_key(frame: pd.DataFrame) -> pd.Series:
+    """
+    Hashable matching key per product: its normalized SKU, or (without a
+    SKU) its normalized name blocked by category. Products that share a key
+    are the same item, wherever they are listed.
+    """
+    empty = pd.Series("", index=frame.index, dtype="string")
+    sku = _normalize_text(frame["sku"], r"[^0-9a-z]+").str.replace(" ", "", regex=False) if "sku" in frame else empty
+    name = _normalize_text(frame["product_name"], r"[^0-9a-z]+") if "product_name" in frame else empty
+    category = _normalize_text(frame["category"], r"\s+") if "category" in frame else empty
+    key = ("name:" + category + "|" + name).where(name != "", "")
+    return ("sku:" + sku).where(sku != "", key)
+
+
+def match_products(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Group the same product across catalogs through a hashed key index (no pairwise comparison).
+
+    Adds match_group (-1 when a product has neither SKU nor name) and
+    match_catalogs (number of distinct catalogs listing the group).
+    """
+    key = match_key(frame)
+    groups = pd.Series(pd.factorize(key.where(key != ""))[0], index=frame.index)
+    source = frame["source_file"] if "source_file" in frame.columns else pd.Series("", index=frame.index)
+    catalogs = source.astype("object").groupby(groups).transform("nunique")
+    return frame.assign(match_group=groups, match_catalogs=catalogs.where(groups >= 0, 0).astype(int))
+
+
+def price_indexes(frame: pd.DataFrame, price: str = "price_normalized") -> pd.DataFrame:
+    """
+    Add category_index (100 = category median) and competitor_index
+    (100 = mean price of the same product's other listings, NaN when it has
+    none) plus an outlier flag from the category's Tukey fences, taken on
+    log prices since price lists are right-skewed.
+    """
+    values = frame[price]
+    category = frame["category"] if "category" in frame.columns else pd.Series("", index=frame.index)
+    median = values.groupby(category, observed=True).transform("median")
+    log_values = np.log(values)
+    by_category = log_values.groupby(category, observed=True)
+    q1, q3 = (by_category.transform("quantile", q) for q in (0.25, 0.75))
+    iqr = q3 - q1
+
+    grouped = values.groupby(frame["match_group"].where(frame["match_group"] >= 0))
+    others = grouped.transform("count") - 1
+    others_mean = (grouped.transform("sum") - values) / others.where(others > 0)
+    return frame.assign(
+        category_index=100 * values / median,
+        competitor_index=100 * values / others_mean,
+        outlier=((log_values < q1 - OUTLIER_IQR * iqr) | (log_values > q3 + OUTLIER_IQR * iqr)).fillna(False),
+    )
+
+
+def grouped_stats(frame: pd.DataFrame, by: Sequence[str], price: str = "price_normalized") -> pd.DataFrame:
+    """Count, mean, percentiles, range, outliers and median price indexes per group."""
+    by = [column for column in by if column in frame.columns]
+    if not by:
+        return pd.DataFrame()
+    grouped = frame.assign(matched=frame["match_catalogs"] > 1).groupby(by, observed=True)
+    stats = grouped[price].agg(["count", "mean", "min", "max"])
+    percentiles = grouped[price].quantile(list(PERCENTILES)).unstack()
+    percentiles.columns = [f"p{int(q * 100)}" for q in percentiles.columns]
+    indexes = grouped[["category_index", "competitor_index"]].median()
+    stats = stats.join(percentiles).join(indexes)
+    stats["outliers"] = grouped["outlier"].sum()
+    stats["matched"] = grouped["matched"].sum()
+    return stats.sort_values("count", ascending=False)
+
+
+@dataclass
+class PricingAnalysis:
+    """Per-product pricing frame plus grouped statistics, shared between executors by reference."""
+    products: pd.DataFrame
+    by_manufacturer: pd.DataFrame
+    by_category: pd.DataFrame
+    by_segment: pd.DataFrame
+    base_currency: str
+    summary: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def nbytes(self) -> int:
+        frames = (self.products, self.by_manufacturer, self.by_category, self.by_segment)
+        return int(sum(frame.memory_usage(deep=True).sum() for frame in frames))
+
+    def describe(self) -> str:
+        """One-paragraph text summary for the workflow message."""
+        s = self.summary
+        if not s.get("priced"):
+            return "No price data available"
+        text = (f"Analyzed {s['priced']} products in {s['currencies']} currencies "
+                f"(normalized to {self.base_currency}). Price range: "
+                f"{s['min']:,.2f} - {s['max']:,.2f}, median {s['median']:,.2f} {self.base_currency}. "
+                f"{s['matched_groups']} products matched across catalogs; {s['outliers']} price outliers.")
+        if s.get("unconverted"):
+            text += f" {s['unconverted']} prices in unknown currencies were excluded."
+        return text
+
+
+def analyze_pricing(frame: pd.DataFrame, rates: Optional[Dict[str, float]] = None, base: str = "USD",
+                    default_currency: Optional[str] = None) -> PricingAnalysis:
+    """
+    Normalize currencies, match products across catalogs and compute grouped price statistics.
+
+    Args:
+        frame: Extracted products (price, sku, product_name, category, manufacturer, source_file)
+        rates: Currency values in a common unit (defaults to currency_rates())
+        base: Currency all statistics are expressed in
+        default_currency: Currency of prices that name none (defaults to base)
+
+    Returns:
+        PricingAnalysis with the enriched products and per-manufacturer/category statistics
+    """
+    if "price" not in frame.columns:
+        frame = frame.assign(price=np.nan)
+    priced = normalize_prices(frame, rates, base, default_currency)
+    unconverted = int((priced["price_amount"].notna() & priced["price_normalized"].isna()).sum())
+    priced = priced[priced["price_normalized"].notna() & (priced["price_normalized"] > 0)]
+    priced = price_indexes(match_products(priced))
+
+    prices = priced["price_normalized"]
+    summary: Dict[str, Any] = {"products": len(frame), "priced": len(priced), "unconverted": unconverted}
+    if len(priced):
+        summary.update(
+            min=float(prices.min()), max=float(prices.max()), median=float(prices.median()),
+            currencies=int(priced["currency"].nunique()),
+            matched_groups=int(priced.loc[priced["match_catalogs"] > 1, "match_group"].nunique()),
+            outliers=int(priced["outlier"].sum()),
+        )
+    return PricingAnalysis(
+        products=priced,
+        by_manufacturer=grouped_stats(priced, ["manufacturer"]),
+        by_category=grouped_stats(priced, ["category"]),
+        by_segment=grouped_stats(priced, ["category", "manufacturer"]),
+        base_currency=base,
+        summary=summary,
+    )
+
+
+def products_frame(message: Dict[str, Any]) -> pd.DataFrame:
+    """The products DataFrame of a workflow message (the shared artifact when it carries a reference)."""
+    from competitive_artifacts import artifact_store
+    from competitive_products import product_frames
+
+    if isinstance(message.get("products"), dict):
+        return artifact_store.get(message["products"])
+    chunks = list(product_frames(message))
+    return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+
+
+def shared_analysis(message: Dict[str, Any], base: str = "USD", default_currency: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Artifact reference to the run's PricingAnalysis, computed on first get().
+
+    Every stage of a run that asks for it gets the same reference, so
+    concurrent stages share one analysis; it is released with the run.
+    """
+    from competitive_artifacts import artifact_store
+
+    run = message.get("run")
+    return artifact_store.put_lazy(
+        lambda: analyze_pricing(products_frame(message), base=base, default_currency=default_currency),
+        key=f"pricing:{run}" if run else None, kind="pricing", run=run,
+    )
@@ -0,0 +1,119 @@
+"""
+Competitive Analysis Product Files
+Append-as-you-go JSON Lines storage of extracted products with chunked readers
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import pandas as pd
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+class ProductWriter:
+    """
+    Appends extracted products to a JSON Lines file as they arrive.
+
+    The file is line-buffered, so after a crash every product extracted so
+    far is on disk and readable; close() also fsyncs. Use as a context
+    manager or call close() when extraction is done.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # A new run starts a new file; buffering=1 writes every line through
+        self._file = open(self.path, "w", encoding="utf-8", buffering=1)
+        self.count = 0
+
+    def write(self, product: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(product, ensure_ascii=False, default=str) + "\n")
+        self.count += 1
+
+    def rewrite(self, products: Iterable[Dict[str, Any]]) -> None:
+        """Atomically replace the file's content, e.g. after duplicates filled in fields of written products."""
+        self.close()
+        temp = self.path.with_suffix(self.path.suffix + ".tmp")
+        count = 0
+        try:
+            with open(temp, "w", encoding="utf-8") as f:
+                for product in products:
+                    f.write(json.dumps(product, ensure_ascii=False, default=str) + "\n")
+                    count += 1
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp, self.path)
+        except BaseException:
+            # The old content stays in place
+            temp.unlink(missing_ok=True)
+            raise
+        self.count = count
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+    def __enter__(self) -> "ProductWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def read_product_chunks(path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    Read a products JSON Lines file as DataFrames of at most chunk_size rows.
+
+    Values are kept as written (no dtype guessing, so SKUs like "007" stay
+    strings); a torn last line from an interrupted run is skipped.
+    """
+    batch: List[Dict[str, Any]] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                batch.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+            if len(batch) >= chunk_size:
+                yield pd.DataFrame.from_records(batch)
+                batch = []
+    if batch:
+        yield pd.DataFrame.from_records(batch)
+
+
+def product_frames(message: Dict[str, Any], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    Product chunks for a workflow message: from the artifact store when
+    message["products"] is an artifact reference, read lazily from
+    message["products_path"], or sliced from an in-memory products list.
+    """
+    if isinstance(message.get("products"), dict):
+        from competitive_artifacts import artifact_store
+        yield from artifact_store.chunks(message["products"], chunk_size)
+        return
+    path = message.get("products_path")
+    if path:
+        if Path(path).exists():
+            yield from read_product_chunks(Path(path), chunk_size)
+        return
+    products = message.get("products") or []
+    for start in range(0, len(products), chunk_size):
+        yield pd.DataFrame.from_records(products[start:start + chunk_size])
+
+
+def product_count(message: Dict[str, Any]) -> int:
+    """Number of products a workflow message refers to."""
+    if "product_count" in message:
+        return int(message["product_count"])
+    products = message.get("products") or []
+    return int(products["rows"]) if isinstance(products, dict) else len(products)
+
+
+def products_message(path: Optional[Path], count: int, **fields: Any) -> Dict[str, Any]:
+    """Workflow message pointing at a products file instead of carrying the products."""
+    return {"products_path": str(path) if path else None, "product_count": count, **fields}
@@ -10,41 +10,29 @@ Usage:
 """
 
 import asyncio
-import json
 import os
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Awaitable, Dict, List, Optional
 from datetime import datetime
 
-# Data analysis and visualization
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-# Agent framework
+# Agent framework (needed to define the executors; everything heavier is imported on first use)
 from agent_framework import (
     ChatMessage,
     Executor,
-    HostedFileSearchTool,
-    HostedVectorStoreContent,
-    SequentialBuilder,
+    WorkflowBuilder,
     WorkflowContext,
     handler,
 )
-from agent_framework_azure_ai import AzureAIAgentClient
-from azure.ai.agents.models import FileInfo, VectorStore
-from azure.identity.aio import AzureCliCredential
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+from competitive_extraction import ProductMerger, extract_per_file
 
-# Set plot style
-sns.set_style("whitegrid")
-plt.rcParams['figure.figsize'] = (12, 6)
+if TYPE_CHECKING:
+    from agent_framework import Workflow
+    from azure.ai.agents.models import FileInfo, VectorStore
+    from competitive_clients import AgentClientPool
 
-# Create folder structure
+# Folder structure (created by create_workflow)
 FOLDERS = {
     'input': './competitive_analysis/input',
     'output': './competitive_analysis/output',
@@ -52,42 +40,164 @@ FOLDERS = {
     'charts': './competitive_analysis/charts',
 }
 
-for folder_path in FOLDERS.values():
-    Path(folder_path).mkdir(parents=True, exist_ok=True)
+# Plot style, applied where charts are drawn
+PLOT_STYLE = "whitegrid"
+FIGURE_SIZE = (12, 6)
+
+# Incremental ingestion: keep the vector store between runs and only upload new/changed PDFs
+INCREMENTAL_INGESTION = os.getenv("INGEST_INCREMENTAL", "1") != "0"
+INGESTION_MANIFEST = Path(FOLDERS['data']) / "ingestion_manifest.json"
+
+# Extraction agent definition (created once per vector store by the client pool, reused across runs)
+EXTRACTION_AGENT_NAME = "DataExtractionAgent"
+EXTRACTION_INSTRUCTIONS = (
+    "Extract ALL products from the named PDF catalog. "
+    "Return JSON array with product_name, sku, price, category, manufacturer, source_file."
+)
+
+# Currency all pricing statistics and charts are expressed in
+PRICING_BASE_CURRENCY = os.getenv("PRICING_BASE_CURRENCY", "USD")
+PRICING_DEFAULT_CURRENCY = os.getenv("PRICING_DEFAULT_CURRENCY")
+
+# Per-stage timeouts in seconds: STAGE_TIMEOUT_<STAGE ID> (e.g. STAGE_TIMEOUT_VISUALIZATION), else
+# STAGE_TIMEOUT_SECONDS, else these defaults; 0 disables the timeout
+STAGE_TIMEOUTS = {
+    "data_extraction": 3600.0,
+    "pricing_analysis": 300.0,
+    "visualization": 300.0,
+    "report_generation": 60.0,
+}
+
+# Map step: one extraction run per catalog
+EXTRACTION_PROMPT = (
+    "Use file search to extract ALL furniture products from the catalog '{source_file}' only. "
+    "Return a JSON array; set source_file to '{source_file}' for every product."
+)
+
+
+def stage_timeouts() -> Dict[str, Optional[float]]:
+    """Timeout per stage id from the environment (None = no timeout)."""
+    timeouts: Dict[str, Optional[float]] = {}
+    for stage, default in STAGE_TIMEOUTS.items():
+        value = float(os.getenv(f"STAGE_TIMEOUT_{stage.upper()}", os.getenv("STAGE_TIMEOUT_SECONDS", default)))
+        timeouts[stage] = value or None
+    return timeouts
+
+
+def prepare_environment() -> None:
+    """Load .env, verify configuration and create the folder structure."""
+    from dotenv import load_dotenv
+    load_dotenv()
+    
+    if not os.getenv("AZURE_AI_PROJECT_ENDPOINT"):
+        raise ValueError("❌ AZURE_AI_PROJECT_ENDPOINT not set in .env file")
+    
+    for folder_path in FOLDERS.values():
+        Path(folder_path).mkdir(parents=True, exist_ok=True)
+
+
+class TimedStageExecutor(Executor):
+    """Executor whose stage runs under a timeout and records its latency in the message."""
+
+    def __init__(self, id: str, timeout: Optional[float] = None):
+        super().__init__(id=id)
+        self.timeout = timeout
+
+    async def _run_stage(self, message: Dict[str, Any], work: Awaitable[Dict[str, Any]],
+                         partial: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Await the stage's work within its timeout.
 
-# Verify configuration
-project_endpoint = os.getenv("AZURE_AI_PROJECT_ENDPOINT")
-if not project_endpoint:
-    raise ValueError("❌ AZURE_AI_PROJECT_ENDPOINT not set in .env file")
+        A stage that times out or raises still returns a message, so the
+        fan-in join downstream always fires. A timeout cancels the stage's
+        coroutine, but work it handed to a thread (asyncio.to_thread) runs on
+        in the background; such work must not rely on the run's artifacts
+        outliving the run (ArtifactStore.get tolerates a release mid-load).
 
+        Args:
+            message: Incoming message, passed on with the stage's fields added
+            work: Coroutine returning the fields this stage adds
+            partial: Fields the work fills in when it is cancelled, passed on after a timeout
 
-class DataExtractionExecutor(Executor):
+        Returns:
+            Outgoing message with the stage latency under "timings" and,
+            if the stage timed out or failed, its error under "stage_errors"
+        """
+        start = time.perf_counter()
+        result: Dict[str, Any] = {}
+        errors = dict(message.get("stage_errors") or {})
+        try:
+            result = await asyncio.wait_for(work, self.timeout)
+        except asyncio.TimeoutError:
+            result = dict(partial or {})
+            errors[self.id] = f"timed out after {self.timeout:g}s"
+            print(f"\n⏱️  {self.id} {errors[self.id]}")
+        except Exception as e:
+            errors[self.id] = f"failed: {e}"
+            print(f"\n❌ {self.id} {errors[self.id]}")
+        seconds = time.perf_counter() - start
+        print(f"⏱️  {self.id}: {seconds:.2f}s")
+        timings = {**(message.get("timings") or {}), self.id: round(seconds, 3)}
+        return {**message, **result, "timings": timings, "stage_errors": errors}
+
+
+class DataExtractionExecutor(TimedStageExecutor):
     """Extracts product data from PDF files using Azure AI file search."""
 
+    def __init__(self, id: str, pool: "AgentClientPool", timeout: Optional[float] = None):
+        super().__init__(id=id, timeout=timeout)
+        self.pool = pool
+
     @handler
     async def handle_chat_message(self, message: list[ChatMessage], ctx: WorkflowContext[dict[str, Any]]) -> None:
         """Handle initial data extraction request from DevUI."""
         user_query = str(message[-1]) if message else "Analyze products"
-        await self._extract_data(user_query, ctx)
+        await self._run(user_query, ctx)
     
     @handler
     async def handle_string(self, message: str, ctx: WorkflowContext[dict[str, Any]]) -> None:
         """Handle direct string input for testing."""
-        await self._extract_data(message, ctx)
+        await self._run(message, ctx)
     
-    async def _extract_data(self, query: str, ctx: WorkflowContext[dict[str, Any]]) -> None:
-        """Core extraction logic - same as Tutorial 11."""
+    async def _run(self, query: str, ctx: WorkflowContext[dict[str, Any]]) -> None:
+        from competitive_artifacts import new_run_id
+        from competitive_products import products_message
+        
+        # The run id and start time travel with the messages; a timeout still sends the products written so far
+        run_id = new_run_id()
+        message = products_message(None, 0, run=run_id, started_at=time.time())
+        partial: Dict[str, Any] = {}
+        await ctx.send_message(await self._run_stage(message, self._extract_data(query, run_id, partial), partial))
+    
+    async def _extract_data(self, query: str, run_id: str,
+                            partial: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Core extraction logic - same as Tutorial 11; returns the products message fields.
+
+        If cancelled (stage timeout), the products written so far are
+        registered and their message fields put into partial.
+        """
         print("="*70)
         print("🤖 AGENT 1: DOCUMENT SEARCH & DATA EXTRACTION")
         print("="*70)
         print(f"Processing request: {query}")
         
-        project_endpoint = os.getenv("AZURE_AI_PROJECT_ENDPOINT")
-        client = AzureAIAgentClient(endpoint=project_endpoint, async_credential=AzureCliCredential())
+        from competitive_artifacts import artifact_store
+        from competitive_ingestion import IngestionManifest, ParallelIngestor
+        from competitive_products import ProductWriter, products_message
         
-        files: List[FileInfo] = []
-        vector_store: Optional[VectorStore] = None
-        extracted_products = []
+        # Credential, project client and agent definitions are shared by every run of this workflow
+        ingestor = ParallelIngestor(
+            self.pool.agents,
+            max_concurrency=int(os.getenv("INGEST_MAX_CONCURRENCY", "8")),
+            max_retries=int(os.getenv("INGEST_MAX_RETRIES", "3")),
+        )
+        
+        files: List["FileInfo"] = []
+        vector_store: Optional["VectorStore"] = None
+        # One file per run: a later run must not truncate the file an earlier run's stages still read
+        products_file = Path(FOLDERS['data']) / f"extracted_products_{run_id}.jsonl"
+        writer: Optional[ProductWriter] = None
         
         try:
             # Find PDF files
@@ -97,193 +207,326 @@ class DataExtractionExecutor(Executor):
             if not pdf_files:
                 error_message = f"❌ No PDF files found in {FOLDERS['input']}"
                 print(error_message)
-                await ctx.send_message({"products": [], "error": error_message})
-                return
+                return products_message(None, 0, run=run_id, error=error_message)
                 
             print(f"\n✅ Found {len(pdf_files)} PDF file(s)")
             
-            # Upload files
-            print("\n⬆️  Uploading files to Azure AI...")
-            file_ids = []
-            for pdf_file in pdf_files:
-                file = await client.project_client.agents.files.upload_and_poll(
-                    file_path=str(pdf_file), purpose="assistants"
+            if INCREMENTAL_INGESTION:
+                # Sync the persistent vector store with the input folder
+                print("\n🔁 Syncing vector store with input files...")
+                sync_result = await ingestor.sync_vector_store(
+                    pdf_files, IngestionManifest(INGESTION_MANIFEST), name="competitive_intelligence_store"
                 )
-                files.append(file)
-                file_ids.append(file.id)
-                print(f"   ✅ {pdf_file.name}")
+                failures = sync_result.failures
+                for pdf_file, error in failures:
+                    print(f"   ⚠️  Skipped {pdf_file.name}: {error}")
+                if not sync_result.file_ids:
+                    raise RuntimeError("No files could be ingested")
+                print(f"✅ Vector store {'created' if sync_result.created_store else 'reused'}: {sync_result.vector_store_id} "
+                      f"({len(sync_result.added)} new/changed, {len(sync_result.unchanged)} unchanged, {sync_result.removed} removed)")
+                vector_store_id = sync_result.vector_store_id
+            else:
+                # Upload files (concurrently, with retry)
+                print("\n⬆️  Uploading files to Azure AI...")
+                files, failures = await ingestor.upload_files(pdf_files)
+                for pdf_file, error in failures:
+                    print(f"   ⚠️  Skipped {pdf_file.name}: {error}")
+                if not files:
+                    raise RuntimeError("All file uploads failed")
+                stats = ingestor.stats()
+                print(f"   {len(files)} file(s) in {stats['upload_seconds']:.1f}s ({stats['files_per_second']} files/s)")
+                file_ids = [file.id for file in files]
+                
+                # Create a throwaway vector store (deleted again below)
+                print("\n📊 Creating vector store...")
+                vector_store = await ingestor.create_vector_store(file_ids, name="competitive_intelligence_store")
+                print(f"✅ Vector store created: {vector_store.id}")
+                vector_store_id = vector_store.id
             
-            # Create vector store
-            print("\n📊 Creating vector store...")
-            vector_store = await client.project_client.agents.vector_stores.create_and_poll(
-                file_ids=file_ids, name="competitive_intelligence_store"
-            )
-            print(f"✅ Vector store created: {vector_store.id}")
+            # Get the AI agent with file search (created on first use, then reused by later runs)
+            print("\n🤖 Getting extraction agent...")
+            agent = await self.pool.agent(EXTRACTION_AGENT_NAME, EXTRACTION_INSTRUCTIONS, [vector_store_id])
+            failed = {pdf_file for pdf_file, _ in failures}
+            sources = [pdf_file.name for pdf_file in pdf_files if pdf_file not in failed]
+            print(f"🔍 Extracting products from {len(sources)} catalog(s)...")
             
-            # Create file search tool
-            file_search_tool = HostedFileSearchTool(
-                inputs=[HostedVectorStoreContent(vector_store_id=vector_store.id)]
-            )
+            async def extract_catalog(source_file: str):
+                async for update in agent.run_stream(EXTRACTION_PROMPT.format(source_file=source_file)):
+                    if update.text:
+                        yield update.text
             
-            # Create AI agent
-            print("\n🤖 Creating extraction agent...")
-            async with (
-                AzureCliCredential() as credential,
-                AzureAIAgentClient(
-                    endpoint=project_endpoint, 
-                    async_credential=credential
-                ).create_agent(
-                    name="DataExtractionAgent",
-                    instructions="Extract ALL products from PDF catalogs. Return JSON array with product_name, sku, price, category, manufacturer, source_file.",
-                    tools=[file_search_tool],
-                ) as agent,
-            ):
-                print("🔍 Extracting products...")
-                
-                response = await agent.run(
-                    "Use file search to extract ALL furniture products from the catalogs. Return comprehensive JSON array."
-                )
-                
-                # Parse JSON
-                response_text = response.text
-                if "```json" in response_text:
-                    response_text = response_text.split("```json")[1].split("```")[0].strip()
-                elif "```" in response_text:
-                    response_text = response_text.split("```")[1].split("```")[0].strip()
-                
-                try:
-                    extracted_products = json.loads(response_text)
-                    print(f"\n✅ Extracted {len(extracted_products)} products")
-                except json.JSONDecodeError as e:
-                    print(f"\n⚠️  JSON parse error: {e}")
-                    extracted_products = []
+            # Catalogs run concurrently; products are parsed as they stream, merged by SKU
+            # and appended to disk as soon as they are new, so a crash keeps what was found
+            writer = ProductWriter(products_file)
+            merger = ProductMerger()
+            result = await extract_per_file(
+                sources,
+                extract_catalog,
+                max_concurrency=int(os.getenv("EXTRACTION_MAX_CONCURRENCY", "4")),
+                timeout=float(os.getenv("EXTRACTION_TIMEOUT_SECONDS", "300")),
+                merger=merger,
+                on_product=writer.write,
+            )
+            for file_result in result.files:
+                status = "⚠️ " if file_result.error or file_result.truncated else "✅"
+                note = f" ({file_result.error})" if file_result.error else " (truncated)" if file_result.truncated else ""
+                print(f"   {status} {file_result.source_file}: {file_result.products} products{note}")
+            print(f"\n✅ Extracted {len(merger)} products "
+                  f"({result.duplicates} duplicates merged) in {result.seconds:.1f}s")
             
-            # Save data
-            if extracted_products:
-                output_file = Path(FOLDERS['data']) / "extracted_products.json"
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(extracted_products, f, indent=2)
-                print(f"💾 Saved to: {output_file}")
+            # Save data: products are already on disk; rewrite once if duplicates completed written records
+            if merger.updated:
+                writer.rewrite(merger.products)
+            writer.close()
+            print(f"💾 Saved to: {products_file}")
             
-            await ctx.send_message({"products": extracted_products})
+            # Later stages get a reference; the DataFrame is built at most once, on first use
+            products_ref = artifact_store.put_file(products_file, rows=writer.count, run=run_id)
+            return products_message(products_file, writer.count, products=products_ref, run=run_id)
             
         except Exception as e:
             print(f"\n❌ Error: {e}")
-            await ctx.send_message({"products": extracted_products, "error": str(e)})
+            if writer is None:
+                return products_message(None, 0, run=run_id, error=str(e))
+            writer.close()
+            products_ref = artifact_store.put_file(products_file, rows=writer.count, run=run_id)
+            return products_message(products_file, writer.count, products=products_ref, run=run_id, error=str(e))
+        
+        except asyncio.CancelledError:
+            if writer is not None and partial is not None:
+                writer.close()
+                products_ref = artifact_store.put_file(products_file, rows=writer.count, run=run_id)
+                partial.update(products_message(products_file, writer.count, products=products_ref, run=run_id))
+            raise
         
         finally:
-            # Cleanup
+            # Also fsyncs the file when a cancellation or unexpected error skipped the branches above
+            if writer is not None:
+                writer.close()
+            # Cleanup of a throwaway store (concurrently; failures are counted, not raised).
+            # In incremental mode nothing is assigned here and the store persists.
+            # The pooled client and credential stay open for the next run.
+            ingestor.progress = None
             if vector_store:
-                try:
-                    await client.project_client.agents.vector_stores.delete(vector_store.id)
-                except: 
-                    pass
-            for file in files:
-                try:
-                    await client.project_client.agents.files.delete(file.id)
-                except: 
-                    pass
-            await client.close()
+                await self.pool.release_agents(vector_store.id)
+                await ingestor.delete_vector_store(vector_store.id)
+            if files:
+                deleted = await ingestor.delete_files([file.id for file in files])
+                print(f"🧹 Deleted {deleted}/{len(files)} uploaded file(s)")
 
 
-class PricingAnalysisExecutor(Executor):
-    """Simplified pricing analysis."""
+class PricingAnalysisExecutor(TimedStageExecutor):
+    """Pricing analysis: currency normalization, cross-catalog matching and grouped price statistics."""
 
     @handler
     async def handle_data(self, message: dict[str, Any], ctx: WorkflowContext[dict[str, Any]]) -> None:
+        await ctx.send_message(await self._run_stage(message, self._analyze(message)))
+    
+    async def _analyze(self, message: Dict[str, Any]) -> Dict[str, Any]:
         print("="*70)
         print("💰 AGENT 2: PRICING ANALYSIS")
         print("="*70)
         
-        products = message.get("products", [])
+        from competitive_artifacts import artifact_store
+        from competitive_pricing import shared_analysis
+        from competitive_products import product_count
         
-        if products:
-            df = pd.DataFrame(products)
-            if 'price' in df.columns:
-                df['price_numeric'] = pd.to_numeric(df['price'], errors='coerce')
-                df = df[df['price_numeric'].notna()]
-                
-                analysis = f"Analyzed {len(df)} products. Price range: ${df['price_numeric'].min():.2f} - ${df['price_numeric'].max():.2f}"
-                print(f"\n✅ {analysis}")
-            else:
-                analysis = "No price data available"
-        else:
-            analysis = "No products to analyze"
+        if not product_count(message):
+            return {"analysis": "No products to analyze"}
         
-        await ctx.send_message({"analysis": analysis, "products": products})
+        # Computed once per run in a worker thread, shared with the visualization stage running alongside
+        pricing_ref = shared_analysis(message, base=PRICING_BASE_CURRENCY, default_currency=PRICING_DEFAULT_CURRENCY)
+        pricing = await asyncio.to_thread(artifact_store.get, pricing_ref)
+        analysis = pricing.describe()
+        print(f"\n✅ {analysis}")
+        if not pricing.by_manufacturer.empty:
+            columns = ["count", "p25", "p50", "p75", "category_index", "competitor_index", "outliers"]
+            print(f"\n📋 Top manufacturers ({pricing.base_currency}):")
+            print(pricing.by_manufacturer[columns].head(10).round(1).to_string())
+        
+        return {"analysis": analysis, "pricing": pricing_ref}
 
 
-class VisualizationExecutor(Executor):
-    """Simplified visualization."""
+class VisualizationExecutor(TimedStageExecutor):
+    """Renders pricing charts off the event loop, reusing charts whose data did not change."""
 
     @handler
-    async def handle_analysis(self, message: dict[str, Any], ctx: WorkflowContext[dict[str, Any]]) -> None:
+    async def handle_products(self, message: dict[str, Any], ctx: WorkflowContext[dict[str, Any]]) -> None:
+        await ctx.send_message(await self._run_stage(message, self._visualize(message)))
+    
+    async def _visualize(self, message: Dict[str, Any]) -> Dict[str, Any]:
         print("="*70)
         print("📊 AGENT 3: VISUALIZATION")
         print("="*70)
         
-        products = message.get("products", [])
-        charts = []
+        from competitive_artifacts import artifact_store
+        from competitive_charts import chart_renderer, chart_specs
+        from competitive_pricing import shared_analysis
+        from competitive_products import product_count
         
-        if products:
-            print(f"✅ Created visualizations for {len(products)} products")
+        if not product_count(message):
+            print("No products to visualize")
+            return {"charts": []}
         
-        await ctx.send_message({
-            "analysis": message.get("analysis", ""),
-            "products": products,
-            "charts": charts
-        })
+        # Same analysis as the pricing stage (whichever stage asks first computes it)
+        pricing_ref = shared_analysis(message, base=PRICING_BASE_CURRENCY, default_currency=PRICING_DEFAULT_CURRENCY)
+        pricing = await asyncio.to_thread(artifact_store.get, pricing_ref)
+        
+        # Specs carry aggregates only; drawing happens in the chart process pool
+        specs = chart_specs(pricing, style=PLOT_STYLE, figsize=FIGURE_SIZE)
+        result = await chart_renderer.render(specs, Path(FOLDERS['charts']))
+        charts = [str(path) for path in result.paths]
+        for name, error in result.failures:
+            print(f"   ⚠️  {name}: {error}")
+        print(f"✅ {len(charts)} chart(s) in {FOLDERS['charts']} "
+              f"({len(result.rendered)} rendered, {len(result.cached)} unchanged) in {result.seconds:.1f}s")
+        return {"charts": charts}
 
 
-class ReportGeneratorExecutor(Executor):
-    """Simplified report generation."""
+class ReportGeneratorExecutor(TimedStageExecutor):
+    """Joins the pricing and visualization branches and reports per-stage and end-to-end latency."""
 
     @handler
-    async def handle_report(self, message: dict[str, Any], ctx: WorkflowContext[list[ChatMessage], list[ChatMessage]]) -> None:
+    async def handle_report(self, messages: list[dict[str, Any]], ctx: WorkflowContext[list[ChatMessage], list[ChatMessage]]) -> None:
+        # Fan-in: one message per branch, each the products message plus that branch's fields
+        message: Dict[str, Any] = {"timings": {}, "stage_errors": {}}
+        for branch in messages:
+            message.update({key: value for key, value in branch.items() if key not in ("timings", "stage_errors")})
+            message["timings"].update(branch.get("timings") or {})
+            message["stage_errors"].update(branch.get("stage_errors") or {})
+        
+        message = await self._run_stage(message, self._report(message))
+        
+        # Last stage: drop this run's shared artifacts (products frame, pricing analysis). A load still
+        # running in a timed-out stage's thread finishes on its own and is then discarded
+        from competitive_artifacts import artifact_store
+        if message.get("run"):
+            artifact_store.release_run(message["run"])
+        
+        total = time.time() - message["started_at"] if message.get("started_at") else sum(message["timings"].values())
+        latency = "\n".join(
+            ["## Latency", "", "| Stage | Seconds |", "|---|---:|"]
+            + [f"| {stage} | {seconds:.2f} |" for stage, seconds in message["timings"].items()]
+            + [f"| **End to end** | **{total:.2f}** |"]
+        )
+        errors = "".join(f"\n- ⚠️ {stage}: {error}" for stage, error in message["stage_errors"].items())
+        print(f"\n⏱️  End to end: {total:.2f}s (sum of stages {sum(message['timings'].values()):.2f}s)")
+        
+        report = message.get("report") or "# Competitive Intelligence Report\n"
+        content = f"{report}\n{latency}\n" + (f"\n## Stage errors\n{errors}\n" if errors else "")
+        
+        await ctx.yield_output([ChatMessage(role="assistant", text=content)])
+    
+    async def _report(self, message: Dict[str, Any]) -> Dict[str, Any]:
         print("="*70)
         print("📝 AGENT 4: REPORT GENERATION")
         print("="*70)
         
-        products = message.get("products", [])
-        
-        report = f"# Competitive Intelligence Report\n\nAnalyzed {len(products)} products.\n"
+        from competitive_products import product_count
         
+        count = product_count(message)
+        charts = "\n".join(f"- {chart}" for chart in message.get("charts") or []) or "No charts"
+        report = (
+            f"# Competitive Intelligence Report\n\n✅ Analyzed {count} products.\n\n"
+            f"## Pricing\n\n{message.get('analysis', 'No pricing analysis')}\n\n"
+            f"## Charts\n\n{charts}\n"
+        )
         print(f"\n✅ Report generated")
-        
-        from agent_framework._types import ChatMessage as CM
-        result_message = CM(role="assistant", content=f"✅ Report complete! Analyzed {len(products)} products.")
-        await ctx.yield_output([result_message])
-
-
-# Create workflow
-print("🔧 Building workflow...")
-workflow = (
-    SequentialBuilder()
-    .participants([
-        DataExtractionExecutor(id="data_extraction"),
-        PricingAnalysisExecutor(id="pricing_analysis"),
-        VisualizationExecutor(id="visualization"),
-        ReportGeneratorExecutor(id="report_generation"),
-    ])
-    .build()
-)
-print("✅ Workflow built!\n")
+        return {"report": report}
+
+
+def create_workflow(pool: Optional["AgentClientPool"] = None,
+                    timeouts: Optional[Dict[str, Optional[float]]] = None) -> "Workflow":
+    """
+    Prepare the environment and build a new instance of the 4-agent workflow.
+
+    Extraction fans out to pricing analysis and visualization, which run
+    concurrently; the report stage joins both.
+
+    Args:
+        pool: Client pool shared by the workflow's runs (a new one by default)
+        timeouts: Timeout in seconds per stage id (defaults to stage_timeouts())
+
+    Returns:
+        Workflow; its pool is available as workflow.client_pool
+    """
+    from competitive_clients import AgentClientPool
+    
+    prepare_environment()
+    print("🔧 Building workflow...")
+    pool = pool or AgentClientPool(
+        refresh_margin=float(os.getenv("TOKEN_REFRESH_MARGIN_SECONDS", "300")),
+        max_agents=int(os.getenv("AGENT_POOL_MAX_AGENTS", "16")),
+    )
+    timeouts = {**stage_timeouts(), **(timeouts or {})}
+    extraction = DataExtractionExecutor(id="data_extraction", pool=pool, timeout=timeouts["data_extraction"])
+    pricing = PricingAnalysisExecutor(id="pricing_analysis", timeout=timeouts["pricing_analysis"])
+    visualization = VisualizationExecutor(id="visualization", timeout=timeouts["visualization"])
+    report = ReportGeneratorExecutor(id="report_generation", timeout=timeouts["report_generation"])
+    workflow = (
+        WorkflowBuilder()
+        .set_start_executor(extraction)
+        .add_fan_out_edges(extraction, [pricing, visualization])
+        .add_fan_in_edges([pricing, visualization], report)
+        .build()
+    )
+    workflow.client_pool = pool
+    print("✅ Workflow built!\n")
+    return workflow
+
+
+def serve_workflow(workflow: "Workflow", port: int = 8080, auto_open: bool = True) -> None:
+    """
+    Serve a workflow in DevUI (with tracing) until Ctrl+C.
+
+    Like agent_framework_devui.serve(), but the server's lifespan also closes
+    workflow.client_pool on shutdown, so the pooled client, credential and
+    agent definitions are released on the event loop they were opened on.
+    """
+    import webbrowser
+    from contextlib import asynccontextmanager
+
+    import uvicorn
+    from agent_framework_devui import DevServer
+
+    for name, value in (("ENABLE_OTEL", "true"), ("ENABLE_SENSITIVE_DATA", "true"),
+                        ("OTLP_ENDPOINT", "http://localhost:4317")):
+        os.environ[name] = os.environ.get(name) or value
+
+    server = DevServer(port=port, host="127.0.0.1", ui_enabled=True)
+    server.register_entities([workflow])
+    app = server.get_app()
+    devui_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan(app: Any):
+        try:
+            async with devui_lifespan(app):
+                if auto_open:
+                    webbrowser.open(f"http://localhost:{port}")
+                yield
+        finally:
+            # Delete the pooled agent definitions and close the shared client
+            await workflow.client_pool.aclose()
+
+    app.router.lifespan_context = lifespan
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="info")
+
+
+def __getattr__(name: str) -> Any:
+    # `launch_devui.workflow` (DevUI directory discovery) is built on first access, not at import
+    if name == "workflow":
+        workflow = globals()["workflow"] = create_workflow()
+        return workflow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
     print("🚀 Launching Competitive Intelligence Workflow with DevUI")
     print("=" * 70)
-    print("📊 4-Agent Sequential Workflow")
+    print("📊 4-Agent Fan-Out/Fan-In Workflow")
     print("=" * 70)
     print("\n✅ DevUI will open at http://localhost:8080")
     print("⏹️  Press Ctrl+C to stop\n")
     
-    from agent_framework_devui import serve
-    
-    serve(
-        entities=[workflow],
-        port=8080,
-        auto_open=True,
-        tracing_enabled=True,
-        ui_enabled=True
-    )
+    serve_workflow(create_workflow(), port=8080)
@@ -6,7 +6,6 @@ Based on: https://devblogs.microsoft.com/foundry/azure-ai-mem0-integration/
 """
 
 import os
-import json
 from typing import Dict, Any, Optional
 
 
@@ -75,28 +74,80 @@ def get_mem0_config_azure() -> Dict[str, Any]:
     return config
 
 
-def init_mem0_azure() -> Optional[Any]:
+def get_mem0_config_local() -> Dict[str, Any]:
+    """
+    Get Mem0 configuration with an in-process vector store + Azure OpenAI.
+    
+    Same embedder/LLM as get_mem0_config_azure(), but memories are stored in
+    LocalVectorStore (NumPy/memmap on local disk) instead of Azure AI Search,
+    so development, tests and edge deployments need no search service and
+    searches never leave the process. Registers the "local" provider with Mem0.
+    
+    Configured via environment variables:
+        MEM0_LOCAL_STORE_PATH: Directory for the vector files (default: .mem0_cache/vectors)
+        MEM0_LOCAL_ANN_THRESHOLD: Candidate count above which the IVF index is used (default: 20000)
+    
+    Returns:
+        Dictionary with Mem0 configuration for the local vector store
+    """
+    from mem0_vector_store import PROVIDER, register_with_mem0
+    register_with_mem0()
+    
+    config = get_mem0_config_azure()
+    config["vector_store"] = {
+        "provider": PROVIDER,
+        "config": {
+            "path": os.getenv("MEM0_LOCAL_STORE_PATH", os.path.join(".mem0_cache", "vectors")),
+            "collection_name": "competitive_intelligence_memories",
+            "embedding_model_dims": 1536,
+            "ann_threshold": int(os.getenv("MEM0_LOCAL_ANN_THRESHOLD", "20000")),
+        },
+    }
+    
+    return config
+
+
+def init_mem0_azure(cache_embeddings: Optional[bool] = None, cache_searches: Optional[bool] = None) -> Optional[Any]:
     """
     Initialize Mem0 with Azure AI Search + Azure OpenAI.
     
     This is the recommended approach for Azure-based deployments.
     Uses Azure AI Search for vector storage and Azure OpenAI for embeddings/LLM.
+    The Memory is pooled (see mem0_memory_pool), so repeated calls are cheap and
+    return the same instance. Its config, API keys included, is kept on the pool
+    entry (memory_pool.config_of(memory)) rather than in the environment.
+    
+    Args:
+        cache_embeddings: Put the persistent, batching embedding cache in front of
+            Azure OpenAI, written under .mem0_cache (default: MEM0_EMBEDDING_CACHE env var,
+            enabled only when "1")
+        cache_searches: Serve repeated memory.search calls from a retrieval cache that
+            writes through this Memory invalidate (default: MEM0_RETRIEVAL_CACHE env var,
+            enabled only when "1")
     
     Returns:
         Mem0 Memory instance or None if initialization fails
     """
     try:
-        from mem0 import Memory
+        from mem0_memory_pool import memory_pool
         
         config = get_mem0_config_azure()
+        if cache_embeddings is None:
+            cache_embeddings = os.getenv("MEM0_EMBEDDING_CACHE", "0") == "1"
+        if cache_searches is None:
+            cache_searches = os.getenv("MEM0_RETRIEVAL_CACHE", "0") == "1"
         
-        # Save config to environment for agent-framework-mem0
-        os.environ["MEM0_CONFIG"] = json.dumps(config)
+        def on_build(memory: Any) -> None:
+            # The config (with API keys) stays on the pool entry: memory_pool.config_of(memory)
+            print("✅ Mem0 initialized with Azure AI Search + Azure OpenAI")
+            if cache_embeddings:
+                print(f"✅ Embedding cache enabled ({memory.embedding_model.stats()['cached_vectors']} cached vectors)")
+            if cache_searches:
+                print("✅ Retrieval cache enabled for memory.search")
         
-        # Initialize and return Memory instance
-        memory = Memory.from_config(config)
-        print("✅ Mem0 initialized with Azure AI Search + Azure OpenAI")
-        return memory
+        # Built once per distinct config; later calls return the pooled instance
+        return memory_pool.get(config, cache_embeddings=cache_embeddings, on_build=on_build,
+                               cache_searches=cache_searches)
         
     except Exception as e:
         print(f"⚠️  Mem0 initialization failed: {e}")
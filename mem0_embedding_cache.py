@@ -0,0 +1,350 @@
+"""
+Mem0 Embedding Cache
+
+Persistent, batching embedding layer that sits in front of Mem0's embedder.
+Repeated text is served from an on-disk cache of memory-mapped float32 vectors,
+and concurrent cache misses are coalesced into batched embedding requests.
+"""
+
+import hashlib
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+EmbedBatchFn = Callable[[List[str]], Sequence[Sequence[float]]]
+
+
+def content_key(text: str, model: str = "") -> str:
+    """Stable cache key for a piece of text embedded by a given model."""
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    """
+    Append-only embedding cache on disk.
+
+    Vectors live in one float32 file opened as a NumPy memmap (preallocated
+    and grown by doubling), and an index file holds one content key per
+    line, where line n is the key of vector row n. A vector is flushed before
+    its key is appended, so the complete index lines are the rows written: a
+    crash can lose the last entries or leave a partial last line (cut off on
+    the next open) but never index a half-written vector.
+    """
+
+    def __init__(self, directory: str, dims: int, initial_capacity: int = 1024):
+        self.directory = directory
+        self.dims = dims
+        os.makedirs(directory, exist_ok=True)
+        self.vectors_path = os.path.join(directory, f"vectors_{dims}.f32")
+        self.index_path = os.path.join(directory, f"index_{dims}.txt")
+        self._lock = threading.Lock()
+
+        row_bytes = dims * 4
+        on_disk = os.path.getsize(self.vectors_path) // row_bytes if os.path.exists(self.vectors_path) else 0
+        self._rows: Dict[str, int] = {}
+        self._count = 0
+        if os.path.exists(self.index_path):
+            written = 0
+            with open(self.index_path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n") or self._count == on_disk:
+                        break
+                    self._rows[line[:-1].decode("ascii")] = self._count
+                    self._count += 1
+                    written += len(line)
+            if written < os.path.getsize(self.index_path):
+                # Torn last line (or keys without vectors): cut the index back to its complete rows
+                with open(self.index_path, "r+b") as f:
+                    f.truncate(written)
+        self._capacity = max(initial_capacity, on_disk)
+        self._open(self._capacity)
+        self._index_file = open(self.index_path, "a", encoding="ascii")
+
+    def _open(self, capacity: int) -> None:
+        with open(self.vectors_path, "ab") as f:
+            f.truncate(max(os.path.getsize(self.vectors_path), capacity * self.dims * 4))
+        self._vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dims))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    def get_many(self, keys: Sequence[str]) -> Tuple[np.ndarray, List[int]]:
+        """
+        Look up several keys at once.
+
+        Returns:
+            Tuple of (vectors for the keys found, indexes into keys that were missing)
+        """
+        rows, missing = [], []
+        with self._lock:
+            for i, key in enumerate(keys):
+                row = self._rows.get(key)
+                if row is None:
+                    missing.append(i)
+                else:
+                    rows.append(row)
+            return np.array(self._vectors[rows]), missing
+
+    def put_many(self, keys: Sequence[str], vectors: np.ndarray) -> None:
+        """Append new vectors (keys already present, or repeated in keys, are stored once)."""
+        with self._lock:
+            new = list({k: v for k, v in zip(keys, vectors) if k not in self._rows}.items())
+            if not new:
+                return
+            needed = self._count + len(new)
+            if needed > self._capacity:
+                self._vectors.flush()
+                while self._capacity < needed:
+                    self._capacity *= 2
+                self._open(self._capacity)
+            start = self._count
+            self._vectors[start:needed] = np.asarray([v for _, v in new], dtype=np.float32)
+            self._vectors.flush()
+            self._index_file.writelines(f"{k}\n" for k, _ in new)
+            self._index_file.flush()
+            for offset, (key, _) in enumerate(new):
+                self._rows[key] = start + offset
+            self._count = needed
+
+    def close(self) -> None:
+        """Flush and release the memmap and index file."""
+        with self._lock:
+            self._vectors.flush()
+            self._index_file.close()
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces concurrent embedding requests into batched upstream calls.
+
+    Callers enqueue texts and block on a Future. A background thread takes the
+    first pending text, keeps collecting until max_batch texts or max_wait_ms
+    have passed, then sends one request for the whole batch. Identical texts
+    already in flight share a single Future.
+    """
+
+    def __init__(self, embed_batch: EmbedBatchFn, max_batch: int = 64, max_wait_ms: float = 10.0):
+        self.embed_batch = embed_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue: "queue.Queue[Tuple[str, str]]" = queue.Queue()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._thread.start()
+        self.batches = 0
+        self.batched_texts = 0
+
+    def submit(self, key: str, text: str) -> Future:
+        """Future resolving to the vector for text."""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._inflight[key] = Future()
+                self._queue.put((key, text))
+        return future
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._flush(batch)
+
+    def _flush(self, batch: List[Tuple[str, str]]) -> None:
+        keys = [key for key, _ in batch]
+        try:
+            vectors = np.asarray(self.embed_batch([text for _, text in batch]), dtype=np.float32)
+            if len(vectors) != len(batch):
+                raise ValueError(f"Embedder returned {len(vectors)} vectors for {len(batch)} texts")
+            error = None
+        except Exception as e:
+            vectors, error = None, e
+        self.batches += 1
+        self.batched_texts += len(batch)
+        with self._lock:
+            futures = [self._inflight.pop(key) for key in keys]
+        for i, future in enumerate(futures):
+            if error is None:
+                future.set_result(vectors[i])
+            else:
+                future.set_exception(error)
+
+
+class CachedEmbedder:
+    """
+    Drop-in replacement for a Mem0 embedder that caches and batches embeddings.
+
+    Wraps any object with Mem0's embed(text, memory_action) interface. Lookups
+    hit the persistent EmbeddingStore first; misses go through an
+    EmbeddingBatcher and are written back to the store. Attributes not defined
+    here (such as config) are forwarded to the wrapped embedder.
+    """
+
+    def __init__(
+        self,
+        embedder: Any,
+        store: EmbeddingStore,
+        model: str = "",
+        embed_batch: Optional[EmbedBatchFn] = None,
+        max_batch: int = 64,
+        max_wait_ms: float = 10.0
+    ):
+        self.embedder = embedder
+        self.store = store
+        self.model = model
+        self.batcher = EmbeddingBatcher(embed_batch or batch_embed_fn(embedder), max_batch, max_wait_ms)
+        self._stats_lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0}
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.embedder, name)
+
+    def embed(self, text: str, memory_action: Optional[str] = None) -> List[float]:
+        """Embed one text (Mem0 embedder interface)."""
+        return self.embed_many([text])[0]
+
+    def embed_many(self, texts: Sequence[str]) -> List[List[float]]:
+        """Embed several texts, serving repeats from the cache."""
+        keys = [content_key(text, self.model) for text in texts]
+        found, missing = self.store.get_many(keys)
+        with self._stats_lock:
+            self._stats["hits"] += len(texts) - len(missing)
+            self._stats["misses"] += len(missing)
+
+        vectors: List[Optional[np.ndarray]] = [None] * len(texts)
+        hit_rows = iter(found)
+        missing_set = set(missing)
+        for i in range(len(texts)):
+            if i not in missing_set:
+                vectors[i] = next(hit_rows)
+        if missing:
+            futures = [self.batcher.submit(keys[i], texts[i]) for i in missing]
+            fetched = [future.result() for future in futures]
+            self.store.put_many([keys[i] for i in missing], np.asarray(fetched))
+            for i, vector in zip(missing, fetched):
+                vectors[i] = vector
+        return [vector.tolist() for vector in vectors]
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters, batching efficiency and cache size."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["batches"] = self.batcher.batches
+        stats["avg_batch_size"] = (
+            round(self.batcher.batched_texts / self.batcher.batches, 2) if self.batcher.batches else 0.0
+        )
+        stats["cached_vectors"] = len(self.store)
+        return stats
+
+    def close(self) -> None:
+        """Flush the on-disk cache."""
+        self.store.close()
+
+
+def batch_embed_fn(embedder: Any) -> EmbedBatchFn:
+    """
+    Best available batch call for a Mem0 embedder.
+
+    Embedders that expose embed_batch are used directly; OpenAI/Azure OpenAI
+    embedders send the whole list in one embeddings.create request; anything
+    else falls back to one embed() call per text.
+    """
+    if hasattr(embedder, "embed_batch"):
+        return embedder.embed_batch
+    client = getattr(embedder, "client", None)
+    config = getattr(embedder, "config", None)
+    if client is not None and hasattr(client, "embeddings") and config is not None:
+        def embed_batch(texts: List[str]) -> List[List[float]]:
+            kwargs = {"input": [t.replace("\n", " ") for t in texts], "model": config.model}
+            if getattr(config, "embedding_dims", None):
+                kwargs["dimensions"] = config.embedding_dims
+            response = client.embeddings.create(**kwargs)
+            return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+        return embed_batch
+    return lambda texts: [embedder.embed(text) for text in texts]
+
+
+class FakeEmbedder:
+    """
+    Deterministic offline embedder for tests and benchmarks.
+
+    Each token maps to a fixed pseudo-random unit vector (seeded by its hash)
+    and a text embeds to the normalized sum of its tokens, so identical text
+    always gets the identical vector and texts sharing words are close. An
+    optional per-request and per-text delay imitates a remote endpoint.
+    """
+
+    def __init__(self, dims: int = 1536, request_latency_ms: float = 0.0, per_text_latency_ms: float = 0.0):
+        self.dims = dims
+        self.request_latency = request_latency_ms / 1000
+        self.per_text_latency = per_text_latency_ms / 1000
+        self.requests = 0
+        self._tokens: Dict[str, np.ndarray] = {}
+
+    def _token_vector(self, token: str) -> np.ndarray:
+        vector = self._tokens.get(token)
+        if vector is None:
+            seed = int.from_bytes(hashlib.sha256(token.encode("utf-8")).digest()[:8], "little")
+            vector = np.random.default_rng(seed).standard_normal(self.dims).astype(np.float32)
+            self._tokens[token] = vector
+        return vector
+
+    def _vector(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dims, dtype=np.float32)
+        for token in text.lower().split() or [""]:
+            vector += self._token_vector(token)
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+    def embed(self, text: str, memory_action: Optional[str] = None) -> List[float]:
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        self.requests += 1
+        delay = self.request_latency + self.per_text_latency * len(texts)
+        if delay:
+            time.sleep(delay)
+        return [self._vector(text).tolist() for text in texts]
+
+
+def wrap_mem0_embedder(memory: Any, cache_dir: Optional[str] = None, **batch_options: Any) -> CachedEmbedder:
+    """
+    Put a CachedEmbedder in front of an initialized Mem0 Memory's embedder.
+
+    Args:
+        memory: Mem0 Memory (or AsyncMemory) instance
+        cache_dir: Cache directory (default: MEM0_EMBEDDING_CACHE_DIR or .mem0_cache/embeddings)
+        **batch_options: max_batch / max_wait_ms for the batcher
+
+    Returns:
+        The installed CachedEmbedder (use .stats() for hit rates)
+    """
+    inner = memory.embedding_model
+    config = getattr(inner, "config", None)
+    dims = getattr(config, "embedding_dims", None) or 1536
+    model = getattr(config, "model", None) or type(inner).__name__
+    store = EmbeddingStore(
+        os.path.join(cache_dir or os.getenv("MEM0_EMBEDDING_CACHE_DIR", ".mem0_cache/embeddings"),
+                     hashlib.sha1(model.encode("utf-8")).hexdigest()[:8]),
+        dims,
+    )
+    cached = CachedEmbedder(inner, store, model=model, **batch_options)
+    memory.embedding_model = cached
+    return cached
@@ -0,0 +1,214 @@
+"""
+Mem0 Memory Pool
+Process-wide, reusable Mem0 Memory instances keyed by configuration fingerprint
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+
+def config_fingerprint(config: Dict[str, Any], **options: Any) -> str:
+    """Stable hash of a Mem0 config (plus build options) used as the pool key."""
+    payload = json.dumps({"config": config, "options": options}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class MemoryPool:
+    """
+    Builds each distinct Mem0 configuration once and hands out the shared instance.
+
+    Construction (client setup, config validation, vector store connection) is
+    paid once per config fingerprint, guarded by a per-fingerprint lock so two
+    agents asking for the same config at once build it only once while other
+    configs build in parallel. All OpenAI/Azure OpenAI clients created by the
+    pool are re-pointed at one shared httpx connection pool. The config a
+    Memory was built from stays with its pool entry (see config_of()).
+    """
+
+    def __init__(
+        self,
+        build: Optional[Callable[[Dict[str, Any]], Any]] = None,
+        max_connections: int = 100,
+        max_keepalive: int = 20
+    ):
+        self.build = build or _memory_from_config
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self._memories: Dict[str, Any] = {}
+        self._configs: Dict[str, Dict[str, Any]] = {}
+        self._build_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._http_client: Optional[httpx.Client] = None
+        self._stats = {"builds": 0, "reuses": 0, "build_seconds": 0.0}
+
+    @property
+    def http_client(self) -> httpx.Client:
+        """Shared connection pool for every pooled Memory's model clients."""
+        with self._lock:
+            if self._http_client is None:
+                self._http_client = httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_keepalive,
+                    ),
+                    timeout=httpx.Timeout(float(os.getenv("MEM0_HTTP_TIMEOUT_SECONDS", "60"))),
+                )
+            return self._http_client
+
+    def get(
+        self,
+        config: Dict[str, Any],
+        cache_embeddings: bool = False,
+        on_build: Optional[Callable[[Any], None]] = None,
+        cache_searches: bool = False
+    ) -> Any:
+        """
+        Get the pooled Memory for config, building it on first use.
+
+        Args:
+            config: Mem0 configuration dictionary
+            cache_embeddings: Wrap the embedder with the persistent embedding cache
+            on_build: Called once with the new Memory right after it is built
+            cache_searches: Wrap the Memory with a retrieval cache (see mem0_retrieval_cache),
+                shared by every caller of this config
+
+        Returns:
+            Shared Mem0 Memory instance
+        """
+        key = config_fingerprint(config, cache_embeddings=cache_embeddings, cache_searches=cache_searches)
+        memory = self._memories.get(key)
+        if memory is not None:
+            self._stats["reuses"] += 1
+            return memory
+
+        with self._lock:
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+        with build_lock:
+            memory = self._memories.get(key)
+            if memory is not None:
+                self._stats["reuses"] += 1
+                return memory
+
+            started = time.perf_counter()
+            # Mem0 fills defaults into the dict it is given; keep the caller's config intact
+            memory = self.build(copy.deepcopy(config))
+            self._share_http_client(memory)
+            if cache_embeddings:
+                from mem0_embedding_cache import wrap_mem0_embedder
+                wrap_mem0_embedder(memory)
+            if cache_searches:
+                from mem0_retrieval_cache import cached_memory
+                memory = cached_memory(memory)
+            if on_build is not None:
+                on_build(memory)
+            self._stats["builds"] += 1
+            self._stats["build_seconds"] += time.perf_counter() - started
+            self._configs[key] = copy.deepcopy(config)
+            self._memories[key] = memory
+            return memory
+
+    async def aget(self, config: Dict[str, Any], cache_embeddings: bool = False,
+                   on_build: Optional[Callable[[Any], None]] = None, cache_searches: bool = False) -> Any:
+        """Async get(): builds run in a worker thread so the event loop never blocks."""
+        key = config_fingerprint(config, cache_embeddings=cache_embeddings, cache_searches=cache_searches)
+        memory = self._memories.get(key)
+        if memory is not None:
+            self._stats["reuses"] += 1
+            return memory
+        return await asyncio.to_thread(self.get, config, cache_embeddings, on_build, cache_searches)
+
+    def config_of(self, memory: Any) -> Optional[Dict[str, Any]]:
+        """
+        Config a pooled Memory was built from, or None if it is not in the pool.
+
+        Returns a copy that includes API keys; keep it in process memory.
+        """
+        for key, pooled in list(self._memories.items()):
+            if pooled is memory:
+                return copy.deepcopy(self._configs[key])
+        return None
+
+    def _share_http_client(self, memory: Any) -> None:
+        """Point the embedder's and LLM's OpenAI clients at the shared connection pool."""
+        for component in (getattr(memory, "embedding_model", None), getattr(memory, "llm", None)):
+            client = getattr(component, "client", None)
+            if client is not None and hasattr(client, "copy"):
+                try:
+                    component.client = client.copy(http_client=self.http_client)
+                except TypeError:
+                    pass
+
+    def warm_up(self, configs: List[Dict[str, Any]], cache_embeddings: bool = False, probe: bool = True,
+                cache_searches: bool = False) -> None:
+        """
+        Build memories ahead of the first request.
+
+        Args:
+            configs: Mem0 configurations to pre-build
+            cache_embeddings: Same flag later get() calls will use
+            cache_searches: Same flag later get() calls will use
+            probe: Also send one embedding request per memory so connections
+                (DNS, TLS) are established before traffic arrives
+        """
+        for config in configs:
+            memory = self.get(config, cache_embeddings, cache_searches=cache_searches)
+            if probe:
+                embedder = memory.embedding_model
+                embedder = getattr(embedder, "embedder", embedder)
+                try:
+                    embedder.embed("warm-up")
+                except Exception as e:
+                    print(f"⚠️  Mem0 warm-up probe failed: {e}")
+
+    async def awarm_up(self, configs: List[Dict[str, Any]], cache_embeddings: bool = False,
+                       probe: bool = True, cache_searches: bool = False) -> None:
+        """Async warm_up(), e.g. from a server lifespan hook."""
+        await asyncio.to_thread(self.warm_up, configs, cache_embeddings, probe, cache_searches)
+
+    def close(self) -> None:
+        """Flush caches and stores, release connections and empty the pool."""
+        with self._lock:
+            memories = list(self._memories.values())
+            self._memories.clear()
+            self._configs.clear()
+            self._build_locks.clear()
+            http_client, self._http_client = self._http_client, None
+        for memory in memories:
+            for component in (getattr(memory, "embedding_model", None), getattr(memory, "vector_store", None)):
+                close = getattr(type(component), "close", None)
+                if close is not None:
+                    close(component)
+        if http_client is not None:
+            http_client.close()
+
+    async def aclose(self) -> None:
+        """Async close(), e.g. from a server lifespan hook."""
+        await asyncio.to_thread(self.close)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size and build/reuse counters."""
+        return {
+            "memories": len(self._memories),
+            "builds": self._stats["builds"],
+            "reuses": self._stats["reuses"],
+            "build_seconds": round(self._stats["build_seconds"], 3),
+        }
+
+
+def _memory_from_config(config: Dict[str, Any]) -> Any:
+    from mem0 import Memory
+    return Memory.from_config(config)
+
+
+memory_pool = MemoryPool(
+    max_connections=int(os.getenv("MEM0_MAX_CONNECTIONS", "100")),
+    max_keepalive=int(os.getenv("MEM0_MAX_KEEPALIVE", "20")),
+)
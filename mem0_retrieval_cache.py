@@ -0,0 +1,388 @@
+"""
+Mem0 Retrieval Cache
+TTL/LRU cache for memory.search results, invalidated per (user_id, agent_id, run_id) scope on writes
+
+Enable it for the pooled tutorial Memory with init_mem0_azure(cache_searches=True)
+(or MEM0_RETRIEVAL_CACHE=1), or wrap any Memory / AsyncMemory directly:
+
+    memory = cached_memory(Memory.from_config(config))
+    memory.search("travel preferences", filters={"user_id": "alice"})  # vector search
+    memory.search("Travel preferences?", filters={"user_id": "alice"})  # cache hit
+    memory.add("Prefers aisle seats", user_id="alice")                  # invalidates alice's searches
+"""
+
+import asyncio
+import copy
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+STAT_NAMES = ("hits", "semantic_hits", "misses", "invalidations", "evictions", "expirations", "stale_skips")
+SCOPE_KEYS = ("user_id", "agent_id", "run_id")
+
+# (user_id, agent_id, run_id); None matches memories of any id
+Scope = Tuple[Optional[str], Optional[str], Optional[str]]
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Case-, punctuation- and whitespace-insensitive form of a search query."""
+    return _WHITESPACE.sub(" ", _PUNCTUATION.sub(" ", query.lower())).strip()
+
+
+def _scope(kwargs: Dict[str, Any]) -> Scope:
+    """(user_id, agent_id, run_id) from search/write kwargs or their filters dict."""
+    filters = kwargs.get("filters") or {}
+    values = (kwargs.get(key) or filters.get(key) for key in SCOPE_KEYS)
+    # Operator conditions ({"in": [...]}) can match several ids: treat them as unscoped
+    return tuple(value if isinstance(value, (str, int)) else None for value in values)
+
+
+def scopes_overlap(a: Scope, b: Scope) -> bool:
+    """Whether one memory can belong to both scopes (None matches any id)."""
+    return all(x is None or y is None or x == y for x, y in zip(a, b))
+
+
+class RetrievalCache:
+    """
+    Bounded LRU cache of memory.search results with a TTL.
+
+    Keys are (user_id, agent_id, run_id, normalized query, other search options).
+    A write to a scope drops every cached search whose scope overlaps it, so
+    a write for (alice, -, -) also drops (-, planner, -) searches, and a write
+    without ids drops everything. A search that started before an overlapping
+    write does not store its (possibly stale) result. With semantic_threshold
+    set, a query that misses on text can still hit an entry of the same scope
+    whose query embedding has cosine similarity >= the threshold.
+    """
+
+    def __init__(self, max_entries: int = 2048, ttl: float = 300.0, semantic_threshold: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.semantic_threshold = semantic_threshold
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any, Optional[np.ndarray]]]" = OrderedDict()
+        self._scope_keys: Dict[Scope, set] = {}
+        # Writes since the oldest in-flight search began, as (sequence number, scope)
+        self._write_seq = 0
+        self._writes: List[Tuple[int, Scope]] = []
+        self._searches: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._stats = dict.fromkeys(STAT_NAMES, 0)
+        self._miss_seconds = 0.0
+        self._hit_seconds = 0.0
+
+    def lookup(self, key: Tuple) -> Tuple[bool, Any]:
+        """Return (found, results) for an exact key."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                self._drop(key)
+                self._stats["expirations"] += 1
+                entry = None
+            if entry is None:
+                return False, None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return True, entry[1]
+
+    def lookup_similar(self, key: Tuple, embedding: np.ndarray) -> Tuple[bool, Any]:
+        """Return (found, results) for a semantically close query of the same scope and options."""
+        with self._lock:
+            match = self._nearest(key, embedding)
+            if match is None:
+                return False, None
+            self._entries.move_to_end(match)
+            self._stats["semantic_hits"] += 1
+            return True, self._entries[match][1]
+
+    def record(self, hit: bool, seconds: float) -> None:
+        """Count a lookup outcome and its end-to-end latency."""
+        with self._lock:
+            if hit:
+                self._hit_seconds += seconds
+            else:
+                self._stats["misses"] += 1
+                self._miss_seconds += seconds
+
+    def _nearest(self, key: Tuple, embedding: np.ndarray) -> Optional[Tuple]:
+        """Best cached key of the same scope and options above semantic_threshold; caller holds the lock."""
+        now = time.monotonic()
+        candidates = [
+            other for other in self._scope_keys.get(key[:3], ())
+            if other[4:] == key[4:] and self._entries[other][2] is not None and self._entries[other][0] > now
+        ]
+        if not candidates:
+            return None
+        matrix = np.stack([self._entries[other][2] for other in candidates])
+        scores = matrix @ embedding
+        best = int(np.argmax(scores))
+        return candidates[best] if scores[best] >= self.semantic_threshold else None
+
+    def begin(self) -> int:
+        """Register a search about to hit the store; pass the token to store() or abandon()."""
+        with self._lock:
+            self._searches[self._write_seq] = self._searches.get(self._write_seq, 0) + 1
+            return self._write_seq
+
+    def abandon(self, token: int) -> None:
+        """End a search started with begin() without caching anything (e.g., it raised)."""
+        with self._lock:
+            self._end(token)
+
+    def store(self, key: Tuple, results: Any, token: int, embedding: Optional[np.ndarray] = None) -> None:
+        """Cache results unless an overlapping scope was written to since the search began."""
+        with self._lock:
+            stale = any(seq > token and scopes_overlap(key[:3], scope) for seq, scope in self._writes)
+            self._end(token)
+            if stale:
+                self._stats["stale_skips"] += 1
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, results, embedding)
+            self._entries.move_to_end(key)
+            self._scope_keys.setdefault(key[:3], set()).add(key)
+            while len(self._entries) > self.max_entries:
+                evicted = next(iter(self._entries))
+                self._drop(evicted)
+                self._stats["evictions"] += 1
+
+    def _end(self, token: int) -> None:
+        """Forget an in-flight search and writes no in-flight search can conflict with; caller holds the lock."""
+        remaining = self._searches.pop(token) - 1
+        if remaining:
+            self._searches[token] = remaining
+        oldest = min(self._searches, default=self._write_seq)
+        self._writes = [(seq, scope) for seq, scope in self._writes if seq > oldest]
+
+    def _drop(self, key: Tuple) -> None:
+        del self._entries[key]
+        keys = self._scope_keys.get(key[:3])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._scope_keys[key[:3]]
+
+    def invalidate(self, scope: Scope) -> None:
+        """Drop every cached search overlapping a written scope and reject overlapping in-flight ones."""
+        with self._lock:
+            self._write_seq += 1
+            if self._searches:
+                self._writes.append((self._write_seq, scope))
+            for cached in [cached for cached in self._scope_keys if scopes_overlap(cached, scope)]:
+                for key in list(self._scope_keys[cached]):
+                    self._drop(key)
+            self._stats["invalidations"] += 1
+
+    def invalidate_all(self) -> None:
+        self.invalidate((None, None, None))
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters, hit rate and estimated vector-search time saved by hits."""
+        with self._lock:
+            stats = dict(self._stats)
+            hits = stats["hits"] + stats["semantic_hits"]
+            lookups = hits + stats["misses"]
+            avg_miss = self._miss_seconds / stats["misses"] if stats["misses"] else 0.0
+            avg_hit = self._hit_seconds / hits if hits else 0.0
+            stats.update({
+                "entries": len(self._entries),
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "avg_miss_ms": round(avg_miss * 1000, 3),
+                "avg_hit_ms": round(avg_hit * 1000, 4),
+                "saved_ms": round(hits * max(avg_miss - avg_hit, 0.0) * 1000, 1),
+            })
+            return stats
+
+
+def _search_key(query: str, kwargs: Dict[str, Any]) -> Tuple:
+    options = json.dumps(
+        {k: v for k, v in kwargs.items() if k not in SCOPE_KEYS},
+        sort_keys=True, default=str,
+    )
+    return _scope(kwargs) + (normalize_query(query), options)
+
+
+def _owner_scope(existing: Optional[Dict[str, Any]]) -> Scope:
+    # Unknown owner: (None, None, None) overlaps every scope, the only safe choice
+    return tuple((existing or {}).get(key) for key in SCOPE_KEYS)
+
+
+def _unit(vector: Any) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float32)
+    return vector / (np.linalg.norm(vector) or 1.0)
+
+
+class CachedMemory:
+    """
+    Mem0 Memory wrapper that serves repeated searches from a RetrievalCache.
+
+    search() is cached per scope and normalized query. add(), update(),
+    delete() and delete_all() go straight through and invalidate the scopes
+    they touch, so results are never served stale after a write. Everything
+    else is forwarded to the wrapped Memory. Wrap this (not the raw Memory)
+    with MemoryWriteBehind so batched writes invalidate too.
+    """
+
+    def __init__(self, memory: Any, cache: Optional[RetrievalCache] = None):
+        self.memory = memory
+        self.cache = cache or RetrievalCache()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.memory, name)
+
+    def _embed(self, query: str) -> np.ndarray:
+        return _unit(self.memory.embedding_model.embed(query, "search"))
+
+    def search(self, query: str, **kwargs: Any) -> Any:
+        """memory.search(), cached (same arguments and return value)."""
+        started = time.perf_counter()
+        key = _search_key(query, kwargs)
+        found, results = self.cache.lookup(key)
+        embedding = None
+        if not found and self.cache.semantic_threshold is not None:
+            embedding = self._embed(key[3])
+            found, results = self.cache.lookup_similar(key, embedding)
+        if found:
+            self.cache.record(True, time.perf_counter() - started)
+            return copy.deepcopy(results)
+
+        token = self.cache.begin()
+        try:
+            results = self.memory.search(query, **kwargs)
+        except BaseException:
+            self.cache.abandon(token)
+            raise
+        self.cache.store(key, copy.deepcopy(results), token, embedding)
+        self.cache.record(False, time.perf_counter() - started)
+        return results
+
+    def add(self, messages: Any, **kwargs: Any) -> Any:
+        try:
+            return self.memory.add(messages, **kwargs)
+        finally:
+            self.cache.invalidate(_scope(kwargs))
+
+    def update(self, memory_id: str, *args: Any, **kwargs: Any) -> Any:
+        scope = self._owner(memory_id)
+        try:
+            return self.memory.update(memory_id, *args, **kwargs)
+        finally:
+            self.cache.invalidate(scope)
+
+    def delete(self, memory_id: str) -> Any:
+        scope = self._owner(memory_id)
+        try:
+            return self.memory.delete(memory_id)
+        finally:
+            self.cache.invalidate(scope)
+
+    def delete_all(self, user_id: Optional[str] = None, **kwargs: Any) -> Any:
+        try:
+            return self.memory.delete_all(user_id=user_id, **kwargs)
+        finally:
+            self.cache.invalidate(_scope({"user_id": user_id, **kwargs}))
+
+    def reset(self) -> Any:
+        try:
+            return self.memory.reset()
+        finally:
+            self.cache.invalidate_all()
+
+    def _owner(self, memory_id: str) -> Scope:
+        try:
+            return _owner_scope(self.memory.get(memory_id))
+        except Exception:
+            return _owner_scope(None)
+
+
+class AsyncCachedMemory(CachedMemory):
+    """CachedMemory for Mem0's AsyncMemory: the same cache and invalidation, with awaitable methods."""
+
+    async def search(self, query: str, **kwargs: Any) -> Any:
+        """await memory.search(), cached (same arguments and return value)."""
+        started = time.perf_counter()
+        key = _search_key(query, kwargs)
+        found, results = self.cache.lookup(key)
+        embedding = None
+        if not found and self.cache.semantic_threshold is not None:
+            # Mem0's embedders are synchronous even under AsyncMemory
+            embedding = await asyncio.to_thread(self._embed, key[3])
+            found, results = self.cache.lookup_similar(key, embedding)
+        if found:
+            self.cache.record(True, time.perf_counter() - started)
+            return copy.deepcopy(results)
+
+        token = self.cache.begin()
+        try:
+            results = await self.memory.search(query, **kwargs)
+        except BaseException:
+            self.cache.abandon(token)
+            raise
+        self.cache.store(key, copy.deepcopy(results), token, embedding)
+        self.cache.record(False, time.perf_counter() - started)
+        return results
+
+    async def add(self, messages: Any, **kwargs: Any) -> Any:
+        try:
+            return await self.memory.add(messages, **kwargs)
+        finally:
+            self.cache.invalidate(_scope(kwargs))
+
+    async def update(self, memory_id: str, *args: Any, **kwargs: Any) -> Any:
+        scope = await self._owner(memory_id)
+        try:
+            return await self.memory.update(memory_id, *args, **kwargs)
+        finally:
+            self.cache.invalidate(scope)
+
+    async def delete(self, memory_id: str) -> Any:
+        scope = await self._owner(memory_id)
+        try:
+            return await self.memory.delete(memory_id)
+        finally:
+            self.cache.invalidate(scope)
+
+    async def delete_all(self, user_id: Optional[str] = None, **kwargs: Any) -> Any:
+        try:
+            return await self.memory.delete_all(user_id=user_id, **kwargs)
+        finally:
+            self.cache.invalidate(_scope({"user_id": user_id, **kwargs}))
+
+    async def reset(self) -> Any:
+        try:
+            return await self.memory.reset()
+        finally:
+            self.cache.invalidate_all()
+
+    async def _owner(self, memory_id: str) -> Scope:
+        try:
+            return _owner_scope(await self.memory.get(memory_id))
+        except Exception:
+            return _owner_scope(None)
+
+
+def cached_memory(memory: Any, cache: Optional[RetrievalCache] = None) -> CachedMemory:
+    """
+    Wrap a Mem0 Memory or AsyncMemory with the matching cached wrapper.
+
+    Args:
+        memory: Mem0 Memory or AsyncMemory instance
+        cache: Cache to use (default: a new RetrievalCache sized by MEM0_RETRIEVAL_CACHE_SIZE,
+            default 2048 entries, with MEM0_RETRIEVAL_CACHE_TTL seconds, default 300)
+
+    Returns:
+        CachedMemory, or AsyncCachedMemory when memory.search is a coroutine function
+    """
+    cache = cache or RetrievalCache(
+        max_entries=int(os.getenv("MEM0_RETRIEVAL_CACHE_SIZE", "2048")),
+        ttl=float(os.getenv("MEM0_RETRIEVAL_CACHE_TTL", "300")),
+    )
+    wrapper = AsyncCachedMemory if asyncio.iscoroutinefunction(getattr(memory, "search", None)) else CachedMemory
+    return wrapper(memory, cache)
@@ -0,0 +1,428 @@
+"""
+Mem0 Local Vector Store
+
+In-process vector store for Mem0 backed by NumPy: embeddings live in one
+contiguous memory-mapped float32 matrix on disk, searched exactly with a single
+matrix product for small collections and through an IVF (inverted file) index
+of k-means clusters once a collection grows past a threshold.
+"""
+
+import json
+import os
+import shutil
+import sys
+import threading
+from typing import Any, Dict, List, Optional, Set
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+try:
+    from mem0.vector_stores.base import VectorStoreBase
+except ImportError:
+    VectorStoreBase = object
+
+PROVIDER = "local"
+
+# Payload keys with an inverted index; every Mem0 search filters on at least one
+INDEXED_KEYS = ("user_id", "agent_id", "run_id")
+
+
+class LocalVectorStoreConfig(BaseModel):
+    """Configuration for LocalVectorStore (Mem0 vector_store.config)."""
+    collection_name: str = Field("mem0", description="Collection (sub-directory) name")
+    path: Optional[str] = Field(None, description="Directory holding all collections")
+    embedding_model_dims: int = Field(1536, description="Dimension of the embedding vectors")
+    ann_threshold: int = Field(20_000, description="Candidate count above which the IVF index is used")
+    nprobe: int = Field(8, description="IVF clusters scanned per query")
+
+
+class OutputData(BaseModel):
+    id: Optional[str]
+    score: Optional[float]
+    payload: Optional[Dict]
+
+
+def _matches(payload: Dict, filters: Dict) -> bool:
+    """Evaluate Mem0-style filters: equality, lists (any of), and gt/gte/lt/lte/ne/in operators."""
+    for key, condition in filters.items():
+        if key not in payload:
+            return False
+        value = payload[key]
+        if isinstance(condition, list):
+            if value not in condition:
+                return False
+        elif isinstance(condition, dict):
+            for op, operand in condition.items():
+                if op == "eq" and value != operand:
+                    return False
+                if op == "ne" and value == operand:
+                    return False
+                if op == "in" and value not in operand:
+                    return False
+                if op == "gt" and not value > operand:
+                    return False
+                if op == "gte" and not value >= operand:
+                    return False
+                if op == "lt" and not value < operand:
+                    return False
+                if op == "lte" and not value <= operand:
+                    return False
+        elif value != condition:
+            return False
+    return True
+
+
+class LocalVectorStore(VectorStoreBase):
+    """
+    Mem0 vector store over a memory-mapped NumPy matrix.
+
+    Vectors are L2-normalized on insert so the score is cosine similarity. Each
+    vector owns a row of vectors.f32; ids, payloads and deletions are kept in an
+    append-only records.jsonl log that is replayed on open. user_id / agent_id /
+    run_id have inverted indexes, so a per-user search only touches that user's
+    rows. When the candidate set is larger than ann_threshold, the query is
+    answered from the nprobe closest IVF clusters instead of a full scan.
+    """
+
+    def __init__(
+        self,
+        collection_name: str = "mem0",
+        path: Optional[str] = None,
+        embedding_model_dims: int = 1536,
+        ann_threshold: int = 20_000,
+        nprobe: int = 8
+    ):
+        self.path = path or os.path.join(".mem0_cache", "vectors")
+        self.dims = embedding_model_dims
+        self.ann_threshold = ann_threshold
+        self.nprobe = nprobe
+        self._lock = threading.RLock()
+        self.create_col(collection_name)
+
+    # -- storage ---------------------------------------------------------
+
+    def create_col(self, name: str, vector_size: Optional[int] = None, distance: Optional[str] = None):
+        """Open (or create) a collection, replaying its record log."""
+        with self._lock:
+            self.collection_name = name
+            self.dims = vector_size or self.dims
+            self.directory = os.path.join(self.path, name)
+            os.makedirs(self.directory, exist_ok=True)
+            self.vectors_path = os.path.join(self.directory, "vectors.f32")
+            self.records_path = os.path.join(self.directory, "records.jsonl")
+            self.centroids_path = os.path.join(self.directory, "centroids.npy")
+
+            self._ids: List[Optional[str]] = []
+            self._payloads: List[Optional[Dict]] = []
+            self._row_of: Dict[str, int] = {}
+            self._index: Dict[str, Dict[Any, Set[int]]] = {key: {} for key in INDEXED_KEYS}
+            if os.path.exists(self.records_path):
+                with open(self.records_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            self._apply(json.loads(line))
+
+            self._capacity = max(1024, len(self._ids))
+            self._open(self._capacity)
+            self._live = np.zeros(self._capacity, dtype=bool)
+            self._live[[row for row in self._row_of.values()]] = True
+            self._records = open(self.records_path, "a", encoding="utf-8")
+
+            self._centroids: Optional[np.ndarray] = None
+            self._assign = np.full(self._capacity, -1, dtype=np.int32)
+            self._trained_size = 0
+            if os.path.exists(self.centroids_path):
+                self._centroids = np.load(self.centroids_path)
+                self._trained_size = len(self._row_of)
+                self._assign_rows(np.arange(len(self._ids)))
+        return self
+
+    def _open(self, capacity: int) -> None:
+        with open(self.vectors_path, "ab") as f:
+            f.truncate(max(os.path.getsize(self.vectors_path), capacity * self.dims * 4))
+        self._vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dims))
+
+    def _grow(self, needed: int) -> None:
+        if needed <= self._capacity:
+            return
+        self._vectors.flush()
+        capacity = self._capacity
+        while capacity < needed:
+            capacity *= 2
+        self._open(capacity)
+        self._live = np.concatenate([self._live, np.zeros(capacity - self._capacity, dtype=bool)])
+        self._assign = np.concatenate([self._assign, np.full(capacity - self._capacity, -1, dtype=np.int32)])
+        self._capacity = capacity
+
+    def _log(self, records: List[Dict]) -> None:
+        self._records.writelines(json.dumps(record, default=str) + "\n" for record in records)
+        self._records.flush()
+
+    def _apply(self, record: Dict) -> None:
+        """Apply one log record to the in-memory id/payload tables."""
+        vector_id = record["id"]
+        if record["op"] == "put":
+            row = record["row"]
+            while len(self._ids) <= row:
+                self._ids.append(None)
+                self._payloads.append(None)
+            old = self._row_of.get(vector_id)
+            if old is not None:
+                self._unindex(old)
+            self._ids[row] = vector_id
+            self._payloads[row] = record["payload"]
+            self._row_of[vector_id] = row
+            self._reindex(row)
+        elif record["op"] == "del":
+            row = self._row_of.pop(vector_id, None)
+            if row is not None:
+                self._unindex(row)
+                self._payloads[row] = None
+
+    def _reindex(self, row: int) -> None:
+        payload = self._payloads[row] or {}
+        for key in INDEXED_KEYS:
+            if key in payload:
+                self._index[key].setdefault(payload[key], set()).add(row)
+
+    def _unindex(self, row: int) -> None:
+        payload = self._payloads[row] or {}
+        for key in INDEXED_KEYS:
+            if key in payload:
+                self._index[key].get(payload[key], set()).discard(row)
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    # -- IVF index ---------------------------------------------------------
+
+    def _train(self, iterations: int = 10, seed: int = 0) -> None:
+        """Spherical k-means over a sample of live rows, then assign every row."""
+        live = np.flatnonzero(self._live[:len(self._ids)])
+        n_lists = max(1, int(4 * np.sqrt(len(live))))
+        rng = np.random.default_rng(seed)
+        sample = self._vectors[np.sort(rng.choice(live, min(len(live), 32 * n_lists), replace=False))]
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            # Per-cluster sums via one sort + reduceat (np.add.at is unbuffered and slow)
+            order = np.argsort(labels, kind="stable")
+            counts = np.bincount(labels, minlength=n_lists)
+            filled = np.flatnonzero(counts)
+            starts = np.concatenate([[0], np.cumsum(counts)[:-1]])[filled]
+            sums = centroids.copy()
+            sums[filled] = np.add.reduceat(sample[order], starts, axis=0)
+            centroids = self._normalize(sums)
+        self._centroids = centroids.astype(np.float32)
+        np.save(self.centroids_path, self._centroids)
+        self._trained_size = len(live)
+        self._assign_rows(live)
+
+    def _assign_rows(self, rows: np.ndarray, chunk: int = 8192) -> None:
+        for start in range(0, len(rows), chunk):
+            part = rows[start:start + chunk]
+            self._assign[part] = np.argmax(self._vectors[part] @ self._centroids.T, axis=1)
+
+    def _maybe_train(self) -> None:
+        live = len(self._row_of)
+        if live >= self.ann_threshold and (self._centroids is None or live > 2 * self._trained_size):
+            self._train()
+
+    # -- Mem0 VectorStoreBase interface -------------------------------------
+
+    def insert(self, vectors: List[list], payloads: Optional[List[Dict]] = None, ids: Optional[List[str]] = None):
+        """Insert (or overwrite) vectors with their payloads."""
+        vectors = self._normalize(np.asarray(vectors, dtype=np.float32).reshape(-1, self.dims))
+        ids = ids or [str(i) for i in range(len(self._ids), len(self._ids) + len(vectors))]
+        payloads = payloads or [{} for _ in ids]
+        with self._lock:
+            rows = []
+            next_row = len(self._ids)
+            for vector_id in ids:
+                row = self._row_of.get(vector_id)
+                if row is None:
+                    row, next_row = next_row, next_row + 1
+                rows.append(row)
+            self._grow(next_row)
+            rows = np.asarray(rows)
+            self._vectors[rows] = vectors
+            self._vectors.flush()
+            records = [{"op": "put", "id": vector_id, "row": int(row), "payload": payload}
+                       for vector_id, row, payload in zip(ids, rows, payloads)]
+            self._log(records)
+            for record in records:
+                self._apply(record)
+            self._live[rows] = True
+            if self._centroids is not None:
+                self._assign_rows(rows)
+            self._maybe_train()
+
+    def _candidates(self, filters: Optional[Dict]) -> Optional[np.ndarray]:
+        """Rows allowed by the indexed equality filters, or None for every live row."""
+        sets = []
+        for key in INDEXED_KEYS:
+            value = (filters or {}).get(key)
+            if value is None or isinstance(value, (dict, list)):
+                continue
+            sets.append(self._index[key].get(value, set()))
+        if not sets:
+            return None
+        rows = set.intersection(*sorted(sets, key=len))
+        return np.fromiter(rows, dtype=np.int64, count=len(rows))
+
+    def search(self, query: str, vectors: List[list], top_k: int = 5, filters: Optional[Dict] = None,
+               exact: bool = False) -> List[OutputData]:
+        """
+        Top-k rows by cosine similarity that match filters.
+
+        Args:
+            query: Query text (unused; kept for the Mem0 interface)
+            vectors: Query embedding
+            top_k: Number of results
+            filters: Mem0 payload filters
+            exact: Force a brute-force scan even above ann_threshold
+        """
+        q = self._normalize(np.asarray(vectors, dtype=np.float32).reshape(-1, self.dims)[:1])[0]
+        with self._lock:
+            n = len(self._ids)
+            rows = self._candidates(filters)
+            n_candidates = len(self._row_of) if rows is None else len(rows)
+            if n_candidates == 0:
+                return []
+
+            if not exact and self._centroids is not None and n_candidates >= self.ann_threshold:
+                probes = np.argpartition(self._centroids @ q, -min(self.nprobe, len(self._centroids)))
+                probes = probes[-self.nprobe:]
+                if rows is None:
+                    rows = np.flatnonzero(np.isin(self._assign[:n], probes) & self._live[:n])
+                else:
+                    rows = rows[np.isin(self._assign[rows], probes)]
+                scores = self._vectors[rows] @ q
+            elif rows is None:
+                # Single matrix product over the whole collection
+                scores = np.where(self._live[:n], self._vectors[:n] @ q, -np.inf)
+                rows = np.arange(n)
+            else:
+                scores = self._vectors[rows] @ q
+
+            # Filters without an index are checked on payloads, widening until top_k pass
+            rest = {k: v for k, v in (filters or {}).items()
+                    if k not in INDEXED_KEYS or isinstance(v, (dict, list))}
+            fetch = top_k if not rest else top_k * 4
+            while True:
+                k = min(fetch, len(scores))
+                best = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+                best = best[np.argsort(-scores[best])]
+                best = best[np.isfinite(scores[best])]
+                results = [
+                    OutputData(id=self._ids[rows[i]], score=float(scores[i]), payload=dict(self._payloads[rows[i]]))
+                    for i in best
+                    if not rest or _matches(self._payloads[rows[i]], rest)
+                ]
+                if len(results) >= top_k or k == len(scores):
+                    return results[:top_k]
+                fetch *= 4
+
+    def delete(self, vector_id: str):
+        """Delete a vector by id."""
+        with self._lock:
+            row = self._row_of.get(vector_id)
+            if row is None:
+                return
+            self._log([{"op": "del", "id": vector_id}])
+            self._apply({"op": "del", "id": vector_id})
+            self._live[row] = False
+
+    def update(self, vector_id: str, vector: Optional[List[float]] = None, payload: Optional[Dict] = None):
+        """Replace a vector and/or its payload."""
+        with self._lock:
+            row = self._row_of.get(vector_id)
+            if row is None:
+                raise ValueError(f"Vector {vector_id} not found")
+            if vector is None:
+                if payload is None:
+                    return
+                self._log([{"op": "put", "id": vector_id, "row": row, "payload": payload}])
+                self._apply({"op": "put", "id": vector_id, "row": row, "payload": payload})
+                return
+            self.insert([vector], [payload if payload is not None else self._payloads[row]], [vector_id])
+
+    def get(self, vector_id: str) -> Optional[OutputData]:
+        """Retrieve a vector's payload by id."""
+        with self._lock:
+            row = self._row_of.get(vector_id)
+            if row is None:
+                return None
+            return OutputData(id=vector_id, score=None, payload=dict(self._payloads[row]))
+
+    def list_cols(self) -> List[str]:
+        return sorted(
+            name for name in os.listdir(self.path)
+            if os.path.isdir(os.path.join(self.path, name))
+        ) if os.path.isdir(self.path) else []
+
+    def delete_col(self):
+        """Delete the collection and its files."""
+        with self._lock:
+            self._records.close()
+            del self._vectors
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def col_info(self) -> Dict:
+        return {
+            "name": self.collection_name,
+            "count": len(self._row_of),
+            "dimension": self.dims,
+            "distance": "cosine",
+            "ivf_lists": 0 if self._centroids is None else len(self._centroids),
+        }
+
+    def list(self, filters: Optional[Dict] = None, top_k: Optional[int] = 100) -> List[List[OutputData]]:
+        """List vectors matching filters (wrapped in an outer list, like Mem0's other stores)."""
+        with self._lock:
+            rows = self._candidates(filters)
+            rows = sorted(self._row_of.values()) if rows is None else sorted(rows.tolist())
+            results = []
+            for row in rows:
+                if filters and not _matches(self._payloads[row], filters):
+                    continue
+                results.append(OutputData(id=self._ids[row], score=None, payload=dict(self._payloads[row])))
+                if top_k and len(results) >= top_k:
+                    break
+            return [results]
+
+    def reset(self):
+        """Delete the collection and recreate it empty."""
+        self.delete_col()
+        self.create_col(self.collection_name)
+
+    def close(self) -> None:
+        """Flush vectors and close the record log."""
+        with self._lock:
+            self._vectors.flush()
+            self._records.close()
+
+
+def register_with_mem0() -> bool:
+    """
+    Register LocalVectorStore with Mem0 as vector_store provider "local".
+
+    Mem0 resolves a provider's config class from mem0.configs.vector_stores.<provider>
+    and its store class from VectorStoreFactory, so both tables get an entry
+    pointing at this module.
+
+    Returns:
+        True if Mem0 is installed and the provider is registered
+    """
+    try:
+        from mem0.utils.factory import VectorStoreFactory
+        from mem0.vector_stores.configs import VectorStoreConfig
+    except ImportError:
+        return False
+    sys.modules.setdefault(f"mem0.configs.vector_stores.{PROVIDER}", sys.modules[__name__])
+    VectorStoreConfig.__private_attributes__["_provider_configs"].default[PROVIDER] = "LocalVectorStoreConfig"
+    VectorStoreFactory.provider_to_class[PROVIDER] = f"{__name__}.LocalVectorStore"
+    return True
@@ -0,0 +1,299 @@
+"""
+Mem0 Write-Behind Queue
+Asynchronous, batched memory.add so agent turns never wait on memory writes
+"""
+
+import asyncio
+import atexit
+import json
+import time
+import weakref
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+Messages = Union[str, Dict[str, Any], List[Dict[str, Any]]]
+
+_instances: "weakref.WeakSet[MemoryWriteBehind]" = weakref.WeakSet()
+
+
+def _normalize_messages(messages: Messages) -> List[Dict[str, Any]]:
+    if isinstance(messages, str):
+        return [{"role": "user", "content": messages}]
+    if isinstance(messages, dict):
+        return [messages]
+    return list(messages)
+
+
+class MemoryWriteBehind:
+    """
+    Write-behind pipeline in front of a Mem0 Memory's add().
+
+    add() enqueues and returns immediately. Pending writes are grouped per
+    (user_id, agent_id, run_id, metadata, options); a background task flushes a
+    group as one memory.add call over all its messages when it reaches
+    max_batch messages or its oldest entry is flush_interval seconds old.
+    Identical writes already pending are dropped. When max_pending writes are
+    queued, add() waits for room (backpressure).
+
+    memory.add is read-modify-write (search, then ADD/UPDATE/DELETE), so
+    flushes for one (user_id, agent_id, run_id) scope run one after another,
+    in the order the writes were queued; different scopes flush in parallel.
+
+    Callers must await close() (e.g. from a lifespan hook) before the event
+    loop stops. Interpreter exit only writes leftovers of a synchronous
+    Memory as a last resort; anything else still queued or in flight is
+    reported as lost.
+    """
+
+    def __init__(
+        self,
+        memory: Any,
+        max_pending: int = 1000,
+        max_batch: int = 20,
+        flush_interval: float = 1.0,
+        max_concurrent_flushes: int = 4,
+        max_retries: int = 2
+    ):
+        self.memory = memory
+        self.max_pending = max_pending
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self._flush_limit = asyncio.Semaphore(max_concurrent_flushes)
+
+        # group key -> (first enqueue time, [(dedup key, messages)])
+        self._groups: "OrderedDict[Tuple, Tuple[float, List[Tuple[str, List[Dict]]]]]" = OrderedDict()
+        self._pending_keys: set = set()
+        self._pending = 0
+        self._inflight = 0
+        self._closed = False
+        self._worker: Optional[asyncio.Task] = None
+        self._flushes: set = set()
+        # (user_id, agent_id, run_id) -> last flush task of that scope, which the next one waits for
+        self._chains: Dict[Tuple, asyncio.Task] = {}
+        self._changed: Optional[asyncio.Condition] = None
+        self._latencies: deque = deque(maxlen=1000)
+        self._stats = {
+            "enqueued": 0, "deduplicated": 0, "backpressure_waits": 0, "max_queue_depth": 0,
+            "flushed_batches": 0, "flushed_writes": 0, "failed_writes": 0, "retries": 0,
+        }
+        _instances.add(self)
+
+    def _ensure_worker(self) -> None:
+        if self._changed is None:
+            self._changed = asyncio.Condition()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def add(
+        self,
+        messages: Messages,
+        user_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ) -> bool:
+        """
+        Queue a memory.add call.
+
+        Args:
+            messages: Text, message dict or list of message dicts (as for memory.add)
+            user_id / agent_id / run_id: Mem0 scope identifiers
+            metadata: Metadata stored with the memories
+            **kwargs: Other memory.add options (e.g. infer)
+
+        Returns:
+            False if an identical write was already pending and this one was dropped
+        """
+        if self._closed:
+            raise RuntimeError("MemoryWriteBehind is closed")
+        self._ensure_worker()
+        messages = _normalize_messages(messages)
+        group = (user_id, agent_id, run_id,
+                 json.dumps(metadata, sort_keys=True, default=str),
+                 json.dumps(kwargs, sort_keys=True, default=str))
+        dedup_key = json.dumps([group, messages], sort_keys=True, default=str)
+
+        async with self._changed:
+            if dedup_key in self._pending_keys:
+                self._stats["deduplicated"] += 1
+                return False
+            if self._pending >= self.max_pending:
+                self._stats["backpressure_waits"] += 1
+                await self._changed.wait_for(lambda: self._pending < self.max_pending or self._closed)
+                if self._closed:
+                    raise RuntimeError("MemoryWriteBehind is closed")
+            first_at, items = self._groups.setdefault(group, (time.monotonic(), []))
+            items.append((dedup_key, messages))
+            self._pending_keys.add(dedup_key)
+            self._pending += 1
+            self._stats["enqueued"] += 1
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], self._pending)
+            self._changed.notify_all()
+        return True
+
+    def _due_groups(self, now: float, everything: bool) -> List[Tuple]:
+        return [
+            group for group, (first_at, items) in self._groups.items()
+            if everything or len(items) >= self.max_batch or now - first_at >= self.flush_interval
+        ]
+
+    async def _run(self) -> None:
+        while True:
+            async with self._changed:
+                while True:
+                    now = time.monotonic()
+                    due = self._due_groups(now, self._closed)
+                    if due or (self._closed and not self._groups):
+                        break
+                    oldest = min((first_at for first_at, _ in self._groups.values()), default=None)
+                    timeout = None if oldest is None else max(0.0, oldest + self.flush_interval - now)
+                    try:
+                        await asyncio.wait_for(self._changed.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+                if not due:
+                    break
+                flushes = []
+                for group in due:
+                    _, items = self._groups.pop(group)
+                    # Large groups are split so no single add call exceeds max_batch messages
+                    batches = [items[start:start + self.max_batch] for start in range(0, len(items), self.max_batch)]
+                    self._inflight += len(batches)
+                    flushes.append((group, batches))
+            # Scopes flush concurrently (bounded by max_concurrent_flushes) while new writes keep queuing;
+            # within a scope each flush waits for the previous one
+            for group, batches in flushes:
+                scope = group[:3]
+                task = asyncio.get_running_loop().create_task(
+                    self._flush_group(group, batches, self._chains.get(scope))
+                )
+                self._chains[scope] = task
+                self._flushes.add(task)
+                task.add_done_callback(self._flushes.discard)
+                task.add_done_callback(
+                    lambda task, scope=scope: self._chains.pop(scope) if self._chains.get(scope) is task else None
+                )
+        await asyncio.gather(*self._flushes)
+
+    async def _flush_group(self, group: Tuple, batches: List[List[Tuple[str, List[Dict]]]],
+                           previous: Optional[asyncio.Task]) -> None:
+        if previous is not None:
+            await asyncio.wait({previous})
+        for items in batches:
+            await self._flush_batch(group, items)
+
+    async def _flush_batch(self, group: Tuple, items: List[Tuple[str, List[Dict]]]) -> None:
+        user_id, agent_id, run_id, metadata, options = group
+        kwargs = {k: v for k, v in (("user_id", user_id), ("agent_id", agent_id), ("run_id", run_id)) if v}
+        metadata = json.loads(metadata)
+        if metadata is not None:
+            kwargs["metadata"] = metadata
+        kwargs.update(json.loads(options))
+        messages = [message for _, item_messages in items for message in item_messages]
+
+        async with self._flush_limit:
+            started = time.perf_counter()
+            for attempt in range(self.max_retries + 1):
+                try:
+                    if _is_async(self.memory):
+                        await self.memory.add(messages, **kwargs)
+                    else:
+                        await asyncio.to_thread(self.memory.add, messages, **kwargs)
+                    break
+                except Exception as e:
+                    if attempt == self.max_retries:
+                        self._stats["failed_writes"] += len(items)
+                        print(f"⚠️  Mem0 write-behind flush failed for user {user_id}: {e}")
+                        break
+                    self._stats["retries"] += 1
+                    await asyncio.sleep(0.2 * 2 ** attempt)
+            self._latencies.append(time.perf_counter() - started)
+
+        async with self._changed:
+            for dedup_key, _ in items:
+                self._pending_keys.discard(dedup_key)
+            self._pending -= len(items)
+            self._inflight -= 1
+            self._stats["flushed_batches"] += 1
+            self._stats["flushed_writes"] += len(items)
+            self._changed.notify_all()
+
+    async def flush(self) -> None:
+        """Write everything pending now and wait until it is stored."""
+        if self._changed is None:
+            return
+        async with self._changed:
+            now = time.monotonic()
+            for group, (first_at, items) in list(self._groups.items()):
+                self._groups[group] = (now - self.flush_interval, items)
+            self._changed.notify_all()
+            await self._changed.wait_for(lambda: self._pending == 0)
+
+    async def close(self) -> None:
+        """Stop accepting writes, flush everything pending and stop the worker."""
+        self._closed = True
+        if self._changed is None:
+            return
+        async with self._changed:
+            self._changed.notify_all()
+        if self._worker is not None:
+            await self._worker
+
+    def _flush_sync(self) -> None:
+        """Interpreter-exit fallback: write leftovers directly if the event loop is gone."""
+        queued = sum(len(items) for _, items in self._groups.values())
+        if self._pending > queued:
+            # Handed to memory.add but never finished; retrying could apply them twice
+            print(f"⚠️  Mem0 write-behind: {self._pending - queued} write(s) were still being flushed at exit "
+                  f"and may be lost; await close() before the event loop stops")
+        if _is_async(self.memory):
+            if queued:
+                self._stats["failed_writes"] += queued
+                print(f"⚠️  Mem0 write-behind: dropped {queued} queued write(s) for an async Memory at exit; "
+                      f"await close() before the event loop stops")
+            return
+        while self._groups:
+            group, (_, items) = self._groups.popitem(last=False)
+            user_id, agent_id, run_id, metadata, options = group
+            kwargs = {k: v for k, v in (("user_id", user_id), ("agent_id", agent_id), ("run_id", run_id)) if v}
+            if json.loads(metadata) is not None:
+                kwargs["metadata"] = json.loads(metadata)
+            kwargs.update(json.loads(options))
+            try:
+                self.memory.add([m for _, messages in items for m in messages], **kwargs)
+                self._stats["flushed_writes"] += len(items)
+            except Exception as e:
+                self._stats["failed_writes"] += len(items)
+                print(f"⚠️  Mem0 write-behind exit flush failed for user {user_id}: {e}")
+            self._pending -= len(items)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, throughput counters and flush latency percentiles."""
+        latencies = sorted(self._latencies)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 2)
+
+        return {
+            **self._stats,
+            "queue_depth": self._pending,
+            "inflight_batches": self._inflight,
+            "flush_p50_ms": percentile(0.50),
+            "flush_p95_ms": percentile(0.95),
+            "flush_max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+        }
+
+
+def _is_async(memory: Any) -> bool:
+    return asyncio.iscoroutinefunction(getattr(memory, "add", None))
+
+
+@atexit.register
+def _flush_on_exit() -> None:
+    for writer in list(_instances):
+        if writer._pending:
+            writer._flush_sync()
@@ -0,0 +1,48 @@
+"""Tests for the shared artifact store."""
+
+import threading
+
+import pytest
+
+from competitive_artifacts import ArtifactStore
+
+
+def test_lazy_artifact_is_computed_once_for_all_readers():
+    store = ArtifactStore()
+    calls = []
+    first = store.put_lazy(lambda: calls.append(1) or [1, 2, 3], key="pricing:run-1", run="run-1")
+    second = store.put_lazy(lambda: calls.append(2) or [], key="pricing:run-1", run="run-1")
+
+    assert first == second
+    assert store.get(first) == store.get(second) == [1, 2, 3]
+    assert calls == [1]
+
+
+def test_release_while_loading_keeps_nothing():
+    store = ArtifactStore()
+    started, finish = threading.Event(), threading.Event()
+
+    def slow_loader():
+        started.set()
+        finish.wait(5)
+        return [1, 2, 3]
+
+    ref = store.put_lazy(slow_loader, key="pricing:run-1", run="run-1")
+    result = {}
+    # Like a timed-out stage's to_thread(artifact_store.get, ...) that keeps running
+    reader = threading.Thread(target=lambda: result.setdefault("value", store.get(ref)))
+    reader.start()
+    assert started.wait(5)
+
+    assert store.release_run("run-1") == 1
+    # The run's next analysis under the same key is a new artifact, unaffected by the orphaned load
+    fresh = store.put_lazy(lambda: [4], key="pricing:run-1", run="run-1")
+    finish.set()
+    reader.join(5)
+
+    assert result["value"] == [1, 2, 3]
+    assert store.get(fresh) == [4]
+    store.release_run("run-1")
+    assert store.stats()["artifacts"] == 0 and store._load_locks == {}
+    with pytest.raises(KeyError):
+        store.get(ref)
@@ -0,0 +1,72 @@
+"""Tests for the content-hash chart render cache."""
+
+import asyncio
+
+import pandas as pd
+import pytest
+
+from competitive_charts import CACHE_INDEX, ChartRenderer, chart_specs
+from competitive_pricing import analyze_pricing
+
+pytest.importorskip("matplotlib")
+pytest.importorskip("seaborn")
+
+
+def products(seating_scale: float = 1.0) -> pd.DataFrame:
+    rows = []
+    for i in range(12):
+        rows.append({"sku": f"D-{i}", "product_name": f"Desk {i}", "price": f"${300 + 25 * i}",
+                     "category": "Desks", "manufacturer": f"Maker {i % 3}", "source_file": "a.pdf"})
+        rows.append({"sku": f"S-{i}", "product_name": f"Chair {i}", "price": f"${(100 + 10 * i) * seating_scale:.2f}",
+                     "category": "Seating", "manufacturer": f"Maker {i % 3}", "source_file": "b.pdf"})
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def renderer():
+    # Same as CHART_WORKERS=0: charts are drawn in one background thread
+    renderer = ChartRenderer(max_workers=0)
+    yield renderer
+    renderer.shutdown()
+
+
+def render(renderer, frame, folder):
+    return asyncio.run(renderer.render(chart_specs(analyze_pricing(frame)), folder))
+
+
+def test_unchanged_specs_come_from_the_cache(renderer, tmp_path):
+    first = render(renderer, products(), tmp_path)
+    assert first.failures == [] and first.cached == []
+    assert all(path.exists() for path in first.paths)
+    mtimes = {path: path.stat().st_mtime_ns for path in first.paths}
+
+    second = render(renderer, products(), tmp_path)
+    assert (second.rendered, second.cached) == ([], first.rendered)
+    assert {path: path.stat().st_mtime_ns for path in second.paths} == mtimes
+
+    # A chart whose file went missing is drawn again
+    (tmp_path / "category_desks_manufacturers.png").unlink()
+    assert render(renderer, products(), tmp_path).rendered == ["category_desks_manufacturers"]
+
+
+def test_changed_category_redraws_only_its_charts(renderer, tmp_path):
+    render(renderer, products(), tmp_path)
+    result = render(renderer, products(seating_scale=1.5), tmp_path)
+
+    assert "category_seating_manufacturers" in result.rendered
+    assert "category_desks_manufacturers" in result.cached
+    # Charts over all categories change with Seating; the price index vs category median does not
+    assert "manufacturer_price_index" in result.cached
+    assert set(result.rendered) == {"price_distribution", "category_price_ranges", "manufacturer_median_prices",
+                                    "segment_median_prices", "category_seating_manufacturers"}
+
+
+def test_cache_index_survives_a_new_renderer(renderer, tmp_path):
+    first = render(renderer, products(), tmp_path)
+    assert (tmp_path / CACHE_INDEX).exists()
+
+    fresh = ChartRenderer(max_workers=0)
+    try:
+        assert render(fresh, products(), tmp_path).cached == first.rendered
+    finally:
+        fresh.shutdown()
@@ -0,0 +1,158 @@
+"""Tests for the cached credential and the agent client pool."""
+
+import asyncio
+from types import SimpleNamespace
+
+from competitive_clients import AgentClientPool, CachedTokenCredential, LocalCredential, LocalProjectClient
+
+SCOPE = "https://ai.azure.com/.default"
+
+
+def test_tokens_are_cached_per_scope():
+    async def scenario():
+        inner = LocalCredential(latency=0)
+        credential = CachedTokenCredential(inner)
+        first = await credential.get_token(SCOPE)
+        assert (await credential.get_token(SCOPE)).token == first.token
+        assert (await credential.get_token("https://storage.azure.com/.default")).token != first.token
+        assert inner.acquisitions == 2 and credential.stats()["hits"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_token_near_expiry_is_served_and_refreshed_in_background():
+    async def scenario():
+        # Lives 200s: valid, but inside the 300s refresh margin from the start
+        inner = LocalCredential(latency=0.05, lifetime=200)
+        credential = CachedTokenCredential(inner, refresh_margin=300)
+        assert (await credential.get_token(SCOPE)).token == "token-1"
+
+        # Served from the cache without waiting, while one refresh starts behind it
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        tokens = [(await credential.get_token(SCOPE)).token for _ in range(3)]
+        assert tokens == ["token-1"] * 3 and loop.time() - started < 0.05
+        await asyncio.sleep(0.1)
+
+        assert (await credential.get_token(SCOPE)).token == "token-2"
+        assert credential.stats()["background_refreshes"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_expired_token_blocks_for_a_new_one():
+    async def scenario():
+        # Lives 10s: inside the 30s safety window, so never served from the cache
+        inner = LocalCredential(latency=0, lifetime=10)
+        credential = CachedTokenCredential(inner)
+        assert (await credential.get_token(SCOPE)).token == "token-1"
+        assert (await credential.get_token(SCOPE)).token == "token-2"
+        assert credential.stats()["hits"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_claims_challenges_bypass_the_cache():
+    async def scenario():
+        inner = LocalCredential(latency=0)
+        credential = CachedTokenCredential(inner)
+        await credential.get_token(SCOPE)
+        assert (await credential.get_token(SCOPE, claims='{"access_token": {}}')).token == "token-2"
+        assert inner.acquisitions == 2
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_callers_share_one_acquisition():
+    async def scenario():
+        inner = LocalCredential(latency=0.05)
+        credential = CachedTokenCredential(inner)
+        tokens = await asyncio.gather(*(credential.get_token(SCOPE) for _ in range(10)))
+        assert {token.token for token in tokens} == {"token-1"}
+        assert inner.acquisitions == 1 and credential.stats()["acquisitions"] == 1
+
+        await credential.close()
+        assert inner.closed
+
+    asyncio.run(scenario())
+
+
+def local_pool(max_agents=16):
+    return AgentClientPool(
+        endpoint="https://local",
+        model="gpt-4o",
+        credential_factory=lambda: LocalCredential(latency=0),
+        project_client_factory=lambda endpoint, credential: LocalProjectClient(
+            credential, connect_latency=0, agent_latency=0, delete_latency=0
+        ),
+        agent_factory=lambda project_client, agent_id, name: SimpleNamespace(id=agent_id, name=name),
+        max_agents=max_agents,
+    )
+
+
+def test_agent_definitions_are_created_once_and_share_one_token():
+    async def scenario():
+        pool = local_pool()
+        agents = await asyncio.gather(*(pool.agent("extractor", "Extract products") for _ in range(5)))
+        assert len({agent.id for agent in agents}) == 1
+        other = await pool.agent("extractor", "Extract prices")
+        assert other.id != agents[0].id
+
+        stats = pool.stats()
+        assert stats["agents_created"] == 2 and stats["agent_reuses"] == 4
+        assert stats["credential"]["acquisitions"] == 1
+        assert len(pool.agents.stored_agents) == 2
+        await pool.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_least_recently_used_agent_is_evicted():
+    async def scenario():
+        pool = local_pool(max_agents=2)
+        a = await pool.agent("a", "A")
+        b = await pool.agent("b", "B")
+        await pool.agent("a", "A")
+        c = await pool.agent("c", "C")
+
+        assert set(pool.agents.stored_agents) == {a.id, c.id}
+        assert pool.stats()["agents_deleted"] == 1 and pool.stats()["agents"] == 2
+        # An evicted definition is created again on its next use
+        assert (await pool.agent("b", "B")).id != b.id
+        await pool.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_release_agents_deletes_those_searching_a_vector_store():
+    async def scenario():
+        pool = local_pool()
+        await pool.agent("extractor", "Extract", ["vs_1"])
+        await pool.agent("extractor", "Extract", ["vs_1", "vs_2"])
+        kept = await pool.agent("extractor", "Extract", ["vs_2"])
+
+        assert await pool.release_agents("vs_1") == 2
+        assert set(pool.agents.stored_agents) == {kept.id}
+        assert await pool.release_agents("vs_1") == 0
+        await pool.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_aclose_deletes_agents_and_closes_clients():
+    async def scenario():
+        pool = local_pool()
+        await pool.agent("a", "A")
+        await pool.agent("b", "B")
+        agents_client, project_client = pool.agents, pool.project_client
+        inner = pool.credential.credential
+
+        await pool.aclose()
+        assert agents_client.stored_agents == {}
+        assert project_client.closed and inner.closed
+        assert pool.stats()["agents"] == 0 and pool.stats()["credential"] is None
+        # A closed pool builds fresh clients on next use
+        assert pool.project_client is not project_client
+        await pool.aclose()
+
+    asyncio.run(scenario())
@@ -0,0 +1,110 @@
+"""Tests for streamed product parsing and SKU-keyed merging."""
+
+import asyncio
+
+import pytest
+
+from competitive_extraction import ProductMerger, ProductStreamParser, extract_per_file, parse_products
+
+REPLY = """Sure! Here are the products I found in "catalog.pdf":
+
+```json
+{"products": [
+  {"sku": "DK-100", "product_name": "Desk \\"Pro\\" {oak}", "price": "$499.00", "specs": {"width": 160}},
+  {"sku": "BN-1", "product_name": "Office bundle", "price": 899,
+   "items": [{"sku": "CH-7", "name": "Chair"}, {"sku": "LP-2", "name": "Lamp [LED]"}]},
+  {"name": "Cable tray", "manufacturer": "Acme", "price": null}
+]}
+```
+Let me know if you need anything else."""
+
+
+def parse_in_chunks(text, size):
+    parser = ProductStreamParser()
+    products = []
+    for start in range(0, len(text), size):
+        products.extend(parser.feed(text[start:start + size]))
+    return products + parser.close(), parser
+
+
+def test_products_are_found_in_prose_fences_and_wrappers():
+    products = parse_products(REPLY)
+    assert [product.get("sku") for product in products] == ["DK-100", "BN-1", None]
+    assert products[0]["product_name"] == 'Desk "Pro" {oak}'
+    # Nested products stay inside their bundle
+    assert [item["sku"] for item in products[1]["items"]] == ["CH-7", "LP-2"]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 16, 64, len(REPLY)])
+def test_chunk_size_does_not_change_the_result(size):
+    products, parser = parse_in_chunks(REPLY, size)
+    assert products == parse_products(REPLY)
+    assert (parser.products, parser.errors, parser.truncated) == (3, 0, False)
+
+
+def test_products_are_emitted_as_soon_as_they_close():
+    parser = ProductStreamParser()
+    assert parser.feed('[{"sku": "A", "price": 1}, {"sku": "B"') == [{"sku": "A", "price": 1}]
+    assert parser.feed(', "price": 2}') == [{"sku": "B", "price": 2}]
+
+
+@pytest.mark.parametrize("size", [1, 5, 1000])
+def test_truncated_reply_keeps_completed_products(size):
+    text = '{"products": [{"sku": "A-1", "price": 10}, {"sku": "B-2", "pri'
+    products, parser = parse_in_chunks(text, size)
+    assert products == [{"sku": "A-1", "price": 10}]
+    assert parser.truncated
+
+
+@pytest.mark.parametrize("size", [1, 4, 1000])
+def test_malformed_objects_are_skipped(size):
+    text = '[{"sku": "A", price: 1}, {"sku": "B"}] ] He said "hi" {"sku": "C"} {"note": "not a product"}'
+    products, parser = parse_in_chunks(text, size)
+    assert products == [{"sku": "B"}, {"sku": "C"}]
+    assert parser.errors == 1 and not parser.truncated
+
+
+def test_text_without_json_yields_nothing():
+    assert parse_products("I could not find any products in this catalog.") == []
+    assert parse_products("") == []
+
+
+def test_merger_deduplicates_by_normalized_sku():
+    merger = ProductMerger()
+    assert merger.add({"sku": "dk-100 ", "product_name": "Desk", "price": None}, "a.pdf")
+    assert not merger.add({"sku": "DK.100", "product_name": "Desk XL", "price": 499}, "b.pdf")
+    assert not merger.add({"sku": "DK_100"}, "b.pdf")
+
+    [desk] = merger.products
+    assert desk["product_name"] == "Desk" and desk["price"] == 499
+    assert desk["source_files"] == ["a.pdf", "b.pdf"]
+    assert (len(merger), merger.duplicates, merger.updated) == (1, 2, 1)
+
+
+def test_merger_falls_back_to_manufacturer_and_name():
+    merger = ProductMerger()
+    assert merger.add({"sku": "n/a", "name": "Cable Tray", "manufacturer": "Acme"})
+    assert not merger.add({"product_name": "cable-tray", "manufacturer": "ACME"})
+    assert merger.add({"name": "Cable Tray", "manufacturer": "Other"})
+    # Products without SKU or name cannot be matched and are all kept
+    assert merger.add({"price": 5}) and merger.add({"price": 5})
+    assert len(merger) == 4
+
+
+def test_extract_per_file_merges_streams_and_keeps_products_before_a_timeout():
+    replies = {
+        "a.pdf": ['[{"sku": "A-1"}, ', '{"sku": "S-1", "price": 1}]'],
+        "b.pdf": ['[{"sku": "s1", "price": 2}, ', '{"sku": "B-1"}', None],
+    }
+
+    async def extract(source):
+        for chunk in replies[source]:
+            if chunk is None:
+                await asyncio.sleep(10)
+            yield chunk
+
+    result = asyncio.run(extract_per_file(["a.pdf", "b.pdf"], extract, timeout=0.2))
+    assert sorted(product["sku"] for product in result.products) == ["A-1", "B-1", "S-1"]
+    assert result.duplicates == 1
+    assert [stats.source_file for stats in result.failures] == ["b.pdf"]
+    assert "timed out" in result.failures[0].error
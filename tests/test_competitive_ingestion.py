@@ -0,0 +1,140 @@
+"""Tests for the incremental ingestion manifest and vector store sync."""
+
+import asyncio
+import json
+import os
+
+import pytest
+
+from competitive_ingestion import IngestionManifest, LocalAgentsClient, ParallelIngestor
+
+
+def write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+class FlakyAgentsClient(LocalAgentsClient):
+    """Local client whose uploads of the named files fail with a non-retryable error."""
+
+    def __init__(self, **kwargs):
+        super().__init__(upload_latency=0, per_mb_latency=0, delete_latency=0, index_latency_per_file=0,
+                         **kwargs)
+        self.fail_uploads = set()
+        upload = self.files.upload_and_poll
+
+        async def upload_and_poll(file_path, **kwargs):
+            if os.path.basename(file_path) in self.fail_uploads:
+                raise PermissionError(f"Cannot read {file_path}")
+            return await upload(file_path, **kwargs)
+
+        self.files.upload_and_poll = upload_and_poll
+
+
+@pytest.fixture
+def agents():
+    return FlakyAgentsClient()
+
+
+def sync(agents, paths, manifest_path):
+    ingestor = ParallelIngestor(agents, retry_delay=0, progress=None)
+    return asyncio.run(ingestor.sync_vector_store(paths, IngestionManifest(manifest_path), name="catalogs"))
+
+
+def indexed_contents(agents, result):
+    store = agents.stored_vector_stores[result.vector_store_id]
+    return sorted(agents.stored_files[file_id].filename for file_id in store.file_ids)
+
+
+def test_manifest_round_trip_and_hash_cache(tmp_path):
+    catalog = write(tmp_path / "a.pdf", "alpha")
+    manifest = IngestionManifest(tmp_path / "manifest.json")
+    digest = manifest.digest(catalog)
+    manifest.vector_store_id = "vs_1"
+    manifest.blobs[digest] = {"file_id": "file-1", "indexed": True}
+    manifest.save()
+
+    reloaded = IngestionManifest(tmp_path / "manifest.json")
+    assert (reloaded.vector_store_id, reloaded.blobs) == ("vs_1", {digest: {"file_id": "file-1", "indexed": True}})
+
+    # Same size and mtime: the cached hash is trusted without reading the file
+    stat = catalog.stat()
+    write(catalog, "omega")
+    os.utime(catalog, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert reloaded.digest(catalog) == digest
+    os.utime(catalog, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert reloaded.digest(catalog) != digest
+
+    reloaded.forget_missing([])
+    assert reloaded.paths == {}
+    assert reloaded.reset() == ["file-1"]
+    assert (reloaded.vector_store_id, reloaded.blobs) == (None, {})
+
+
+def test_manifest_ignores_unreadable_or_other_versions(tmp_path):
+    path = tmp_path / "manifest.json"
+    write(path, "{not json")
+    assert IngestionManifest(path).blobs == {}
+    write(path, json.dumps({"version": IngestionManifest.VERSION + 1, "vector_store_id": "vs_old"}))
+    assert IngestionManifest(path).vector_store_id is None
+
+
+def test_sync_uploads_only_changes(agents, tmp_path):
+    manifest = tmp_path / "manifest.json"
+    a, b = write(tmp_path / "a.pdf", "alpha"), write(tmp_path / "b.pdf", "beta")
+
+    first = sync(agents, [a, b], manifest)
+    assert first.created_store and sorted(first.added) == ["a.pdf", "b.pdf"]
+    uploads = agents.requests
+
+    second = sync(agents, [a, b], manifest)
+    assert (second.vector_store_id, second.added, second.removed) == (first.vector_store_id, [], 0)
+    assert not second.created_store
+    assert agents.requests == uploads + 1  # only the vector store existence check
+
+    # Renamed files reuse their upload; changed and deleted content is replaced
+    renamed = tmp_path / "a-2025.pdf"
+    a.rename(renamed)
+    write(b, "beta v2")
+    third = sync(agents, [renamed, b], manifest)
+    assert (third.added, sorted(third.unchanged), third.removed) == (["b.pdf"], ["a-2025.pdf"], 1)
+    assert indexed_contents(agents, third) == ["a.pdf", "b.pdf"]
+    assert len(agents.stored_files) == 2
+
+    third_files = set(agents.stored_files)
+    fourth = sync(agents, [renamed], manifest)
+    assert fourth.removed == 1
+    assert len(agents.stored_files) == 1 and set(agents.stored_files) < third_files
+
+
+def test_failed_upload_of_changed_file_keeps_old_content(agents, tmp_path):
+    manifest = tmp_path / "manifest.json"
+    a, b = write(tmp_path / "a.pdf", "alpha"), write(tmp_path / "b.pdf", "beta")
+    first = sync(agents, [a, b], manifest)
+    old_ids = set(first.file_ids)
+
+    write(b, "beta v2")
+    agents.fail_uploads.add("b.pdf")
+    second = sync(agents, [a, b], manifest)
+    assert [path.name for path, _ in second.failures] == ["b.pdf"]
+    assert (second.added, second.removed) == ([], 0)
+    assert set(agents.stored_vector_stores[second.vector_store_id].file_ids) == old_ids
+
+    # The next successful run swaps the old content for the new
+    agents.fail_uploads.clear()
+    third = sync(agents, [a, b], manifest)
+    assert (third.added, third.removed) == (["b.pdf"], 1)
+    store_ids = set(agents.stored_vector_stores[third.vector_store_id].file_ids)
+    assert store_ids == set(third.file_ids) and len(store_ids & old_ids) == 1
+
+
+def test_sync_rebuilds_a_deleted_store(agents, tmp_path):
+    manifest = tmp_path / "manifest.json"
+    a = write(tmp_path / "a.pdf", "alpha")
+    first = sync(agents, [a], manifest)
+    del agents.stored_vector_stores[first.vector_store_id]
+
+    second = sync(agents, [a], manifest)
+    assert second.created_store and second.vector_store_id != first.vector_store_id
+    assert second.added == ["a.pdf"]
+    assert set(agents.stored_files) == set(second.file_ids)
@@ -0,0 +1,65 @@
+"""Tests for vectorized price parsing and currency normalization."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from competitive_pricing import analyze_pricing, normalize_prices, parse_prices
+
+
+@pytest.mark.parametrize("raw, amount, currency", [
+    ("$1,299.00", 1299.0, "USD"),
+    ("€ 899", 899.0, "EUR"),
+    ("1.299,00 EUR", 1299.0, "EUR"),
+    ("2499 SEK", 2499.0, "SEK"),
+    ("1.299", 1299.0, None),
+    ("1.299 EUR", 1299.0, "EUR"),
+    ("1.299.000 SEK", 1299000.0, "SEK"),
+    ("1,299", 1299.0, None),
+    ("1,5 EUR", 1.5, "EUR"),
+    ("£12.50", 12.5, "GBP"),
+    ("499.99", 499.99, None),
+    ("0.125", 0.125, None),
+    (" 899 ", 899.0, None),
+])
+def test_price_formats(raw, amount, currency):
+    parsed = parse_prices(pd.Series([raw], dtype="object"))
+    assert parsed["amount"][0] == pytest.approx(amount)
+    assert parsed["currency"].where(parsed["currency"].notna(), None)[0] == currency
+
+
+def test_numbers_and_missing_values_pass_through():
+    parsed = parse_prices(pd.Series([1299, 12.5, None, np.nan, "n/a", ""], dtype="object"))
+    np.testing.assert_array_equal(parsed["amount"], [1299.0, 12.5, np.nan, np.nan, np.nan, np.nan])
+    assert parsed["currency"].isna().all()
+
+    floats = parse_prices(pd.Series([1.299, 2.5]))
+    np.testing.assert_array_equal(floats["amount"], [1.299, 2.5])
+
+
+def test_string_dtype_is_parsed_as_text():
+    parsed = parse_prices(pd.Series(["1.299 EUR", pd.NA], dtype="string"))
+    assert parsed["amount"][0] == 1299.0 and parsed["currency"][0] == "EUR"
+    assert pd.isna(parsed["amount"][1])
+
+
+def test_normalize_prices_converts_to_base():
+    frame = pd.DataFrame({"price": ["1.299 EUR", "$100", "100", "5 XYZ"], "currency": [None, None, "gbp", None]})
+    priced = normalize_prices(frame, rates={"USD": 1.0, "EUR": 1.1, "GBP": 1.25}, base="USD")
+    assert list(priced["currency"]) == ["EUR", "USD", "GBP", "XYZ"]
+    np.testing.assert_allclose(priced["price_normalized"], [1428.9, 100.0, 125.0, np.nan])
+
+
+def test_analyze_pricing_reports_unknown_currencies():
+    frame = pd.DataFrame({
+        "sku": ["A-1", "a1", "B-2"],
+        "product_name": ["Desk", "Desk", "Chair"],
+        "price": ["1.299 EUR", "$1,400.00", "5 XYZ"],
+        "category": ["Desks", "Desks", "Seating"],
+        "manufacturer": ["Acme", "Dealer", "Acme"],
+        "source_file": ["a.pdf", "b.pdf", "a.pdf"],
+    })
+    analysis = analyze_pricing(frame, rates={"USD": 1.0, "EUR": 1.1})
+    assert analysis.summary["priced"] == 2 and analysis.summary["unconverted"] == 1
+    assert analysis.summary["matched_groups"] == 1
+    assert analysis.summary["min"] == pytest.approx(1400.0)
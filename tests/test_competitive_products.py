@@ -0,0 +1,82 @@
+"""Tests for the JSON Lines product files."""
+
+import pytest
+
+from competitive_products import ProductWriter, product_frames, products_message, read_product_chunks
+
+
+def test_reader_skips_a_torn_last_line(tmp_path):
+    path = tmp_path / "products.jsonl"
+    with ProductWriter(path) as writer:
+        writer.write({"sku": "A1", "price": 10.0})
+        writer.write({"sku": "A2", "price": 12.5})
+    # An interrupted run left half a line behind
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"sku": "A3", "pri')
+
+    frames = list(read_product_chunks(path))
+    assert len(frames) == 1
+    assert frames[0]["sku"].tolist() == ["A1", "A2"]
+
+
+def test_written_lines_are_readable_before_close(tmp_path):
+    path = tmp_path / "products.jsonl"
+    writer = ProductWriter(path)
+    writer.write({"sku": "A1"})
+    assert [frame["sku"].tolist() for frame in read_product_chunks(path)] == [["A1"]]
+    writer.close()
+
+
+def test_rewrite_replaces_the_file_and_resets_the_count(tmp_path):
+    path = tmp_path / "products.jsonl"
+    writer = ProductWriter(path)
+    for i in range(5):
+        writer.write({"sku": f"A{i}"})
+    writer.rewrite([{"sku": "A0", "brand": "Acme"}, {"sku": "A1", "brand": "Acme"}])
+
+    assert writer.count == 2
+    frame = next(read_product_chunks(path))
+    assert frame.to_dict("records") == [{"sku": "A0", "brand": "Acme"}, {"sku": "A1", "brand": "Acme"}]
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_failed_rewrite_keeps_the_old_content(tmp_path):
+    path = tmp_path / "products.jsonl"
+    writer = ProductWriter(path)
+    writer.write({"sku": "A1"})
+    writer.write({"sku": "A2"})
+
+    def products():
+        yield {"sku": "B1"}
+        raise RuntimeError("dedup failed")
+
+    with pytest.raises(RuntimeError):
+        writer.rewrite(products())
+    assert writer.count == 2
+    assert next(read_product_chunks(path))["sku"].tolist() == ["A1", "A2"]
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_chunks_respect_chunk_size(tmp_path):
+    path = tmp_path / "products.jsonl"
+    with ProductWriter(path) as writer:
+        for i in range(10):
+            writer.write({"sku": f"A{i}"})
+
+    assert [len(frame) for frame in read_product_chunks(path, chunk_size=4)] == [4, 4, 2]
+    assert [len(frame) for frame in read_product_chunks(path, chunk_size=5)] == [5, 5]
+    rows = [sku for frame in read_product_chunks(path, chunk_size=3) for sku in frame["sku"]]
+    assert rows == [f"A{i}" for i in range(10)]
+    assert [len(frame) for frame in product_frames(products_message(path, 10), chunk_size=4)] == [4, 4, 2]
+
+
+def test_values_keep_their_written_types(tmp_path):
+    path = tmp_path / "products.jsonl"
+    with ProductWriter(path) as writer:
+        writer.write({"sku": "007", "upc": "0012345", "price": 9.99})
+        writer.write({"sku": "010", "upc": "0099999", "price": 5})
+
+    frame = next(read_product_chunks(path))
+    assert frame["sku"].tolist() == ["007", "010"]
+    assert frame["upc"].tolist() == ["0012345", "0099999"]
+    assert all(isinstance(sku, str) for sku in frame["sku"])
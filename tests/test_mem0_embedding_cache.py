@@ -0,0 +1,56 @@
+"""Tests for the persistent, batching Mem0 embedding cache."""
+
+import numpy as np
+import pytest
+
+from mem0_embedding_cache import EmbeddingBatcher, EmbeddingStore
+
+
+def test_put_many_stores_repeated_keys_once(tmp_path):
+    store = EmbeddingStore(str(tmp_path), dims=2)
+    store.put_many(["a", "b", "a"], np.array([[1, 0], [0, 1], [1, 0]], dtype=np.float32))
+    assert len(store) == 2
+    store.close()
+
+    reloaded = EmbeddingStore(str(tmp_path), dims=2)
+    vectors, missing = reloaded.get_many(["a", "b", "c"])
+    assert missing == [2]
+    np.testing.assert_array_equal(vectors, [[1, 0], [0, 1]])
+    reloaded.close()
+
+
+def test_short_batch_fails_its_callers_and_keeps_the_batcher_running():
+    responses = [[[1.0, 0.0]], None]
+
+    def embed_batch(texts):
+        response = responses.pop(0)
+        return response if response is not None else [[float(len(text)), 0.0] for text in texts]
+
+    batcher = EmbeddingBatcher(embed_batch, max_wait_ms=50)
+    first, second = batcher.submit("a", "a"), batcher.submit("b", "bb")
+    for future in (first, second):
+        with pytest.raises(ValueError, match="1 vectors for 2 texts"):
+            future.result(timeout=5)
+
+    np.testing.assert_array_equal(batcher.submit("b", "bb").result(timeout=5), [2.0, 0.0])
+
+
+def test_torn_index_line_is_dropped_and_later_rows_append(tmp_path):
+    store = EmbeddingStore(str(tmp_path), dims=2, initial_capacity=8)
+    store.put_many(["a", "b"], np.array([[1, 0], [0, 1]], dtype=np.float32))
+    store.close()
+    with open(store.index_path, "a", encoding="ascii") as f:
+        f.write("c-half-writt")
+
+    reopened = EmbeddingStore(str(tmp_path), dims=2, initial_capacity=8)
+    assert len(reopened) == 2 and "c-half-writt" not in reopened
+    reopened.put_many(["c"], np.array([[2, 2]], dtype=np.float32))
+    reopened.close()
+    with open(store.index_path, encoding="ascii") as f:
+        assert f.read() == "a\nb\nc\n"
+
+    final = EmbeddingStore(str(tmp_path), dims=2, initial_capacity=8)
+    vectors, missing = final.get_many(["c", "a"])
+    assert missing == []
+    np.testing.assert_array_equal(vectors, [[2, 2], [1, 0]])
+    final.close()
@@ -0,0 +1,113 @@
+"""Tests for the process-wide Mem0 Memory pool."""
+
+import threading
+import time
+from types import SimpleNamespace
+
+from mem0_memory_pool import MemoryPool
+
+
+class FakeClient:
+    def __init__(self, http_client=None):
+        self.http_client = http_client
+
+    def copy(self, http_client=None):
+        return FakeClient(http_client)
+
+
+class FakeStore:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def fake_memory(config):
+    return SimpleNamespace(
+        config=config,
+        embedding_model=SimpleNamespace(client=FakeClient()),
+        llm=SimpleNamespace(client=FakeClient()),
+        vector_store=FakeStore(),
+    )
+
+
+def config(collection="travel", api_key="secret"):
+    return {"vector_store": {"provider": "local", "config": {"collection_name": collection}},
+            "llm": {"config": {"api_key": api_key}}}
+
+
+def test_same_fingerprint_reuses_the_instance():
+    pool = MemoryPool(build=fake_memory)
+    first = pool.get(config())
+    assert pool.get(config()) is first
+    assert pool.get(config("other")) is not first
+    # on_build only runs for a new build; build options are part of the fingerprint
+    assert pool.get(config(), on_build=lambda memory: 1 / 0) is first
+    assert pool.get(config(), cache_embeddings=True, on_build=lambda memory: None) is not first
+    assert pool.stats()["builds"] == 3 and pool.stats()["reuses"] == 2
+    pool.close()
+
+
+def test_concurrent_gets_build_once_and_other_configs_in_parallel():
+    builds = {}
+    started = {name: threading.Event() for name in ("a", "b")}
+    lock = threading.Lock()
+
+    def slow_build(cfg):
+        name = cfg["vector_store"]["config"]["collection_name"]
+        with lock:
+            builds[name] = builds.get(name, 0) + 1
+        started[name].set()
+        # Each build only finishes once the other config's build has started
+        assert started["b" if name == "a" else "a"].wait(5)
+        time.sleep(0.05)
+        return fake_memory(cfg)
+
+    pool = MemoryPool(build=slow_build)
+    results = {}
+
+    def get(i, name):
+        results[i] = pool.get(config(name))
+
+    threads = [threading.Thread(target=get, args=(i, "a" if i % 2 else "b")) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert builds == {"a": 1, "b": 1}
+    assert len({id(memory) for memory in results.values()}) == 2
+    pool.close()
+
+
+def test_config_of_returns_a_copy():
+    pool = MemoryPool(build=fake_memory)
+    original = config()
+    memory = pool.get(original)
+    # The Memory was built from a copy, and the caller's dict is untouched
+    memory.config["llm"]["config"]["api_key"] = "changed by mem0"
+    assert original["llm"]["config"]["api_key"] == "secret"
+
+    stored = pool.config_of(memory)
+    assert stored == config()
+    stored["llm"]["config"]["api_key"] = "leaked"
+    assert pool.config_of(memory) == config()
+    assert pool.config_of(object()) is None
+    pool.close()
+
+
+def test_close_releases_stores_and_the_shared_http_client():
+    pool = MemoryPool(build=fake_memory)
+    memories = [pool.get(config("a")), pool.get(config("b"))]
+    http_client = pool.http_client
+    assert all(memory.embedding_model.client.http_client is http_client for memory in memories)
+    assert all(memory.llm.client.http_client is http_client for memory in memories)
+
+    pool.close()
+    assert all(memory.vector_store.closed for memory in memories)
+    assert http_client.is_closed
+    assert pool.stats()["memories"] == 0 and pool.config_of(memories[0]) is None
+    # The pool is usable again after close()
+    assert pool.get(config("a")) is not memories[0]
+    pool.close()
@@ -0,0 +1,129 @@
+"""Tests for the scope-invalidated Mem0 search cache."""
+
+import asyncio
+
+from mem0_retrieval_cache import AsyncCachedMemory, CachedMemory, RetrievalCache, cached_memory
+
+
+class FakeMemory:
+    """Stand-in Memory: memories are (id, user_id, agent_id, run_id, text) rows."""
+
+    def __init__(self):
+        self.rows = []
+        self.searches = 0
+
+    def _matches(self, row, scope):
+        return all(value is None or row[key] == value for key, value in scope.items())
+
+    def search(self, query, filters=None, **kwargs):
+        self.searches += 1
+        scope = {key: (filters or {}).get(key, kwargs.get(key)) for key in ("user_id", "agent_id", "run_id")}
+        return {"results": [row["memory"] for row in self.rows if self._matches(row, scope)]}
+
+    def add(self, messages, user_id=None, agent_id=None, run_id=None, **kwargs):
+        self.rows.append({"id": str(len(self.rows)), "memory": messages,
+                          "user_id": user_id, "agent_id": agent_id, "run_id": run_id})
+
+    def get(self, memory_id):
+        return next((dict(row) for row in self.rows if row["id"] == memory_id), None)
+
+    def delete(self, memory_id):
+        self.rows = [row for row in self.rows if row["id"] != memory_id]
+
+    def delete_all(self, user_id=None, agent_id=None, run_id=None):
+        scope = {"user_id": user_id, "agent_id": agent_id, "run_id": run_id}
+        self.rows = [row for row in self.rows if not self._matches(row, scope)]
+
+
+class FakeAsyncMemory(FakeMemory):
+    async def search(self, query, **kwargs):
+        return FakeMemory.search(self, query, **kwargs)
+
+    async def add(self, messages, **kwargs):
+        return FakeMemory.add(self, messages, **kwargs)
+
+    async def get(self, memory_id):
+        return FakeMemory.get(self, memory_id)
+
+    async def delete_all(self, **kwargs):
+        return FakeMemory.delete_all(self, **kwargs)
+
+
+def test_repeated_search_is_served_from_cache():
+    inner = FakeMemory()
+    memory = CachedMemory(inner)
+    inner.add("likes trains", user_id="alice")
+
+    assert memory.search("Travel preferences?", filters={"user_id": "alice"}) == {"results": ["likes trains"]}
+    assert memory.search("travel preferences", filters={"user_id": "alice"}) == {"results": ["likes trains"]}
+    assert inner.searches == 1
+
+
+def test_user_write_invalidates_agent_scoped_searches():
+    inner = FakeMemory()
+    memory = CachedMemory(inner)
+    memory.search("plans", filters={"agent_id": "planner"})
+    memory.search("plans", filters={"user_id": "bob"})
+
+    memory.add("books hotels early", user_id="alice", agent_id="planner")
+    assert memory.search("plans", filters={"agent_id": "planner"}) == {"results": ["books hotels early"]}
+    # Bob's searches cannot contain alice's memories and stay cached
+    memory.search("plans", filters={"user_id": "bob"})
+    assert inner.searches == 3
+
+
+def test_agent_scoped_delete_all_keeps_unrelated_scopes():
+    inner = FakeMemory()
+    memory = CachedMemory(inner)
+    memory.add("a", user_id="alice", agent_id="planner")
+    memory.add("b", user_id="bob", agent_id="booker")
+    memory.search("q", filters={"user_id": "alice"})
+    memory.search("q", filters={"user_id": "bob", "agent_id": "booker"})
+
+    memory.delete_all(agent_id="planner")
+    assert memory.search("q", filters={"user_id": "alice"}) == {"results": []}
+    memory.search("q", filters={"user_id": "bob", "agent_id": "booker"})
+    assert inner.searches == 3
+
+
+def test_delete_invalidates_the_owner_scope():
+    inner = FakeMemory()
+    memory = CachedMemory(inner)
+    memory.add("a", user_id="alice", run_id="trip-1")
+    memory.search("q", filters={"run_id": "trip-1"})
+
+    memory.delete("0")
+    assert memory.search("q", filters={"run_id": "trip-1"}) == {"results": []}
+
+
+def test_search_overlapping_a_concurrent_write_is_not_stored():
+    cache = RetrievalCache()
+    key = ("alice", None, None, "q", "{}")
+    token = cache.begin()
+    cache.invalidate((None, "planner", None))
+    cache.store(key, {"results": []}, token)
+    assert cache.lookup(key) == (False, None)
+    assert cache.stats()["stale_skips"] == 1
+
+    token = cache.begin()
+    cache.invalidate(("bob", None, None))
+    cache.store(key, {"results": []}, token)
+    assert cache.lookup(key) == (True, {"results": []})
+
+
+def test_async_memory_is_cached_and_invalidated():
+    inner = FakeAsyncMemory()
+    memory = cached_memory(inner)
+    assert isinstance(memory, AsyncCachedMemory)
+
+    async def main():
+        await memory.add("likes trains", user_id="alice")
+        first = await memory.search("q", filters={"user_id": "alice"})
+        await memory.search("q", filters={"user_id": "alice"})
+        await memory.add("hates red-eyes", user_id="alice", run_id="trip-1")
+        return first, await memory.search("q", filters={"user_id": "alice"})
+
+    first, second = asyncio.run(main())
+    assert first == {"results": ["likes trains"]}
+    assert second == {"results": ["likes trains", "hates red-eyes"]}
+    assert inner.searches == 2
@@ -0,0 +1,119 @@
+"""Tests for the in-process NumPy vector store behind get_mem0_config_local()."""
+
+import numpy as np
+import pytest
+
+from mem0_vector_store import LocalVectorStore
+
+DIMS = 64
+
+
+def clustered_vectors(n: int, rng: np.random.Generator, topics: int = 40) -> np.ndarray:
+    centers = rng.standard_normal((topics, DIMS)).astype(np.float32)
+    return centers[rng.integers(0, topics, n)] + 0.6 * rng.standard_normal((n, DIMS)).astype(np.float32)
+
+
+def cosine(vectors: np.ndarray, query: np.ndarray) -> np.ndarray:
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True) @ (query / np.linalg.norm(query))
+
+
+def brute_force(vectors: np.ndarray, query: np.ndarray, k: int) -> list:
+    return [str(i) for i in np.argsort(-cosine(vectors, query))[:k]]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LocalVectorStore(path=str(tmp_path), embedding_model_dims=DIMS)
+    yield store
+    store.close()
+
+
+def reopen(store: LocalVectorStore, **options) -> LocalVectorStore:
+    store.close()
+    return LocalVectorStore(store.collection_name, store.path, DIMS, **options)
+
+
+def test_exact_search_matches_brute_force(store):
+    rng = np.random.default_rng(0)
+    vectors = clustered_vectors(500, rng)
+    store.insert(vectors, ids=[str(i) for i in range(len(vectors))])
+
+    for query in vectors[:20] + 0.3 * rng.standard_normal((20, DIMS)):
+        results = store.search("", query, top_k=5)
+        assert [r.id for r in results] == brute_force(vectors, query, 5)
+        expected = cosine(vectors, query)[[int(r.id) for r in results]]
+        np.testing.assert_allclose([r.score for r in results], expected, atol=1e-5)
+
+
+def test_ivf_recall_against_brute_force(tmp_path):
+    rng = np.random.default_rng(1)
+    vectors = clustered_vectors(4000, rng)
+    store = LocalVectorStore(path=str(tmp_path), embedding_model_dims=DIMS, ann_threshold=1000, nprobe=16)
+    store.insert(vectors, ids=[str(i) for i in range(len(vectors))])
+    assert store.col_info()["ivf_lists"] > 0
+
+    queries = vectors[rng.integers(0, len(vectors), 50)] + 0.3 * rng.standard_normal((50, DIMS))
+    found = [len({r.id for r in store.search("", q, top_k=10)} & set(brute_force(vectors, q, 10)))
+             for q in queries]
+    assert sum(found) / (10 * len(queries)) >= 0.9
+
+    # The trained index is reused after a reload
+    store = reopen(store, ann_threshold=1000, nprobe=16)
+    assert store.col_info()["ivf_lists"] > 0
+    reloaded = [len({r.id for r in store.search("", q, top_k=10)} & set(brute_force(vectors, q, 10)))
+                for q in queries]
+    assert reloaded == found
+    store.close()
+
+
+def test_delete_and_update_survive_reload(store):
+    rng = np.random.default_rng(2)
+    vectors = rng.standard_normal((3, DIMS)).astype(np.float32)
+    store.insert(vectors, [{"user_id": "alice", "data": f"memory {i}"} for i in range(3)], ["a", "b", "c"])
+
+    store.delete("a")
+    store.update("b", payload={"user_id": "bob", "data": "moved"})
+    store.update("c", vector=vectors[0].tolist())
+
+    store = reopen(store)
+    assert store.get("a") is None
+    assert store.get("b").payload == {"user_id": "bob", "data": "moved"}
+    assert store.get("c").payload == {"user_id": "alice", "data": "memory 2"}
+    assert store.col_info()["count"] == 2
+
+    assert [r.id for r in store.search("", vectors[0], top_k=3)][0] == "c"
+    assert "a" not in {r.id for r in store.search("", vectors[0], top_k=3)}
+    assert [r.id for r in store.search("", vectors[1], top_k=3, filters={"user_id": "alice"})] == ["c"]
+    assert [r.id for r in store.search("", vectors[1], top_k=3, filters={"user_id": "bob"})] == ["b"]
+    store.close()
+
+
+def test_filter_semantics(store):
+    rng = np.random.default_rng(3)
+    payloads = [
+        {"user_id": "alice", "agent_id": "scout", "category": "desks", "price": 100},
+        {"user_id": "alice", "agent_id": "scout", "category": "chairs", "price": 250},
+        {"user_id": "alice", "agent_id": "writer", "category": "desks", "price": 400},
+        {"user_id": "bob", "agent_id": "scout", "category": "desks", "price": 150},
+        {"user_id": "alice", "category": "lamps"},
+    ]
+    store.insert(rng.standard_normal((len(payloads), DIMS)), payloads, [str(i) for i in range(len(payloads))])
+    query = rng.standard_normal(DIMS)
+
+    def ids(filters):
+        return sorted(r.id for r in store.search("", query, top_k=10, filters=filters))
+
+    assert ids({"user_id": "alice"}) == ["0", "1", "2", "4"]
+    assert ids({"user_id": "alice", "agent_id": "scout"}) == ["0", "1"]
+    assert ids({"user_id": "carol"}) == []
+    assert ids({"category": "desks"}) == ["0", "2", "3"]
+    assert ids({"category": ["chairs", "lamps"]}) == ["1", "4"]
+    assert ids({"user_id": ["bob"], "category": "desks"}) == ["3"]
+    assert ids({"price": {"gte": 150, "lt": 400}}) == ["1", "3"]
+    assert ids({"price": {"ne": 100}}) == ["1", "2", "3"]
+    assert ids({"agent_id": {"in": ["writer"]}}) == ["2"]
+    # A key missing from the payload never matches
+    assert ids({"user_id": "alice", "price": {"gt": 0}}) == ["0", "1", "2"]
+
+    assert sorted(r.id for r in store.list(filters={"user_id": "alice", "category": "desks"})[0]) == ["0", "2"]
+    assert len(store.search("", query, top_k=2, filters={"user_id": "alice"})) == 2
@@ -0,0 +1,184 @@
+"""Tests for the Mem0 write-behind queue."""
+
+import asyncio
+
+import mem0_write_behind
+from mem0_write_behind import MemoryWriteBehind
+
+
+class AsyncMemory:
+    """Records each add call; optional delay per user and a number of failures to raise first."""
+
+    def __init__(self, delay=0.0, failures=0):
+        self.calls = []
+        self.delay = delay
+        self.failures = failures
+        self.running = {}
+        self.overlapped = set()
+
+    async def add(self, messages, **kwargs):
+        user = kwargs.get("user_id")
+        if self.running.get(user):
+            self.overlapped.add(user)
+        self.running[user] = self.running.get(user, 0) + 1
+        try:
+            await asyncio.sleep(self.delay)
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("mem0 unavailable")
+            self.calls.append((user, [m["content"] for m in messages]))
+        finally:
+            self.running[user] -= 1
+
+
+class SyncMemory:
+    def __init__(self):
+        self.calls = []
+
+    def add(self, messages, **kwargs):
+        self.calls.append((kwargs.get("user_id"), [m["content"] for m in messages]))
+
+
+def test_groups_flush_at_max_batch_or_flush_interval():
+    async def scenario():
+        memory = AsyncMemory()
+        writer = MemoryWriteBehind(memory, max_batch=3, flush_interval=0.2)
+        for i in range(3):
+            await writer.add(f"alice {i}", user_id="alice")
+        await writer.add("bob 0", user_id="bob")
+        await asyncio.sleep(0.05)
+        # alice's group is full, bob's is still waiting for the interval
+        assert memory.calls == [("alice", ["alice 0", "alice 1", "alice 2"])]
+        await asyncio.sleep(0.3)
+        assert memory.calls[-1] == ("bob", ["bob 0"])
+        await writer.close()
+
+    asyncio.run(scenario())
+
+
+def test_identical_pending_writes_are_deduplicated():
+    async def scenario():
+        memory = AsyncMemory()
+        writer = MemoryWriteBehind(memory, flush_interval=10)
+        assert await writer.add("likes aisle seats", user_id="alice")
+        assert not await writer.add("likes aisle seats", user_id="alice")
+        # Same text for another user or with other metadata is a different write
+        assert await writer.add("likes aisle seats", user_id="bob")
+        assert await writer.add("likes aisle seats", user_id="alice", metadata={"source": "chat"})
+        await writer.close()
+        assert writer.stats()["deduplicated"] == 1
+        assert sorted(user for user, _ in memory.calls) == ["alice", "alice", "bob"]
+
+    asyncio.run(scenario())
+
+
+def test_add_waits_for_room_when_the_queue_is_full():
+    async def scenario():
+        memory = AsyncMemory(delay=0.05)
+        writer = MemoryWriteBehind(memory, max_pending=2, max_batch=1, flush_interval=0)
+        for i in range(6):
+            await writer.add(f"note {i}", user_id=f"user {i}")
+            assert writer.stats()["queue_depth"] <= 2
+        await writer.close()
+        stats = writer.stats()
+        assert stats["backpressure_waits"] > 0 and stats["max_queue_depth"] == 2
+        assert stats["flushed_writes"] == 6 and len(memory.calls) == 6
+
+    asyncio.run(scenario())
+
+
+def test_flush_and_close_drain_everything():
+    async def scenario():
+        memory = AsyncMemory(delay=0.01)
+        writer = MemoryWriteBehind(memory, max_batch=4, flush_interval=10)
+        for i in range(10):
+            await writer.add(f"alice {i}", user_id="alice")
+        await writer.flush()
+        # Split into max_batch-sized calls, in queue order
+        assert [len(messages) for _, messages in memory.calls] == [4, 4, 2]
+        assert writer.stats()["queue_depth"] == 0
+
+        await writer.add("bob 0", user_id="bob")
+        await writer.close()
+        assert memory.calls[-1] == ("bob", ["bob 0"])
+        assert writer.stats()["queue_depth"] == 0 and writer.stats()["inflight_batches"] == 0
+        try:
+            await writer.add("too late", user_id="bob")
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("add() after close() should fail")
+
+    asyncio.run(scenario())
+
+
+def test_failed_flushes_are_retried_then_counted(monkeypatch):
+    async def scenario():
+        memory = AsyncMemory(failures=1)
+        writer = MemoryWriteBehind(memory, max_retries=2)
+        await writer.add("recovers", user_id="alice")
+        await writer.flush()
+        assert memory.calls == [("alice", ["recovers"])]
+        assert writer.stats()["retries"] == 1 and writer.stats()["failed_writes"] == 0
+
+        memory.failures = 10
+        await writer.add("lost", user_id="alice")
+        await writer.add("also lost", user_id="alice")
+        await writer.close()
+        stats = writer.stats()
+        assert stats["retries"] == 3 and stats["failed_writes"] == 2 and stats["queue_depth"] == 0
+
+    # No retry backoff
+    real_sleep = asyncio.sleep
+    monkeypatch.setattr(asyncio, "sleep", lambda seconds: real_sleep(0))
+    asyncio.run(scenario())
+
+
+def test_one_users_flushes_never_overlap_and_keep_queue_order():
+    async def scenario():
+        memory = AsyncMemory(delay=0.03)
+        writer = MemoryWriteBehind(memory, max_batch=2, flush_interval=0, max_concurrent_flushes=4)
+        for i in range(7):
+            await writer.add(f"alice {i}", user_id="alice")
+            await writer.add(f"bob {i}", user_id="bob")
+            # New writes arrive while earlier alice flushes are still running
+            await asyncio.sleep(0.01)
+        await writer.close()
+
+        assert memory.overlapped == set()
+        for user in ("alice", "bob"):
+            written = [text for who, messages in memory.calls if who == user for text in messages]
+            assert written == [f"{user} {i}" for i in range(7)]
+
+    asyncio.run(scenario())
+
+
+def test_different_users_flush_in_parallel():
+    async def scenario():
+        memory = AsyncMemory(delay=0.1)
+        writer = MemoryWriteBehind(memory, flush_interval=0, max_concurrent_flushes=4)
+        for user in ("alice", "bob", "carol", "dave"):
+            await writer.add("hello", user_id=user)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await writer.close()
+        assert loop.time() - started < 0.3
+
+    asyncio.run(scenario())
+
+
+def test_exit_writes_sync_leftovers_and_reports_async_ones(capsys):
+    async def enqueue(writer):
+        await writer.add("kept", user_id="alice")
+
+    sync_memory = SyncMemory()
+    sync_writer = MemoryWriteBehind(sync_memory, flush_interval=60)
+    asyncio.run(enqueue(sync_writer))
+    async_writer = MemoryWriteBehind(AsyncMemory(), flush_interval=60)
+    asyncio.run(enqueue(async_writer))
+
+    mem0_write_behind._flush_on_exit()
+    assert sync_memory.calls == [("alice", ["kept"])]
+    assert sync_writer.stats()["queue_depth"] == 0
+    assert async_writer.stats()["failed_writes"] == 1
+    assert "dropped 1 queued write(s)" in capsys.readouterr().out
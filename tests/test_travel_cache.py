@@ -0,0 +1,176 @@
+"""Tests for the travel MCP server's tool response cache."""
+
+import asyncio
+
+import pytest
+
+import travel_cache
+from travel_cache import ToolCache, canonical_date
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(travel_cache.time, "monotonic", clock)
+    return clock
+
+
+def counting(cache: ToolCache, ttl: float = 60, **options):
+    calls = []
+
+    @cache.cached(ttl=ttl, **options)
+    def lookup(city: str, day: str = "2026-11-01"):
+        calls.append((city, day))
+        return {"city": city, "day": day, "call": len(calls)}
+
+    return lookup, calls
+
+
+def test_hit_returns_cached_value():
+    cache = ToolCache()
+    lookup, calls = counting(cache)
+
+    first = lookup("Paris")
+    assert lookup("Paris") is first
+    assert lookup("Paris", day="2026-11-01") is first
+    assert len(calls) == 1
+    assert cache.stats()["tools"]["lookup"]["hits"] == 2
+    assert cache.stats()["tools"]["lookup"]["misses"] == 1
+
+
+def test_normalized_arguments_share_a_key():
+    cache = ToolCache()
+    lookup, calls = counting(cache, normalize={"city": str.lower, "day": canonical_date})
+
+    lookup("Paris", day="2026-11-01")
+    lookup("PARIS", day=" 2026-11-01 ")
+    assert len(calls) == 1
+    lookup("London", day="2026-11-01")
+    assert len(calls) == 2
+
+
+def test_ignored_arguments_are_left_out_of_the_key():
+    cache = ToolCache()
+    calls = []
+
+    @cache.cached(ttl=60, ignore=("ctx",))
+    def lookup(city: str, ctx=None):
+        calls.append(ctx)
+        return city
+
+    lookup("Paris", ctx=object())
+    lookup("Paris", ctx=object())
+    assert len(calls) == 1
+
+
+def test_entry_expires_after_ttl(clock):
+    cache = ToolCache()
+    lookup, calls = counting(cache, ttl=30)
+
+    lookup("Paris")
+    clock.now += 29.9
+    lookup("Paris")
+    assert len(calls) == 1
+
+    clock.now += 0.1
+    assert lookup("Paris")["call"] == 2
+    assert cache.stats()["tools"]["lookup"]["expirations"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ToolCache(max_entries=2)
+    lookup, calls = counting(cache)
+
+    lookup("Paris")
+    lookup("London")
+    lookup("Paris")  # London is now the least recently used
+    lookup("Tokyo")
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["tools"]["lookup"]["evictions"] == 1
+
+    lookup("Paris")
+    assert len(calls) == 3
+    lookup("London")
+    assert len(calls) == 4
+
+
+def test_concurrent_misses_are_coalesced():
+    cache = ToolCache()
+    calls = []
+
+    @cache.cached(ttl=60)
+    async def lookup(city: str):
+        calls.append(city)
+        await asyncio.sleep(0.05)
+        return {"city": city}
+
+    async def main():
+        return await asyncio.gather(*(lookup("Paris") for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert calls == ["Paris"]
+    assert all(result is results[0] for result in results)
+    stats = cache.stats()["tools"]["lookup"]
+    assert (stats["misses"], stats["coalesced"]) == (1, 4)
+
+
+def test_exception_reaches_every_waiter_and_is_not_cached():
+    cache = ToolCache()
+    calls = []
+
+    @cache.cached(ttl=60)
+    async def lookup(city: str):
+        calls.append(city)
+        await asyncio.sleep(0.05)
+        if len(calls) == 1:
+            raise ValueError("upstream failed")
+        return city
+
+    async def main():
+        return await asyncio.gather(*(lookup("Paris") for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert all(isinstance(result, ValueError) for result in results)
+    assert cache.stats()["entries"] == 0
+
+    assert asyncio.run(lookup("Paris")) == "Paris"
+    assert len(calls) == 2
+
+
+def test_sync_exception_propagates_and_is_not_cached():
+    cache = ToolCache()
+    calls = []
+
+    @cache.cached(ttl=60)
+    def lookup(city: str):
+        calls.append(city)
+        raise ValueError(city)
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            lookup("Paris")
+    assert len(calls) == 2
+
+
+def test_bypass_argument_skips_the_cache():
+    cache = ToolCache()
+    calls = []
+
+    @cache.cached(ttl=60, bypass=("stream",))
+    async def lookup(city: str, stream: bool = False):
+        calls.append(stream)
+        return city
+
+    for stream in (False, False, True, True):
+        asyncio.run(lookup("Paris", stream=stream))
+    assert calls == [False, True, True]
+    assert cache.stats()["tools"]["lookup"]["misses"] == 1
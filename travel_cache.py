@@ -0,0 +1,203 @@
+"""
+Tool Response Cache
+TTL/LRU cache with single-flight de-duplication for the travel MCP server tools
+"""
+
+import asyncio
+import functools
+import inspect
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import date
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+STAT_NAMES = ("hits", "misses", "coalesced", "evictions", "expirations")
+
+
+def canonical_date(value: str) -> str:
+    """Canonical YYYY-MM-DD form of a date argument (left as-is if it doesn't parse)."""
+    try:
+        return date.fromisoformat(value.strip()).isoformat()
+    except (AttributeError, ValueError):
+        return value
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+class ToolCache:
+    """
+    Bounded LRU cache shared by every cached tool, with a per-tool TTL.
+
+    Keys are (tool name, normalized arguments). When several callers miss on
+    the same key at once, only the first computes the result and the others
+    wait for it (single-flight), so a burst of identical agent questions
+    costs one computation.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Tuple, Future] = {}
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, tool: str, stat: str) -> None:
+        counters = self._stats.setdefault(tool, dict.fromkeys(STAT_NAMES, 0))
+        counters[stat] += 1
+
+    def _lookup(self, key: Tuple) -> Tuple[bool, Any]:
+        """Return (found, value); caller must hold the lock."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self._count(key[0], "expirations")
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _store(self, key: Tuple, value: Any, ttl: float) -> None:
+        """Insert a value and evict least-recently-used entries; caller must hold the lock."""
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._count(evicted[0], "evictions")
+
+    def _begin(self, key: Tuple) -> Tuple[bool, Any, Optional[Future], bool]:
+        """
+        Look up a key and register as the leader on a miss.
+
+        Returns:
+            Tuple of (hit, value, in-flight future, is_leader)
+        """
+        with self._lock:
+            hit, value = self._lookup(key)
+            if hit:
+                self._count(key[0], "hits")
+                return True, value, None, False
+            future = self._inflight.get(key)
+            if future is not None:
+                self._count(key[0], "coalesced")
+                return False, None, future, False
+            future = Future()
+            self._inflight[key] = future
+            self._count(key[0], "misses")
+            return False, None, future, True
+
+    def _finish(self, key: Tuple, future: Future, ttl: float, value: Any = None,
+                error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            if error is None:
+                self._store(key, value, ttl)
+            del self._inflight[key]
+        if error is None:
+            future.set_result(value)
+        else:
+            future.set_exception(error)
+
+    def cached(self, ttl: float, normalize: Optional[Dict[str, Callable[[Any], Any]]] = None,
+               ignore: Tuple[str, ...] = (), bypass: Tuple[str, ...] = ()):
+        """
+        Decorator caching a tool function's result for ttl seconds.
+
+        Works with both sync and async functions and preserves the signature,
+        so it can sit directly underneath @mcp.tool().
+
+        Args:
+            ttl: Seconds a result stays fresh
+            normalize: Optional per-argument functions producing canonical key values
+                (e.g., {"origin": canonical_city, "departure_date": canonical_date})
+            ignore: Arguments left out of the key (e.g., an injected MCP Context)
+            bypass: Arguments that skip the cache when truthy, for calls with side
+                effects every caller must see (e.g., a stream flag sending notifications)
+        """
+        normalize = normalize or {}
+
+        def decorator(fn: Callable) -> Callable:
+            signature = inspect.signature(fn)
+            name = fn.__name__
+
+            def make_key(args, kwargs) -> Optional[Tuple]:
+                """Cache key of a call, or None if it bypasses the cache."""
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                if any(bound.arguments.get(param) for param in bypass):
+                    return None
+                return (name,) + tuple(
+                    (param, _freeze(normalize[param](value) if param in normalize else value))
+                    for param, value in bound.arguments.items()
+                    if param not in ignore
+                )
+
+            if inspect.iscoroutinefunction(fn):
+                @functools.wraps(fn)
+                async def async_wrapper(*args, **kwargs):
+                    key = make_key(args, kwargs)
+                    if key is None:
+                        return await fn(*args, **kwargs)
+                    hit, value, future, leader = self._begin(key)
+                    if hit:
+                        return value
+                    if not leader:
+                        return await asyncio.wrap_future(future)
+                    try:
+                        value = await fn(*args, **kwargs)
+                    except BaseException as e:
+                        self._finish(key, future, ttl, error=e)
+                        raise
+                    self._finish(key, future, ttl, value)
+                    return value
+
+                return async_wrapper
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                key = make_key(args, kwargs)
+                if key is None:
+                    return fn(*args, **kwargs)
+                hit, value, future, leader = self._begin(key)
+                if hit:
+                    return value
+                if not leader:
+                    return future.result()
+                try:
+                    value = fn(*args, **kwargs)
+                except BaseException as e:
+                    self._finish(key, future, ttl, error=e)
+                    raise
+                self._finish(key, future, ttl, value)
+                return value
+
+            return wrapper
+
+        return decorator
+
+    def clear(self) -> None:
+        """Drop every cached entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache size plus hit/miss/eviction counters per tool."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "tools": {tool: dict(counters) for tool, counters in self._stats.items()},
+            }
+
+
+# Shared cache for the travel MCP server tools
+tool_cache = ToolCache(max_entries=int(os.getenv("TOOL_CACHE_MAX_ENTRIES", "1024")))
@@ -0,0 +1,90 @@
+"""
+Travel City Reference Data
+Shared city table used by the travel MCP server inventories
+"""
+
+import math
+from typing import Dict, List, Tuple
+
+# (code, display name, aliases, latitude, longitude)
+CITIES: List[Tuple[str, str, Tuple[str, ...], float, float]] = [
+    ("NYC", "New York", ("JFK", "EWR", "LGA", "New York City"), 40.71, -74.01),
+    ("LAX", "Los Angeles", ("LA",), 34.05, -118.24),
+    ("CHI", "Chicago", ("ORD", "MDW"), 41.88, -87.63),
+    ("SFO", "San Francisco", ("SF",), 37.77, -122.42),
+    ("MIA", "Miami", (), 25.76, -80.19),
+    ("SEA", "Seattle", (), 47.61, -122.33),
+    ("ATL", "Atlanta", (), 33.75, -84.39),
+    ("BOS", "Boston", (), 42.36, -71.06),
+    ("YTO", "Toronto", ("YYZ",), 43.65, -79.38),
+    ("MEX", "Mexico City", (), 19.43, -99.13),
+    ("LON", "London", ("LHR", "LGW", "STN"), 51.51, -0.13),
+    ("PAR", "Paris", ("CDG", "ORY"), 48.86, 2.35),
+    ("FRA", "Frankfurt", (), 50.11, 8.68),
+    ("AMS", "Amsterdam", (), 52.37, 4.90),
+    ("MAD", "Madrid", (), 40.42, -3.70),
+    ("ROM", "Rome", ("FCO",), 41.90, 12.50),
+    ("DXB", "Dubai", (), 25.20, 55.27),
+    ("DEL", "Delhi", ("New Delhi",), 28.61, 77.21),
+    ("SIN", "Singapore", (), 1.35, 103.82),
+    ("HKG", "Hong Kong", (), 22.32, 114.17),
+    ("TYO", "Tokyo", ("NRT", "HND"), 35.68, 139.69),
+    ("SEL", "Seoul", ("ICN",), 37.57, 126.98),
+    ("SYD", "Sydney", (), -33.87, 151.21),
+    ("SAO", "Sao Paulo", ("GRU", "São Paulo"), -23.55, -46.63),
+]
+
+CITY_NAMES: List[str] = [name for _, name, _, _, _ in CITIES]
+
+# Case-folded lookup of every code, name and alias to its city index
+_CITY_LOOKUP: Dict[str, int] = {}
+for _index, (_code, _name, _aliases, _, _) in enumerate(CITIES):
+    for _key in (_code, _name, *_aliases):
+        _CITY_LOOKUP[_key.casefold()] = _index
+
+
+def normalize_city(city: str) -> str:
+    """Normalize free-form city input for lookups and cache keys."""
+    return " ".join(city.split()).casefold()
+
+
+def resolve_city(city: str) -> int:
+    """
+    Resolve a city name, city code or airport code to its city index.
+
+    Args:
+        city: City name or code (e.g., "New York", "NYC", "JFK")
+
+    Returns:
+        Index into CITIES
+
+    Raises:
+        ValueError: If the city is not known to the server
+    """
+    index = _CITY_LOOKUP.get(normalize_city(city))
+    if index is None:
+        raise ValueError(
+            f"Unknown city '{city}'. Supported cities: {', '.join(CITY_NAMES)}"
+        )
+    return index
+
+
+def canonical_city(city: str) -> str:
+    """
+    Canonical city code for cache keys, so "new york", "NYC" and "JFK" match.
+
+    Unknown cities fall back to their normalized text rather than raising.
+    """
+    index = _CITY_LOOKUP.get(normalize_city(city))
+    return CITIES[index][0] if index is not None else normalize_city(city)
+
+
+def great_circle_km(a: int, b: int) -> float:
+    """Great-circle distance in kilometres between two city indexes."""
+    _, _, _, lat1, lon1 = CITIES[a]
+    _, _, _, lat2, lon2 = CITIES[b]
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    h = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * 6371.0 * math.asin(math.sqrt(h))
@@ -0,0 +1,275 @@
+"""
+Flight Inventory Engine
+Array-backed flight table with an (origin, destination, date) index for the travel MCP server
+"""
+
+import os
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from travel_cities import CITIES, CITY_NAMES, resolve_city
+
+# (IATA code, airline name)
+AIRLINES = [
+    ("DL", "Delta"),
+    ("UA", "United"),
+    ("AA", "American"),
+    ("BA", "British Airways"),
+    ("LH", "Lufthansa"),
+    ("AF", "Air France"),
+    ("EK", "Emirates"),
+    ("SQ", "Singapore Airlines"),
+]
+
+MINUTES_PER_DAY = 24 * 60
+
+FLIGHT_FIELDS = ("flight_number", "airline", "departure", "arrival", "departure_time",
+                 "arrival_time", "price", "currency", "available_seats")
+
+# Object arrays so a column of indexes maps to a column of strings in one take()
+_AIRLINE_CODES = np.array([code for code, _ in AIRLINES], dtype=object)
+_AIRLINE_NAMES = np.array([name for _, name in AIRLINES], dtype=object)
+_CITY_NAMES = np.array(CITY_NAMES, dtype=object)
+
+
+def distance_matrix_km() -> np.ndarray:
+    """Great-circle distances between every pair of cities (vectorized haversine)."""
+    return haversine_matrix_km(np.array([c[3] for c in CITIES]), np.array([c[4] for c in CITIES]))
+
+
+def haversine_matrix_km(latitude: np.ndarray, longitude: np.ndarray) -> np.ndarray:
+    """Great-circle distances between every pair of points given in degrees."""
+    lat = np.radians(latitude)
+    lon = np.radians(longitude)
+    dphi = lat[None, :] - lat[:, None]
+    dlmb = lon[None, :] - lon[:, None]
+    h = np.sin(dphi / 2) ** 2 + np.cos(lat[:, None]) * np.cos(lat[None, :]) * np.sin(dlmb / 2) ** 2
+    return 2 * 6371.0 * np.arcsin(np.sqrt(h))
+
+
+class FlightInventory:
+    """
+    Columnar flight table sorted by a composite (origin, destination, day, departure) key.
+
+    Every column is a NumPy array aligned to the sorted key, so a lookup is two
+    binary searches on the key followed by a contiguous slice - O(log n) no matter
+    how large the table grows.
+    """
+
+    COLUMNS = ("origin", "destination", "day", "dep_minute", "duration",
+               "price", "seats", "airline", "number")
+
+    def __init__(self, start_date: date, days: int, columns: Dict[str, np.ndarray],
+                 n_cities: Optional[int] = None):
+        self.start_date = start_date
+        self.days = days
+        # Airports are indexes into CITIES unless a (synthetic) network size is given
+        self.n_cities = n_cities or len(CITIES)
+
+        key = self._compose_key(columns["origin"], columns["destination"],
+                                columns["day"], columns["dep_minute"])
+        order = np.argsort(key, kind="stable")
+        self.key = key[order]
+        for name in self.COLUMNS:
+            setattr(self, name, np.ascontiguousarray(columns[name][order]))
+
+    def __len__(self) -> int:
+        return len(self.key)
+
+    def _compose_key(self, origin, destination, day, dep_minute) -> np.ndarray:
+        route = origin.astype(np.int64) * self.n_cities + destination
+        return (route * self.days + day) * MINUTES_PER_DAY + dep_minute
+
+    @classmethod
+    def generate(
+        cls,
+        n_rows: int,
+        seed: int = 42,
+        start_date: Optional[date] = None,
+        days: int = 730
+    ) -> "FlightInventory":
+        """
+        Generate a reproducible synthetic flight table.
+
+        Rows are spread over every (route, day) slot so that, once n_rows exceeds
+        the number of slots, each route has flights on every day of the horizon.
+
+        Args:
+            n_rows: Number of flights to generate
+            seed: Random seed (same seed, same table)
+            start_date: First day of the schedule horizon (default: today)
+            days: Number of days in the horizon
+        """
+        start_date = start_date or date.today()
+        rng = np.random.default_rng(seed)
+        n_cities = len(CITIES)
+
+        route_origin, route_destination = np.nonzero(~np.eye(n_cities, dtype=bool))
+        n_routes = len(route_origin)
+        n_slots = n_routes * days
+        if n_rows <= n_slots:
+            slot = rng.permutation(n_slots)[:n_rows]
+        else:
+            slot = np.arange(n_rows) % n_slots
+        route = slot % n_routes
+        origin = route_origin[route].astype(np.uint8)
+        destination = route_destination[route].astype(np.uint8)
+
+        distance = distance_matrix_km()[origin, destination]
+        duration = distance / 820.0 * 60 + 40
+        duration *= rng.uniform(0.95, 1.15, n_rows)
+        price = (60 + 0.11 * distance) * rng.lognormal(0.0, 0.25, n_rows)
+
+        columns = {
+            "origin": origin,
+            "destination": destination,
+            "day": (slot // n_routes % days).astype(np.uint16),
+            "dep_minute": (rng.integers(6 * 4, 22 * 4, n_rows) * 15).astype(np.uint16),
+            "duration": duration.astype(np.uint16),
+            "price": np.round(price, 2).astype(np.float32),
+            "seats": rng.integers(0, 60, n_rows).astype(np.uint16),
+            "airline": rng.integers(0, len(AIRLINES), n_rows).astype(np.uint8),
+            "number": rng.integers(100, 10000, n_rows).astype(np.uint16),
+        }
+        return cls(start_date, days, columns)
+
+    @classmethod
+    def load(cls, path: str) -> "FlightInventory":
+        """Load a table previously written with save()."""
+        with np.load(path) as data:
+            if int(data["n_cities"]) != len(CITIES):
+                raise ValueError(f"{path} was built for a different city table")
+            columns = {name: data[name] for name in cls.COLUMNS}
+            start_date = date.fromordinal(int(data["start_ordinal"]))
+            return cls(start_date, int(data["days"]), columns)
+
+    def save(self, path: str) -> None:
+        """Persist the table as a NumPy .npz archive."""
+        np.savez(
+            path,
+            n_cities=self.n_cities,
+            start_ordinal=self.start_date.toordinal(),
+            days=self.days,
+            **{name: getattr(self, name) for name in self.COLUMNS},
+        )
+
+    def day_index(self, departure_date: str) -> Optional[int]:
+        """Day offset of a YYYY-MM-DD date, or None if outside the horizon."""
+        day = (datetime.strptime(departure_date, "%Y-%m-%d").date() - self.start_date).days
+        return day if 0 <= day < self.days else None
+
+    def check_day(self, departure_date: str) -> int:
+        """Day offset of a YYYY-MM-DD date; raises ValueError if it is outside the horizon."""
+        day = self.day_index(departure_date)
+        if day is None:
+            last_date = self.start_date + timedelta(days=self.days - 1)
+            raise ValueError(
+                f"departure_date {departure_date} is outside the flight schedule "
+                f"({self.start_date.isoformat()} to {last_date.isoformat()})"
+            )
+        return day
+
+    def lookup(self, origin: int, destination: int, day: int, passengers: int = 1) -> np.ndarray:
+        """
+        Row positions for one (origin, destination, day) bucket with enough seats.
+
+        Returns:
+            Positions ordered by departure time
+        """
+        lo_key = ((origin * self.n_cities + destination) * self.days + day) * MINUTES_PER_DAY
+        lo, hi = np.searchsorted(self.key, [lo_key, lo_key + MINUTES_PER_DAY])
+        positions = np.arange(lo, hi)
+        return positions[self.seats[lo:hi] >= passengers]
+
+    def search(
+        self,
+        origin: str,
+        destination: str,
+        departure_date: str,
+        passengers: int = 1
+    ) -> np.ndarray:
+        """
+        Resolve city names and dates, then look up matching row positions.
+
+        Raises:
+            ValueError: If departure_date is outside the schedule horizon
+        """
+        if passengers < 1:
+            raise ValueError("passengers must be at least 1")
+        o = resolve_city(origin)
+        d = resolve_city(destination)
+        day = self.check_day(departure_date)
+        if o == d:
+            return np.empty(0, dtype=np.int64)
+        return self.lookup(o, d, day, passengers)
+
+    def rows(self, positions: np.ndarray) -> List[Dict]:
+        """
+        Materialize row positions as JSON-serializable flight dicts.
+
+        Each output column is formatted in one vectorized pass (timestamps via
+        datetime64) and the dicts are zipped together at the end, instead of
+        doing datetime arithmetic per row.
+        """
+        if len(positions) == 0:
+            return []
+        start = np.datetime64(self.start_date, "m")
+        minutes = self.day[positions].astype(np.int64) * MINUTES_PER_DAY + self.dep_minute[positions]
+        dep_time = start + minutes.astype("timedelta64[m]")
+        arr_time = dep_time + self.duration[positions].astype("timedelta64[m]")
+        airline = self.airline[positions]
+
+        columns = (
+            [f"{code}{number}" for code, number in
+             zip(_AIRLINE_CODES[airline].tolist(), self.number[positions].tolist())],
+            _AIRLINE_NAMES[airline].tolist(),
+            _CITY_NAMES[self.origin[positions]].tolist(),
+            _CITY_NAMES[self.destination[positions]].tolist(),
+            _format_minutes(dep_time),
+            _format_minutes(arr_time),
+            np.round(self.price[positions].astype(np.float64), 2).tolist(),
+            ["USD"] * len(positions),
+            self.seats[positions].tolist(),
+        )
+        return [dict(zip(FLIGHT_FIELDS, values)) for values in zip(*columns)]
+
+
+def _format_minutes(timestamps: np.ndarray) -> List[str]:
+    """Format datetime64[m] values as "YYYY-MM-DD HH:MM" strings."""
+    return np.char.replace(np.datetime_as_string(timestamps, unit="m"), "T", " ").tolist()
+
+
+_inventory: Optional[FlightInventory] = None
+_inventory_lock = threading.Lock()
+
+
+def get_flight_inventory() -> FlightInventory:
+    """
+    Get the process-wide flight inventory, building it on first use.
+
+    Configured via environment variables:
+        FLIGHT_INVENTORY_PATH: Load a saved .npz table instead of generating one
+        FLIGHT_INVENTORY_ROWS: Number of generated flights (default: 1000000)
+        FLIGHT_INVENTORY_SEED: Generator seed (default: 42)
+        FLIGHT_INVENTORY_START: First schedule day, YYYY-MM-DD (default: today)
+        FLIGHT_INVENTORY_DAYS: Schedule horizon in days (default: 730)
+    """
+    global _inventory
+    if _inventory is None:
+        with _inventory_lock:
+            if _inventory is None:
+                path = os.getenv("FLIGHT_INVENTORY_PATH")
+                if path:
+                    _inventory = FlightInventory.load(path)
+                else:
+                    start = os.getenv("FLIGHT_INVENTORY_START")
+                    _inventory = FlightInventory.generate(
+                        n_rows=int(os.getenv("FLIGHT_INVENTORY_ROWS", "1000000")),
+                        seed=int(os.getenv("FLIGHT_INVENTORY_SEED", "42")),
+                        start_date=date.fromisoformat(start) if start else None,
+                        days=int(os.getenv("FLIGHT_INVENTORY_DAYS", "730")),
+                    )
+    return _inventory
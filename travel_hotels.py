@@ -0,0 +1,266 @@
+"""
+Hotel Availability Store
+Per-hotel, per-room-type nightly availability calendar for the travel MCP server
+"""
+
+import os
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from travel_cities import CITIES, CITY_NAMES, resolve_city
+
+NAME_PREFIXES = [
+    "Grand Plaza", "Seaside", "Downtown", "Airport", "Riverside", "Royal",
+    "Park View", "Harbor", "Central", "Metropolitan", "Garden", "Skyline",
+    "Heritage", "Lakeside", "Crown", "Boulevard",
+]
+NAME_SUFFIXES = ["Hotel", "Suites", "Inn", "Resort", "Lodge", "Residences"]
+
+# (room type, guest capacity, price multiplier)
+ROOM_TYPES = [
+    ("Standard Room", 2, 1.0),
+    ("Deluxe Room", 3, 1.35),
+    ("Suite", 4, 1.9),
+    ("Executive Suite", 6, 2.6),
+]
+
+AMENITIES = ["WiFi", "Pool", "Gym", "Restaurant", "Spa", "Parking"]
+
+HOTEL_FIELDS = ("hotel_name", "location", "room_type", "price_per_night", "currency",
+                "available_rooms", "amenities")
+
+# Lookup tables so index columns map to output strings in one take()
+_HOTEL_NAMES = np.array([f"{p} {s}" for p in NAME_PREFIXES for s in NAME_SUFFIXES], dtype=object)
+_ROOM_TYPE_NAMES = np.array([t[0] for t in ROOM_TYPES], dtype=object)
+_CITY_NAMES = np.array(CITY_NAMES, dtype=object)
+_AMENITY_LISTS = np.empty(1 << len(AMENITIES), dtype=object)
+_AMENITY_LISTS[:] = [[a for bit, a in enumerate(AMENITIES) if mask & (1 << bit)]
+                     for mask in range(1 << len(AMENITIES))]
+
+
+class HotelCalendar:
+    """
+    Nightly room availability for every (hotel, room type), grouped by city.
+
+    Room-type rows are stored contiguously per city with a CSR-style offset
+    table, and free-room counts live in one night-major uint8 matrix of shape
+    (days, rows). A stay query is then a city column slice, a capacity mask
+    and an element-wise min() over the [check_in, check_out) night window -
+    no per-night Python loops.
+    """
+
+    HOTEL_COLUMNS = ("hotel_city", "hotel_prefix", "hotel_suffix", "hotel_lat",
+                     "hotel_lon", "hotel_amenities")
+    ROOM_COLUMNS = ("hotel", "room_type", "capacity", "price", "free")
+
+    def __init__(self, start_date: date, days: int, columns: Dict[str, np.ndarray]):
+        self.start_date = start_date
+        self.days = days
+
+        # Order hotels by city so every city owns one contiguous block of rows
+        hotel_order = np.argsort(columns["hotel_city"], kind="stable")
+        hotel_rank = np.empty_like(hotel_order)
+        hotel_rank[hotel_order] = np.arange(len(hotel_order))
+        for name in self.HOTEL_COLUMNS:
+            setattr(self, name, np.ascontiguousarray(columns[name][hotel_order]))
+
+        row_hotel = hotel_rank[columns["hotel"]]
+        row_order = np.lexsort((columns["room_type"], row_hotel))
+        self.hotel = row_hotel[row_order].astype(np.int32)
+        for name in self.ROOM_COLUMNS[1:-1]:
+            setattr(self, name, np.ascontiguousarray(columns[name][row_order]))
+        self.free = np.ascontiguousarray(columns["free"][:, row_order])
+
+        row_city = self.hotel_city[self.hotel]
+        self.city_offsets = np.searchsorted(row_city, np.arange(len(CITIES) + 1))
+
+    def __len__(self) -> int:
+        return len(self.hotel_city)
+
+    @property
+    def nbytes(self) -> int:
+        """Total memory held by the calendar arrays."""
+        names = self.HOTEL_COLUMNS + self.ROOM_COLUMNS + ("city_offsets",)
+        return sum(getattr(self, name).nbytes for name in names)
+
+    @classmethod
+    def generate(
+        cls,
+        n_hotels: int,
+        seed: int = 42,
+        start_date: Optional[date] = None,
+        days: int = 730
+    ) -> "HotelCalendar":
+        """
+        Generate a reproducible synthetic hotel calendar.
+
+        Args:
+            n_hotels: Number of hotels (each offers every room type)
+            seed: Random seed (same seed, same calendar)
+            start_date: First night of the availability horizon (default: today)
+            days: Number of nights in the horizon
+        """
+        start_date = start_date or date.today()
+        rng = np.random.default_rng(seed)
+        n_cities = len(CITIES)
+        n_types = len(ROOM_TYPES)
+
+        city = rng.integers(0, n_cities, n_hotels).astype(np.uint8)
+        city_lat = np.array([c[3] for c in CITIES], dtype=np.float32)
+        city_lon = np.array([c[4] for c in CITIES], dtype=np.float32)
+        amenity_bits = rng.random((n_hotels, len(AMENITIES))) < 0.6
+        amenity_bits[:, 0] = True  # everyone has WiFi
+        amenity_mask = (amenity_bits * (1 << np.arange(len(AMENITIES)))).sum(axis=1)
+
+        n_rows = n_hotels * n_types
+        hotel = np.repeat(np.arange(n_hotels), n_types)
+        room_type = np.tile(np.arange(n_types), n_hotels).astype(np.uint8)
+        city_factor = rng.uniform(0.7, 1.6, n_cities)[city[hotel]]
+        star_factor = rng.uniform(0.8, 1.5, n_hotels)[hotel]
+        type_factor = np.array([t[2] for t in ROOM_TYPES])[room_type]
+        price = 90 * city_factor * star_factor * type_factor
+
+        # Nightly free rooms around (1 - occupancy) of inventory, busier at weekends
+        rooms = rng.integers(0, 25, n_rows).astype(np.float32)
+        weekday = (np.arange(days) + start_date.weekday()) % 7
+        vacancy = np.where(weekday >= 4, 0.15, 0.35).astype(np.float32)
+        free = rng.random((days, n_rows), dtype=np.float32)
+        free *= 2 * vacancy[:, None]
+        np.minimum(free, 1, out=free)
+        free *= rooms[None, :]
+        free = free.astype(np.uint8)
+
+        columns = {
+            "hotel_city": city,
+            "hotel_prefix": rng.integers(0, len(NAME_PREFIXES), n_hotels).astype(np.uint8),
+            "hotel_suffix": rng.integers(0, len(NAME_SUFFIXES), n_hotels).astype(np.uint8),
+            "hotel_lat": city_lat[city] + rng.normal(0, 0.05, n_hotels).astype(np.float32),
+            "hotel_lon": city_lon[city] + rng.normal(0, 0.05, n_hotels).astype(np.float32),
+            "hotel_amenities": amenity_mask.astype(np.uint8),
+            "hotel": hotel,
+            "room_type": room_type,
+            "capacity": np.array([t[1] for t in ROOM_TYPES], dtype=np.uint8)[room_type],
+            "price": np.round(price, 2).astype(np.float32),
+            "free": free,
+        }
+        return cls(start_date, days, columns)
+
+    @classmethod
+    def load(cls, path: str) -> "HotelCalendar":
+        """Load a calendar previously written with save()."""
+        with np.load(path) as data:
+            if int(data["n_cities"]) != len(CITIES):
+                raise ValueError(f"{path} was built for a different city table")
+            columns = {name: data[name] for name in cls.HOTEL_COLUMNS + cls.ROOM_COLUMNS}
+            start_date = date.fromordinal(int(data["start_ordinal"]))
+            return cls(start_date, int(data["days"]), columns)
+
+    def save(self, path: str) -> None:
+        """Persist the calendar as a NumPy .npz archive."""
+        np.savez(
+            path,
+            n_cities=len(CITIES),
+            start_ordinal=self.start_date.toordinal(),
+            days=self.days,
+            **{name: getattr(self, name) for name in self.HOTEL_COLUMNS + self.ROOM_COLUMNS},
+        )
+
+    def night_index(self, night: str) -> int:
+        """Night offset of a YYYY-MM-DD date relative to the horizon start."""
+        return (datetime.strptime(night, "%Y-%m-%d").date() - self.start_date).days
+
+    def check_stay(self, check_in: str, check_out: str) -> Tuple[int, int]:
+        """
+        Night offsets [first_night, end_night) of a stay.
+
+        Raises:
+            ValueError: If check_out is not after check_in or the stay leaves the horizon
+        """
+        first_night = self.night_index(check_in)
+        end_night = self.night_index(check_out)
+        if end_night <= first_night:
+            raise ValueError("check_out must be after check_in")
+        if first_night < 0 or end_night > self.days:
+            last_check_out = self.start_date + timedelta(days=self.days)
+            raise ValueError(
+                f"Stay {check_in} to {check_out} is outside the availability calendar "
+                f"({self.start_date.isoformat()} to {last_check_out.isoformat()})"
+            )
+        return first_night, end_night
+
+    def lookup(self, city: int, first_night: int, end_night: int, guests: int = 2):
+        """
+        Room-type rows in a city free on every night of [first_night, end_night).
+
+        Returns:
+            Tuple of (row positions, minimum free rooms over the stay per row)
+        """
+        lo, hi = self.city_offsets[city], self.city_offsets[city + 1]
+        min_free = self.free[first_night:end_night, lo:hi].min(axis=0)
+        match = (min_free > 0) & (self.capacity[lo:hi] >= guests)
+        hits = np.flatnonzero(match)
+        return lo + hits, min_free[hits]
+
+    def search(self, location: str, check_in: str, check_out: str, guests: int = 2):
+        """
+        Resolve location and dates, then look up available room-type rows.
+
+        Raises:
+            ValueError: If the stay is empty or outside the availability horizon
+        """
+        if guests < 1:
+            raise ValueError("guests must be at least 1")
+        city = resolve_city(location)
+        first_night, end_night = self.check_stay(check_in, check_out)
+        return self.lookup(city, first_night, end_night, guests)
+
+    def rows(self, positions: np.ndarray, available: np.ndarray) -> List[Dict]:
+        """Materialize room-type rows as JSON-serializable hotel dicts, column by column."""
+        hotel = self.hotel[positions]
+        name = self.hotel_prefix[hotel].astype(np.intp) * len(NAME_SUFFIXES) + self.hotel_suffix[hotel]
+        columns = (
+            _HOTEL_NAMES[name].tolist(),
+            _CITY_NAMES[self.hotel_city[hotel]].tolist(),
+            _ROOM_TYPE_NAMES[self.room_type[positions]].tolist(),
+            np.round(self.price[positions].astype(np.float64), 2).tolist(),
+            ["USD"] * len(positions),
+            np.asarray(available).tolist(),
+            _AMENITY_LISTS[self.hotel_amenities[hotel]].tolist(),
+        )
+        return [dict(zip(HOTEL_FIELDS, values)) for values in zip(*columns)]
+
+
+_calendar: Optional[HotelCalendar] = None
+_calendar_lock = threading.Lock()
+
+
+def get_hotel_calendar() -> HotelCalendar:
+    """
+    Get the process-wide hotel calendar, building it on first use.
+
+    Configured via environment variables:
+        HOTEL_CALENDAR_PATH: Load a saved .npz calendar instead of generating one
+        HOTEL_CALENDAR_HOTELS: Number of generated hotels (default: 5000)
+        HOTEL_CALENDAR_SEED: Generator seed (default: 42)
+        HOTEL_CALENDAR_START: First night of the horizon, YYYY-MM-DD (default: today)
+        HOTEL_CALENDAR_DAYS: Horizon in nights (default: 730)
+    """
+    global _calendar
+    if _calendar is None:
+        with _calendar_lock:
+            if _calendar is None:
+                path = os.getenv("HOTEL_CALENDAR_PATH")
+                if path:
+                    _calendar = HotelCalendar.load(path)
+                else:
+                    start = os.getenv("HOTEL_CALENDAR_START")
+                    _calendar = HotelCalendar.generate(
+                        n_hotels=int(os.getenv("HOTEL_CALENDAR_HOTELS", "5000")),
+                        seed=int(os.getenv("HOTEL_CALENDAR_SEED", "42")),
+                        start_date=date.fromisoformat(start) if start else None,
+                        days=int(os.getenv("HOTEL_CALENDAR_DAYS", "730")),
+                    )
+    return _calendar
@@ -4,14 +4,59 @@ Travel Booking MCP Server
 A FastMCP server that provides travel-related tools for AI agents
 """
 
-from fastmcp import FastMCP
-from datetime import datetime, timedelta
-from typing import List, Optional, Dict
+import asyncio
+import os
+from contextlib import asynccontextmanager
+
+import numpy as np
+from fastmcp import Context, FastMCP
+from fastmcp.tools import ToolResult
+from mcp.types import TextContent
+from pydantic_core import to_json
+from datetime import datetime
+from typing import List, Optional, Dict, Union
 from pydantic import BaseModel, Field
-import random
+
+from travel_cache import canonical_date, tool_cache
+from travel_cities import canonical_city
+from travel_flights import get_flight_inventory
+from travel_hotels import get_hotel_calendar
+from travel_paging import check_page_size, decode_cursor, encode_cursor, price_keys, query_fingerprint, rank_page
+from travel_rates import get_currency_rates
+from travel_routes import search_itineraries as route_itineraries
+from travel_runtime import close_http_client, worker_pool
+from travel_trips import plan_trip as build_trip_plan
+
+
+async def _refresh_rates_periodically(url: str, interval: float) -> None:
+    """Keep the currency snapshot fresh from an upstream rates URL."""
+    while True:
+        try:
+            await get_currency_rates().refresh_from_url(url)
+        except Exception as e:
+            print(f"⚠️  Currency rate refresh failed: {e}")
+        await asyncio.sleep(interval)
+
+
+@asynccontextmanager
+async def server_lifespan(server: FastMCP):
+    """Start background refreshes and release shared pools on shutdown."""
+    tasks = []
+    rates_url = os.getenv("CURRENCY_RATES_URL")
+    if rates_url:
+        interval = float(os.getenv("CURRENCY_RATES_REFRESH_SECONDS", "3600"))
+        tasks.append(asyncio.create_task(_refresh_rates_periodically(rates_url, interval)))
+    try:
+        yield {}
+    finally:
+        for task in tasks:
+            task.cancel()
+        await close_http_client()
+        worker_pool.shutdown()
+
 
 # Initialize the MCP server
-mcp = FastMCP("Travel Booking Server")
+mcp = FastMCP("Travel Booking Server", lifespan=server_lifespan)
 
 # Data models for structured responses
 class Flight(BaseModel):
@@ -36,6 +81,57 @@ class Hotel(BaseModel):
     available_rooms: int
     amenities: List[str]
 
+class FlightPage(BaseModel):
+    """One page of flight search results"""
+    flights: List[Flight]
+    total: int = Field(description="Number of matching flights across all pages")
+    next_cursor: Optional[str] = Field(default=None, description="Pass as cursor to get the next page")
+
+class HotelPage(BaseModel):
+    """One page of hotel availability results"""
+    hotels: List[Hotel]
+    total: int = Field(description="Number of matching rooms across all pages")
+    next_cursor: Optional[str] = Field(default=None, description="Pass as cursor to get the next page")
+
+class Itinerary(BaseModel):
+    """Direct or connecting flight itinerary"""
+    legs: List[Flight]
+    stops: int
+    total_price: float
+    currency: str = "USD"
+    departure_time: str
+    arrival_time: str
+    total_duration_minutes: int
+
+class ItinerarySearch(BaseModel):
+    """Itinerary search results"""
+    itineraries: List[Itinerary]
+    explored_states: int = Field(description="Search states created while routing")
+    complete: bool = Field(description="False if the search stopped at its state or latency budget")
+    elapsed_ms: float
+
+class TripBundle(BaseModel):
+    """Round-trip flights plus a hotel stay, priced together"""
+    outbound: Flight
+    return_flight: Flight
+    hotel: Hotel
+    check_in: str
+    check_out: str
+    nights: int
+    rooms: int
+    flight_cost: float
+    hotel_cost: float
+    total_price: float
+    currency: str
+
+class TripPlan(BaseModel):
+    """Cheapest trip bundles"""
+    bundles: List[TripBundle]
+    combinations_evaluated: int = Field(description="Flight x hotel x nights combinations priced")
+    currency: str
+    exchange_rate: float = Field(description="USD to currency rate used for every price")
+    rates_as_of: str
+
 # Underlying functions that return JSON-serializable data
 def _search_flights(
     origin: str,
@@ -55,29 +151,10 @@ def _search_flights(
     Returns:
         List of available flights with details (as dicts)
     """
-    # Simulate flight search (in production, call real APIs)
-    airlines = ["Delta", "United", "American", "British Airways"]
-
-    flights = []
-    for i in range(3):
-        dep_time = datetime.strptime(departure_date, "%Y-%m-%d")
-        dep_time = dep_time.replace(hour=random.randint(6, 20), minute=random.choice([0, 15, 30, 45]))
-        arr_time = dep_time + timedelta(hours=random.randint(6, 12))
-
-        flight = {
-            "flight_number": f"{random.choice(['DL', 'UA', 'AA', 'BA'])}{random.randint(100, 999)}",
-            "airline": random.choice(airlines),
-            "departure": origin,
-            "arrival": destination,
-            "departure_time": dep_time.strftime("%Y-%m-%d %H:%M"),
-            "arrival_time": arr_time.strftime("%Y-%m-%d %H:%M"),
-            "price": round(random.uniform(300, 1200), 2),
-            "currency": "USD",
-            "available_seats": random.randint(5, 50)
-        }
-        flights.append(flight)
-
-    return flights
+    # Look up the indexed flight inventory (in production, call real APIs)
+    inventory = get_flight_inventory()
+    positions = inventory.search(origin, destination, departure_date, passengers)
+    return inventory.rows(positions)
 
 def _check_hotel_availability(
     location: str,
@@ -97,24 +174,218 @@ def _check_hotel_availability(
     Returns:
         List of available hotels with details (as dicts)
     """
-    # Simulate hotel search (in production, call real APIs)
-    hotel_names = ["Grand Plaza Hotel", "Seaside Resort", "Downtown Suites", "Airport Inn"]
-    room_types = ["Standard Room", "Deluxe Room", "Suite", "Executive Suite"]
-
-    hotels = []
-    for i in range(4):
-        hotel = {
-            "hotel_name": random.choice(hotel_names),
-            "location": location,
-            "room_type": random.choice(room_types),
-            "price_per_night": round(random.uniform(80, 350), 2),
-            "currency": "USD",
-            "available_rooms": random.randint(1, 10),
-            "amenities": random.sample(["WiFi", "Pool", "Gym", "Restaurant", "Spa", "Parking"], k=3)
-        }
-        hotels.append(hotel)
-
-    return hotels
+    # Query the hotel availability calendar (in production, call real APIs)
+    calendar = get_hotel_calendar()
+    positions, available = calendar.search(location, check_in, check_out, guests)
+    return calendar.rows(positions, available)
+
+def _pages(items_key: str, rows, order: np.ndarray, offset: int, limit: int, total: int, query: str) -> List[Dict]:
+    """
+    Split ranked row indexes into pages of limit rows.
+
+    Args:
+        items_key: Key the page's rows go under ("flights" or "hotels")
+        rows: Builds the row dicts for an array of indexes into the matches
+        order: Indexes of the matches ranked from offset on
+        offset: Rank of order[0]
+        limit: Page size
+        total: Number of matches
+        query: Query fingerprint the cursors are issued for
+
+    Returns:
+        Pages in order, each with the total count and the cursor of the page after it
+    """
+    pages = []
+    for start in range(0, max(len(order), 1), limit):
+        chunk = order[start:start + limit]
+        end = offset + start + len(chunk)
+        pages.append({
+            items_key: rows(chunk),
+            "total": total,
+            "next_cursor": encode_cursor(query, end) if end < total else None,
+        })
+    return pages
+
+def _flight_pages(
+    origin: str,
+    destination: str,
+    departure_date: str,
+    passengers: int,
+    sort_by: str,
+    limit: int,
+    cursor: Optional[str],
+    pages: Optional[int]
+) -> List[Dict]:
+    """Search once and rank the first pages of flights from cursor on (all remaining pages for None)."""
+    if sort_by not in ("price", "departure"):
+        raise ValueError("sort_by must be 'price' or 'departure'")
+    check_page_size(limit)
+
+    inventory = get_flight_inventory()
+    positions = inventory.search(origin, destination, departure_date, passengers)
+    query = query_fingerprint(
+        "search_flights", canonical_city(origin), canonical_city(destination),
+        canonical_date(departure_date), passengers, sort_by,
+    )
+    offset = decode_cursor(cursor, query)
+    count = len(positions) if pages is None else pages * limit
+
+    if sort_by == "price":
+        order = rank_page(price_keys(inventory.price[positions]), offset, count)
+    else:
+        # Positions already come back in departure order
+        order = np.arange(offset, min(offset + count, len(positions)))
+
+    return _pages("flights", lambda chunk: inventory.rows(positions[chunk]), order, offset, limit,
+                  len(positions), query)
+
+def _search_flights_page(
+    origin: str,
+    destination: str,
+    departure_date: str,
+    passengers: int = 1,
+    sort_by: str = "price",
+    limit: int = 20,
+    cursor: Optional[str] = None
+) -> Dict:
+    """
+    Get one page of flights, cheapest or earliest first.
+
+    Args:
+        origin: Departure city (e.g., "New York", "NYC")
+        destination: Arrival city (e.g., "London", "LHR")
+        departure_date: Date in YYYY-MM-DD format
+        passengers: Number of passengers (default: 1)
+        sort_by: "price" (default) or "departure"
+        limit: Page size (default: 20, max: 100)
+        cursor: next_cursor from the previous page, or None for the first page
+
+    Returns:
+        Dictionary with the page of flights, the total match count and the next cursor
+    """
+    return _flight_pages(origin, destination, departure_date, passengers, sort_by, limit, cursor, 1)[0]
+
+def _search_flights_pages(*args) -> List[Dict]:
+    """Every page of _search_flights_page from the cursor on, from a single search."""
+    return _flight_pages(*args, None)
+
+def _hotel_pages(
+    location: str,
+    check_in: str,
+    check_out: str,
+    guests: int,
+    limit: int,
+    cursor: Optional[str],
+    pages: Optional[int]
+) -> List[Dict]:
+    """Search once and rank the first pages of hotel rooms from cursor on (all remaining pages for None)."""
+    check_page_size(limit)
+
+    calendar = get_hotel_calendar()
+    positions, available = calendar.search(location, check_in, check_out, guests)
+    query = query_fingerprint(
+        "check_hotel_availability", canonical_city(location),
+        canonical_date(check_in), canonical_date(check_out), guests,
+    )
+    offset = decode_cursor(cursor, query)
+    count = len(positions) if pages is None else pages * limit
+    order = rank_page(price_keys(calendar.price[positions]), offset, count)
+
+    return _pages("hotels", lambda chunk: calendar.rows(positions[chunk], available[chunk]), order, offset, limit,
+                  len(positions), query)
+
+def _check_hotel_availability_page(
+    location: str,
+    check_in: str,
+    check_out: str,
+    guests: int = 2,
+    limit: int = 20,
+    cursor: Optional[str] = None
+) -> Dict:
+    """
+    Get one page of available hotel rooms, cheapest first.
+
+    Args:
+        location: City or area name
+        check_in: Check-in date in YYYY-MM-DD format
+        check_out: Check-out date in YYYY-MM-DD format
+        guests: Number of guests (default: 2)
+        limit: Page size (default: 20, max: 100)
+        cursor: next_cursor from the previous page, or None for the first page
+
+    Returns:
+        Dictionary with the page of hotels, the total match count and the next cursor
+    """
+    return _hotel_pages(location, check_in, check_out, guests, limit, cursor, 1)[0]
+
+def _check_hotel_availability_pages(*args) -> List[Dict]:
+    """Every page of _check_hotel_availability_page from the cursor on, from a single search."""
+    return _hotel_pages(*args, None)
+
+def _search_itineraries(
+    origin: str,
+    destination: str,
+    departure_date: str,
+    passengers: int = 1,
+    max_stops: int = 1,
+    optimize: str = "price",
+    min_connection_minutes: int = 60,
+    max_connection_minutes: int = 720,
+    max_results: int = 5
+) -> Dict:
+    """
+    Find the best direct and connecting itineraries between two cities.
+
+    Args:
+        origin: Departure city (e.g., "New York", "NYC")
+        destination: Arrival city (e.g., "Sydney", "SYD")
+        departure_date: Date of the first leg in YYYY-MM-DD format
+        passengers: Number of passengers (default: 1)
+        max_stops: Maximum connections, 0-3 (default: 1)
+        optimize: "price" (cheapest, default) or "duration" (fastest door to door)
+        min_connection_minutes: Minimum layover (default: 60)
+        max_connection_minutes: Maximum layover (default: 720)
+        max_results: Number of itineraries to return (default: 5)
+
+    Returns:
+        Dictionary with itineraries best-first and routing statistics
+    """
+    return route_itineraries(
+        origin, destination, departure_date, passengers, max_stops, optimize,
+        min_connection_minutes, max_connection_minutes, max_results,
+    )
+
+def _plan_trip(
+    origin: str,
+    destination: str,
+    departure_date: str,
+    return_date: str,
+    travelers: int = 1,
+    budget: Optional[float] = None,
+    currency: str = "USD",
+    flex_days: int = 0,
+    top_n: int = 5
+) -> Dict:
+    """
+    Find the cheapest flight + hotel bundles for a round trip.
+
+    Args:
+        origin: Home city (e.g., "New York", "NYC")
+        destination: Trip destination (e.g., "Paris", "CDG")
+        departure_date: Outbound flight and check-in date, YYYY-MM-DD
+        return_date: Return flight and check-out date, YYYY-MM-DD
+        travelers: Number of travelers (default: 1)
+        budget: Maximum bundle total in currency (default: no limit)
+        currency: Currency for all prices (default: USD)
+        flex_days: Let the return date move up to this many days either way (default: 0, max: 3)
+        top_n: Number of bundles to return (default: 5, max: 100)
+
+    Returns:
+        Dictionary with bundles cheapest-first
+    """
+    return build_trip_plan(
+        origin, destination, departure_date, return_date, travelers, budget, currency, flex_days, top_n
+    )
 
 def _convert_currency(
     amount: float,
@@ -132,15 +403,9 @@ def _convert_currency(
     Returns:
         Dictionary with conversion details
     """
-    # Simulate currency conversion (in production, call real exchange rate API)
-    exchange_rates = {
-        "USD": {"EUR": 0.85, "GBP": 0.73, "JPY": 110.0, "USD": 1.0},
-        "EUR": {"USD": 1.18, "GBP": 0.86, "JPY": 129.0, "EUR": 1.0},
-        "GBP": {"USD": 1.37, "EUR": 1.16, "JPY": 150.0, "GBP": 1.0},
-        "JPY": {"USD": 0.0091, "EUR": 0.0078, "GBP": 0.0067, "JPY": 1.0}
-    }
-
-    rate = exchange_rates.get(from_currency, {}).get(to_currency, 1.0)
+    # Read the current rate snapshot (in production, refreshed from an exchange rate API)
+    snapshot = get_currency_rates().snapshot
+    rate = snapshot.rate(from_currency, to_currency)
     converted_amount = round(amount * rate, 2)
 
     return {
@@ -149,6 +414,37 @@ def _convert_currency(
         "converted_amount": converted_amount,
         "converted_currency": to_currency,
         "exchange_rate": rate,
+        "rates_as_of": snapshot.as_of,
+        "timestamp": datetime.now().isoformat()
+    }
+
+def _convert_currency_batch(
+    amounts: List[float],
+    from_currency: Union[str, List[str]],
+    to_currency: str
+) -> Dict:
+    """
+    Convert many amounts to one target currency in a single call.
+
+    Args:
+        amounts: Amounts to convert
+        from_currency: Source currency code for all amounts, or a list with one code per amount
+        to_currency: Target currency code
+
+    Returns:
+        Dictionary with converted amounts, per-amount rates and their total
+    """
+    snapshot = get_currency_rates().snapshot
+    converted, rates = snapshot.convert_many(amounts, from_currency, to_currency)
+
+    return {
+        "original_amounts": list(amounts),
+        "original_currency": from_currency,
+        "converted_amounts": converted.tolist(),
+        "converted_currency": to_currency,
+        "exchange_rates": rates.tolist(),
+        "converted_total": round(float(converted.sum()), 2),
+        "rates_as_of": snapshot.as_of,
         "timestamp": datetime.now().isoformat()
     }
 
@@ -157,18 +453,94 @@ def _get_server_info() -> Dict:
     return {
         "name": "Travel Booking Server",
         "version": "1.0.0",
-        "tools": ["search_flights", "check_hotel_availability", "convert_currency"],
-        "description": "MCP server for travel booking operations"
+        "tools": [
+            "search_flights",
+            "check_hotel_availability",
+            "convert_currency",
+            "convert_currency_batch",
+            "search_itineraries",
+            "plan_trip",
+        ],
+        "description": "MCP server for travel booking operations",
+        "cache": tool_cache.stats(),
+        "workers": worker_pool.stats()
     }
 
-# MCP tool wrappers - convert results to Pydantic models for MCP
+# Fast result path - inventory rows are built by our own code and already match
+# the FlightPage/HotelPage schemas, so they skip per-row model validation and are
+# encoded to JSON exactly once instead of being re-serialized by FastMCP
+def _encoded_result(data: Dict) -> ToolResult:
+    """Wrap trusted structured data as a tool result with pre-encoded JSON text."""
+    return ToolResult(
+        content=[TextContent(type="text", text=to_json(data).decode())],
+        structured_content=data,
+    )
+
+# Worker-pool entry points - search, rank and encode results off the event loop
+def _search_flights_result(*args) -> ToolResult:
+    """Encode one page of _search_flights_page as a tool result."""
+    return _encoded_result(_search_flights_page(*args))
+
+def _check_hotel_availability_result(*args) -> ToolResult:
+    """Encode one page of _check_hotel_availability_page as a tool result."""
+    return _encoded_result(_check_hotel_availability_page(*args))
+
+def _search_itineraries_result(*args) -> ToolResult:
+    """Encode _search_itineraries results as a tool result."""
+    return _encoded_result(_search_itineraries(*args))
+
+def _plan_trip_result(*args) -> ToolResult:
+    """Encode _plan_trip results as a tool result."""
+    return _encoded_result(_plan_trip(*args))
+
+async def _stream_pages(
+    ctx: Context,
+    tool: str,
+    pages_fn,
+    items_key: str,
+    args: tuple,
+    cursor: Optional[str]
+) -> ToolResult:
+    """
+    Send every page to the client as a progress notification, then return the first one.
+
+    The matches are searched and ranked once (pages_fn returns all pages
+    from the cursor on) and then sent page by page; each notification's
+    message is the page's JSON. The final result is the first page with its
+    next_cursor, as without streaming, so it stays one page long.
+
+    Progress notifications are only sent when the client's request carries
+    a progressToken (_meta.progressToken); without one report_progress is a
+    no-op and the client gets just the first page.
+    """
+    pages = await worker_pool.run(tool, pages_fn, *args, cursor)
+    sent = 0
+    for page in pages:
+        sent += len(page[items_key])
+        await ctx.report_progress(
+            progress=sent, total=page["total"], message=to_json(page[items_key]).decode()
+        )
+    return _encoded_result(pages[0])
+
+# MCP tool wrappers - async, with blocking work dispatched to the shared worker pool
 @mcp.tool()
-def search_flights(
+@tool_cache.cached(
+    ttl=float(os.getenv("SEARCH_FLIGHTS_CACHE_TTL", "60")),
+    normalize={"origin": canonical_city, "destination": canonical_city, "departure_date": canonical_date},
+    ignore=("ctx",),
+    bypass=("stream",),
+)
+async def search_flights(
     origin: str,
     destination: str,
     departure_date: str,
-    passengers: int = 1
-) -> List[Flight]:
+    passengers: int = 1,
+    sort_by: str = "price",
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    stream: bool = False,
+    ctx: Optional[Context] = None
+) -> FlightPage:
     """
     Search for available flights between two cities.
 
@@ -177,37 +549,148 @@ def search_flights(
         destination: Arrival city (e.g., "London", "LHR")
         departure_date: Date in YYYY-MM-DD format
         passengers: Number of passengers (default: 1)
+        sort_by: "price" (cheapest first, default) or "departure" (earliest first)
+        limit: Page size (default: 20, max: 100)
+        cursor: next_cursor from a previous page to continue the listing
+        stream: Also send every remaining page as a progress notification (needs a progress token; not cached)
 
     Returns:
-        List of available flights with details
+        Page of available flights with the total count and a cursor for the next page
     """
-    flights_data = _search_flights(origin, destination, departure_date, passengers)
-    return [Flight(**f) for f in flights_data]
+    args = (origin, destination, departure_date, passengers, sort_by, limit)
+    if stream and ctx is not None:
+        return await _stream_pages(ctx, "search_flights", _search_flights_pages, "flights", args, cursor)
+    return await worker_pool.run("search_flights", _search_flights_result, *args, cursor)
 
 @mcp.tool()
-def check_hotel_availability(
+@tool_cache.cached(
+    ttl=float(os.getenv("HOTEL_AVAILABILITY_CACHE_TTL", "60")),
+    normalize={"location": canonical_city, "check_in": canonical_date, "check_out": canonical_date},
+    ignore=("ctx",),
+    bypass=("stream",),
+)
+async def check_hotel_availability(
     location: str,
     check_in: str,
     check_out: str,
-    guests: int = 2
-) -> List[Hotel]:
+    guests: int = 2,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    stream: bool = False,
+    ctx: Optional[Context] = None
+) -> HotelPage:
     """
-    Check hotel room availability in a specific location.
+    Check hotel room availability in a specific location, cheapest first.
 
     Args:
         location: City or area name
         check_in: Check-in date in YYYY-MM-DD format
         check_out: Check-out date in YYYY-MM-DD format
         guests: Number of guests (default: 2)
+        limit: Page size (default: 20, max: 100)
+        cursor: next_cursor from a previous page to continue the listing
+        stream: Also send every remaining page as a progress notification (needs a progress token; not cached)
 
     Returns:
-        List of available hotels with details
+        Page of available hotel rooms with the total count and a cursor for the next page
     """
-    hotels_data = _check_hotel_availability(location, check_in, check_out, guests)
-    return [Hotel(**h) for h in hotels_data]
+    args = (location, check_in, check_out, guests, limit)
+    if stream and ctx is not None:
+        return await _stream_pages(
+            ctx, "check_hotel_availability", _check_hotel_availability_pages, "hotels", args, cursor
+        )
+    return await worker_pool.run("check_hotel_availability", _check_hotel_availability_result, *args, cursor)
 
 @mcp.tool()
-def convert_currency(
+@tool_cache.cached(
+    ttl=float(os.getenv("SEARCH_ITINERARIES_CACHE_TTL", "60")),
+    normalize={"origin": canonical_city, "destination": canonical_city, "departure_date": canonical_date},
+)
+async def search_itineraries(
+    origin: str,
+    destination: str,
+    departure_date: str,
+    passengers: int = 1,
+    max_stops: int = 1,
+    optimize: str = "price",
+    min_connection_minutes: int = 60,
+    max_connection_minutes: int = 720,
+    max_results: int = 5
+) -> ItinerarySearch:
+    """
+    Find the best direct and connecting flight itineraries between two cities.
+
+    Use this when there may be no direct flight, or when a connection could be
+    cheaper or faster than flying direct.
+
+    Args:
+        origin: Departure city (e.g., "New York", "NYC")
+        destination: Arrival city (e.g., "Sydney", "SYD")
+        departure_date: Date of the first leg in YYYY-MM-DD format
+        passengers: Number of passengers (default: 1)
+        max_stops: Maximum connections, 0-3 (default: 1)
+        optimize: "price" (cheapest, default) or "duration" (fastest door to door)
+        min_connection_minutes: Minimum layover (default: 60)
+        max_connection_minutes: Maximum layover (default: 720)
+        max_results: Number of itineraries to return (default: 5)
+
+    Returns:
+        Itineraries best-first, each with its legs, total price and total duration
+    """
+    return await worker_pool.run(
+        "search_itineraries", _search_itineraries_result, origin, destination, departure_date,
+        passengers, max_stops, optimize, min_connection_minutes, max_connection_minutes, max_results,
+    )
+
+@mcp.tool()
+@tool_cache.cached(
+    ttl=float(os.getenv("PLAN_TRIP_CACHE_TTL", "60")),
+    normalize={
+        "origin": canonical_city,
+        "destination": canonical_city,
+        "departure_date": canonical_date,
+        "return_date": canonical_date,
+    },
+)
+async def plan_trip(
+    origin: str,
+    destination: str,
+    departure_date: str,
+    return_date: str,
+    travelers: int = 1,
+    budget: Optional[float] = None,
+    currency: str = "USD",
+    flex_days: int = 0,
+    top_n: int = 5
+) -> TripPlan:
+    """
+    Find the cheapest complete trips (outbound flight, hotel stay, return flight) in one call.
+
+    Every flight x hotel x nights combination is priced in the requested currency,
+    so there is no need to call search_flights, check_hotel_availability and
+    convert_currency separately and combine the results.
+
+    Args:
+        origin: Home city (e.g., "New York", "NYC")
+        destination: Trip destination (e.g., "Paris", "CDG")
+        departure_date: Outbound flight and check-in date, YYYY-MM-DD
+        return_date: Return flight and check-out date, YYYY-MM-DD
+        travelers: Number of travelers (default: 1)
+        budget: Maximum bundle total in currency (default: no limit)
+        currency: Currency for all prices (default: USD)
+        flex_days: Let the return date move up to this many days either way (default: 0, max: 3)
+        top_n: Number of bundles to return (default: 5, max: 100)
+
+    Returns:
+        Bundles cheapest-first, each with flights, hotel room, nights and cost breakdown
+    """
+    return await worker_pool.run(
+        "plan_trip", _plan_trip_result, origin, destination, departure_date, return_date,
+        travelers, budget, currency, flex_days, top_n,
+    )
+
+@mcp.tool()
+async def convert_currency(
     amount: float,
     from_currency: str,
     to_currency: str
@@ -226,7 +709,31 @@ def convert_currency(
     return _convert_currency(amount, from_currency, to_currency)
 
 @mcp.tool()
-def get_server_info() -> dict:
+async def convert_currency_batch(
+    amounts: List[float],
+    from_currency: Union[str, List[str]],
+    to_currency: str
+) -> dict:
+    """
+    Convert many amounts to one target currency in a single call.
+
+    Use this instead of repeated convert_currency calls when pricing a whole
+    itinerary (e.g., flights in USD and hotels in EUR, totalled in GBP).
+
+    Args:
+        amounts: Amounts to convert
+        from_currency: Source currency code for all amounts, or a list with one code per amount
+        to_currency: Target currency code
+
+    Returns:
+        Dictionary with converted amounts, per-amount rates and their total
+    """
+    return await worker_pool.run(
+        "convert_currency_batch", _convert_currency_batch, amounts, from_currency, to_currency
+    )
+
+@mcp.tool()
+async def get_server_info() -> dict:
     """Get information about this MCP server"""
     return _get_server_info()
 
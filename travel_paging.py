@@ -0,0 +1,78 @@
+"""
+Result Paging
+Cursor-based pagination with partial (top-k) sorting for the travel MCP server tools
+"""
+
+import base64
+import hashlib
+import json
+from typing import Any, Optional
+
+import numpy as np
+
+MAX_PAGE_SIZE = 100
+
+
+def query_fingerprint(*parts: Any) -> str:
+    """Short stable hash of the normalized query a cursor belongs to."""
+    return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()[:12]
+
+
+def encode_cursor(query: str, offset: int) -> str:
+    """Opaque cursor for the page starting at offset."""
+    payload = json.dumps({"q": query, "o": offset}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], query: str) -> int:
+    """
+    Offset encoded in a cursor (0 when there is no cursor).
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for a different query
+    """
+    if not cursor:
+        return 0
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        offset = int(payload["o"])
+        issued_for = payload["q"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if issued_for != query or offset < 0:
+        raise ValueError("Cursor does not belong to this query; start again without a cursor")
+    return offset
+
+
+def check_page_size(limit: int) -> None:
+    """Reject page sizes outside 1..MAX_PAGE_SIZE."""
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+
+
+def price_keys(prices: np.ndarray) -> np.ndarray:
+    """
+    Unique int64 sort keys ordering by price (in cents), ties broken by position.
+
+    Unique keys make the top-k selection deterministic, so consecutive pages
+    never repeat or skip rows that share a price.
+    """
+    cents = np.round(prices.astype(np.float64) * 100).astype(np.int64)
+    return cents * len(prices) + np.arange(len(prices))
+
+
+def rank_page(keys: np.ndarray, offset: int, limit: int) -> np.ndarray:
+    """
+    Indexes of the rows ranked [offset, offset + limit) by ascending key.
+
+    Only the first offset + limit rows are selected (argpartition) and sorted,
+    so a page costs O(n + k log k) rather than a full O(n log n) sort.
+    """
+    n = len(keys)
+    end = min(offset + limit, n)
+    if offset >= end:
+        return np.empty(0, dtype=np.intp)
+    head = np.argpartition(keys, end - 1)[:end] if end < n else np.arange(n)
+    head = head[np.argsort(keys[head])]
+    return head[offset:end]
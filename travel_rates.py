@@ -0,0 +1,172 @@
+"""
+Currency Rate Engine
+Dense exchange-rate matrix with cross-rate triangulation for the travel MCP server
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from travel_runtime import get_http_client
+
+# Simulated snapshot: units of each currency per 1 USD (in production, load from a rates API)
+DEFAULT_BASE = "USD"
+DEFAULT_RATES = {
+    "USD": 1.0,
+    "EUR": 0.85,
+    "GBP": 0.73,
+    "JPY": 110.0,
+    "CAD": 1.36,
+    "AUD": 1.52,
+    "CHF": 0.88,
+    "CNY": 7.2,
+    "HKD": 7.8,
+    "SGD": 1.34,
+    "INR": 83.0,
+    "AED": 3.67,
+    "KRW": 1330.0,
+    "MXN": 17.0,
+    "BRL": 5.0,
+}
+
+
+class RateSnapshot:
+    """
+    Immutable exchange-rate table.
+
+    Rates are loaded once against a base currency and expanded into a dense
+    matrix where matrix[i, j] is the amount of currency j per unit of currency i,
+    i.e. every pair is triangulated through the base currency.
+    """
+
+    def __init__(self, base: str, rates: Dict[str, float], as_of: Optional[str] = None):
+        base = base.upper()
+        rates = {code.upper(): float(rate) for code, rate in rates.items()}
+        rates.setdefault(base, 1.0)
+        if rates[base] != 1.0:
+            raise ValueError(f"Base currency {base} must have a rate of 1.0")
+        if any(rate <= 0 for rate in rates.values()):
+            raise ValueError("Exchange rates must be positive")
+
+        self.base = base
+        self.as_of = as_of or datetime.now().isoformat()
+        self.currencies: Tuple[str, ...] = tuple(sorted(rates))
+        self.index: Dict[str, int] = {code: i for i, code in enumerate(self.currencies)}
+
+        per_base = np.array([rates[code] for code in self.currencies])
+        self.matrix = per_base[None, :] / per_base[:, None]
+        self.matrix.flags.writeable = False
+
+    def currency_index(self, code: str) -> int:
+        """Matrix index of a currency code (case-insensitive)."""
+        index = self.index.get(code.upper())
+        if index is None:
+            raise ValueError(
+                f"Unsupported currency '{code}'. Supported currencies: {', '.join(self.currencies)}"
+            )
+        return index
+
+    def rate(self, from_currency: str, to_currency: str) -> float:
+        """Exchange rate from one currency to another."""
+        return float(self.matrix[self.currency_index(from_currency), self.currency_index(to_currency)])
+
+    def convert_many(
+        self,
+        amounts: Sequence[float],
+        from_currency: Union[str, Sequence[str]],
+        to_currency: str
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convert many amounts in one vectorized step.
+
+        Args:
+            amounts: Amounts to convert
+            from_currency: One source currency for all amounts, or one per amount
+            to_currency: Target currency code
+
+        Returns:
+            Tuple of (converted amounts, exchange rate applied to each amount)
+        """
+        values = np.asarray(amounts, dtype=np.float64)
+        target = self.currency_index(to_currency)
+
+        if isinstance(from_currency, str):
+            rates = np.full(values.shape, self.matrix[self.currency_index(from_currency), target])
+        else:
+            if len(from_currency) != len(values):
+                raise ValueError("from_currency must be a single code or one code per amount")
+            # Resolve each distinct code once, then broadcast back to every amount
+            codes, inverse = np.unique(np.asarray(from_currency, dtype=str), return_inverse=True)
+            source = np.array([self.currency_index(code) for code in codes], dtype=np.intp)
+            rates = self.matrix[source, target][inverse]
+
+        return np.round(values * rates, 2), rates
+
+
+class CurrencyRates:
+    """Holds the current RateSnapshot and swaps it atomically on reload."""
+
+    def __init__(self, snapshot: RateSnapshot):
+        self._snapshot = snapshot
+
+    @property
+    def snapshot(self) -> RateSnapshot:
+        """
+        Current rate snapshot.
+
+        Readers should grab the snapshot once per request; a concurrent reload
+        replaces the reference but never mutates a published snapshot.
+        """
+        return self._snapshot
+
+    def reload(self, base: str, rates: Dict[str, float], as_of: Optional[str] = None) -> RateSnapshot:
+        """Build a new snapshot off to the side, then publish it in one assignment."""
+        snapshot = RateSnapshot(base, rates, as_of)
+        self._snapshot = snapshot
+        return snapshot
+
+    def reload_from_file(self, path: str) -> RateSnapshot:
+        """Reload from a JSON file of the form {"base": ..., "as_of": ..., "rates": {...}}."""
+        base, rates, as_of = _read_rates_file(path)
+        return self.reload(base, rates, as_of)
+
+    async def refresh_from_url(self, url: str) -> RateSnapshot:
+        """Fetch a rate file (same JSON shape) over the shared HTTP pool and reload."""
+        response = await get_http_client().get(url)
+        response.raise_for_status()
+        data = response.json()
+        return self.reload(data.get("base", DEFAULT_BASE), data["rates"], data.get("as_of"))
+
+
+def _read_rates_file(path: str) -> Tuple[str, Dict[str, float], Optional[str]]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data.get("base", DEFAULT_BASE), data["rates"], data.get("as_of")
+
+
+_rates: Optional[CurrencyRates] = None
+_rates_lock = threading.Lock()
+
+
+def get_currency_rates() -> CurrencyRates:
+    """
+    Get the process-wide currency rates, loading them on first use.
+
+    Set CURRENCY_RATES_PATH to load a JSON rate file instead of the built-in snapshot.
+    """
+    global _rates
+    if _rates is None:
+        with _rates_lock:
+            if _rates is None:
+                path = os.getenv("CURRENCY_RATES_PATH")
+                if path:
+                    snapshot = RateSnapshot(*_read_rates_file(path))
+                else:
+                    snapshot = RateSnapshot(DEFAULT_BASE, DEFAULT_RATES)
+                _rates = CurrencyRates(snapshot)
+    return _rates
+
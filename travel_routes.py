@@ -0,0 +1,268 @@
+"""
+Itinerary Routing
+Time-dependent multi-leg flight search over the flight inventory for the travel MCP server
+"""
+
+import heapq
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from travel_cities import resolve_city
+from travel_flights import MINUTES_PER_DAY, FlightInventory, distance_matrix_km, get_flight_inventory
+
+MAX_STOPS = 3
+
+
+class RouteGraph:
+    """
+    Departure-time-ordered adjacency lists per airport, built once over the inventory.
+
+    Flights are re-sorted by (origin, absolute departure minute) with a CSR-style
+    offset table, so "every departure from city c between t1 and t2" is a pair
+    of binary searches in c's block.
+    """
+
+    def __init__(self, inventory: FlightInventory, distance_km: Optional[np.ndarray] = None):
+        """
+        Args:
+            inventory: Flight table to route over
+            distance_km: Airport-to-airport distances (defaults to the built-in cities' distance_matrix_km())
+        """
+        self.inventory = inventory
+        n_cities = inventory.n_cities
+
+        dep = inventory.day.astype(np.int32) * MINUTES_PER_DAY + inventory.dep_minute
+        arr = dep + inventory.duration
+        order = np.lexsort((dep, inventory.origin))
+        self.flight = order
+        self.dep = dep[order]
+        self.arr = arr[order]
+        self.destination = inventory.destination[order]
+        self.price = inventory.price[order].astype(np.float64)
+        self.seats = inventory.seats[order]
+        self.offsets = np.searchsorted(inventory.origin[order], np.arange(n_cities + 1))
+
+        # Admissible A* bounds: the last leg must land at the destination, so the
+        # remaining price is at least the cheapest flight into it; the remaining
+        # time is at least the great-circle distance at the fastest observed speed.
+        self.min_price_into = np.full(n_cities, np.inf)
+        np.minimum.at(self.min_price_into, self.destination, self.price)
+        self.distance_km = distance_matrix_km() if distance_km is None else distance_km
+        speed = self.distance_km[inventory.origin, inventory.destination] / np.maximum(inventory.duration, 1)
+        self.max_km_per_minute = float(speed.max()) if len(speed) else 1.0
+
+    def _heuristic(self, city: int, destination: int, optimize: str) -> float:
+        if city == destination:
+            return 0.0
+        if optimize == "price":
+            return float(self.min_price_into[destination])
+        return float(self.distance_km[city, destination] / self.max_km_per_minute)
+
+    def search(
+        self,
+        origin: int,
+        destination: int,
+        day: int,
+        passengers: int = 1,
+        max_stops: int = 1,
+        optimize: str = "price",
+        min_connection: int = 60,
+        max_connection: int = 720,
+        max_results: int = 5,
+        max_states: int = 50_000,
+        time_budget_ms: float = 250.0
+    ) -> Dict:
+        """
+        Best itineraries departing origin on day, found with a time-dependent A*.
+
+        A label is (city, arrival minute, cost so far, stops). Labels are expanded in
+        order of cost + admissible bound, so destinations pop out best-first and the
+        search stops after max_results of them. A label is pruned when max_results
+        earlier labels at the same city arrive no later, cost no more and used no
+        more stops, and the whole search is capped by max_states and time_budget_ms.
+
+        Args:
+            origin: Origin city index
+            destination: Destination city index
+            day: Departure day offset in the inventory horizon
+            passengers: Seats needed on every leg
+            max_stops: Maximum intermediate stops (0 = direct only)
+            optimize: "price" (total fare) or "duration" (first departure to last arrival)
+            min_connection: Minimum connection time in minutes
+            max_connection: Maximum connection time in minutes
+            max_results: Number of itineraries to return
+            max_states: Bound on labels created before giving up
+            time_budget_ms: Wall-clock budget before giving up
+
+        Returns:
+            Dictionary with itinerary flight-position lists and search statistics
+        """
+        started = time.perf_counter()
+        deadline = started + time_budget_ms / 1000
+
+        # Label storage (parallel lists indexed by label id)
+        city: List[int] = []
+        arrival: List[int] = []
+        cost: List[float] = []
+        stops: List[int] = []
+        parent: List[int] = []
+        leg: List[int] = []
+        departure: List[int] = []
+        settled: Dict[int, List[tuple]] = {}
+
+        heap: List[tuple] = []
+
+        def push(c: int, arr: int, g: float, s: int, p: int, flight: int, first_dep: int) -> None:
+            city.append(c)
+            arrival.append(arr)
+            cost.append(g)
+            stops.append(s)
+            parent.append(p)
+            leg.append(flight)
+            departure.append(first_dep)
+            heapq.heappush(heap, (g + self._heuristic(c, destination, optimize), len(city) - 1))
+
+        def expand(c: int, earliest: int, latest: int, s: int, p: int, g: float, first_dep: Optional[int],
+                   visited: set) -> None:
+            lo, hi = self.offsets[c], self.offsets[c + 1]
+            a = lo + np.searchsorted(self.dep[lo:hi], earliest, side="left")
+            b = lo + np.searchsorted(self.dep[lo:hi], latest, side="left")
+            if a >= b:
+                return
+            dest = self.destination[a:b]
+            keep = self.seats[a:b] >= passengers
+            if s == max_stops:
+                keep &= dest == destination
+            else:
+                keep &= ~np.isin(dest, list(visited))
+            for j in (a + np.flatnonzero(keep)).tolist():
+                dep_j = int(self.dep[j])
+                start = first_dep if first_dep is not None else dep_j
+                arr_j = int(self.arr[j])
+                g_j = g + self.price[j] if optimize == "price" else float(arr_j - start)
+                push(int(self.destination[j]), arr_j, g_j, s + 1, p, j, start)
+
+        expand(origin, day * MINUTES_PER_DAY, (day + 1) * MINUTES_PER_DAY, 0, -1, 0.0, None, {origin})
+
+        results: List[int] = []
+        popped = 0
+        complete = True
+        while heap:
+            if len(city) > max_states or (popped & 255 == 0 and time.perf_counter() > deadline):
+                complete = False
+                break
+            _, label = heapq.heappop(heap)
+            popped += 1
+            c, arr, g, s = city[label], arrival[label], cost[label], stops[label]
+
+            if c == destination:
+                results.append(label)
+                if len(results) == max_results:
+                    break
+                continue
+
+            # Prune labels dominated by max_results already-settled labels at this city
+            seen = settled.setdefault(c, [])
+            dominated = sum(1 for a2, g2, s2 in seen if a2 <= arr and g2 <= g and s2 <= s)
+            if dominated >= max_results:
+                continue
+            seen.append((arr, g, s))
+
+            if s <= max_stops:
+                visited = {origin, c}
+                p = parent[label]
+                while p >= 0:
+                    visited.add(city[p])
+                    p = parent[p]
+                expand(c, arr + min_connection, arr + max_connection + 1, s, label, g, departure[label], visited)
+
+        itineraries = []
+        for label in results:
+            legs = []
+            while label >= 0:
+                legs.append(int(self.flight[leg[label]]))
+                label = parent[label]
+            itineraries.append(legs[::-1])
+
+        return {
+            "itineraries": itineraries,
+            "explored_states": len(city),
+            "complete": complete,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+
+
+_graph: Optional[RouteGraph] = None
+_graph_lock = threading.Lock()
+
+
+def get_route_graph() -> RouteGraph:
+    """Get the process-wide route graph over the shared flight inventory."""
+    global _graph
+    if _graph is None:
+        with _graph_lock:
+            if _graph is None:
+                _graph = RouteGraph(get_flight_inventory())
+    return _graph
+
+
+def search_itineraries(
+    origin: str,
+    destination: str,
+    departure_date: str,
+    passengers: int = 1,
+    max_stops: int = 1,
+    optimize: str = "price",
+    min_connection_minutes: int = 60,
+    max_connection_minutes: int = 720,
+    max_results: int = 5,
+    graph: Optional[RouteGraph] = None
+) -> Dict:
+    """
+    Resolve names and dates, run the routing search and materialize the itineraries.
+
+    Returns:
+        Dictionary with itineraries (legs as flight dicts plus totals) and search statistics
+    """
+    if optimize not in ("price", "duration"):
+        raise ValueError("optimize must be 'price' or 'duration'")
+    if not 0 <= max_stops <= MAX_STOPS:
+        raise ValueError(f"max_stops must be between 0 and {MAX_STOPS}")
+    if passengers < 1:
+        raise ValueError("passengers must be at least 1")
+    if min_connection_minutes < 0 or max_connection_minutes < min_connection_minutes:
+        raise ValueError("Connection window must satisfy 0 <= min_connection_minutes <= max_connection_minutes")
+
+    graph = graph or get_route_graph()
+    inventory = graph.inventory
+    o = resolve_city(origin)
+    d = resolve_city(destination)
+    day = inventory.check_day(departure_date)
+    if o == d:
+        return {"itineraries": [], "explored_states": 0, "complete": True, "elapsed_ms": 0.0}
+
+    found = graph.search(
+        o, d, day, passengers, max_stops, optimize,
+        min_connection_minutes, max_connection_minutes, max_results,
+    )
+
+    itineraries = []
+    for positions in found["itineraries"]:
+        legs = inventory.rows(np.asarray(positions))
+        first, last = positions[0], positions[-1]
+        start = int(inventory.day[first]) * MINUTES_PER_DAY + int(inventory.dep_minute[first])
+        end = int(inventory.day[last]) * MINUTES_PER_DAY + int(inventory.dep_minute[last]) + int(inventory.duration[last])
+        itineraries.append({
+            "legs": legs,
+            "stops": len(legs) - 1,
+            "total_price": round(sum(leg["price"] for leg in legs), 2),
+            "currency": "USD",
+            "departure_time": legs[0]["departure_time"],
+            "arrival_time": legs[-1]["arrival_time"],
+            "total_duration_minutes": end - start,
+        })
+    found["itineraries"] = itineraries
+    return found
@@ -0,0 +1,133 @@
+"""
+Travel MCP Server Runtime
+Shared worker pool and HTTP connection pool used by the async tool implementations
+"""
+
+import asyncio
+import functools
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+
+
+class ToolWorkerPool:
+    """
+    Runs blocking tool work (inventory search, model building) off the event loop.
+
+    Each tool gets its own concurrency limit; callers beyond the limit wait in
+    a queue whose current and peak depth are tracked per tool, so one slow tool
+    can't starve the executor for the others.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, mode: str = "thread",
+                 max_concurrency: int = 16):
+        if mode not in ("thread", "process"):
+            raise ValueError("mode must be 'thread' or 'process'")
+        self.max_workers = max_workers or os.cpu_count() or 4
+        self.mode = mode
+        self.max_concurrency = max_concurrency
+        self._executor: Optional[Executor] = None
+        self._limits: Dict[str, asyncio.Semaphore] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def executor(self) -> Executor:
+        """Executor created on first use."""
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="tool-worker"
+                )
+        return self._executor
+
+    async def run(self, tool: str, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run fn(*args) on the pool under the tool's concurrency limit.
+
+        In process mode fn and its arguments must be picklable (module-level functions).
+        """
+        limit = self._limits.get(tool)
+        if limit is None:
+            limit = self._limits[tool] = asyncio.Semaphore(self.max_concurrency)
+        stats = self._stats.setdefault(tool, {
+            "queued": 0, "running": 0, "completed": 0, "failed": 0, "max_queue_depth": 0,
+        })
+
+        waiting = limit.locked()
+        if waiting:
+            stats["queued"] += 1
+            stats["max_queue_depth"] = max(stats["max_queue_depth"], stats["queued"])
+        try:
+            await limit.acquire()
+        finally:
+            if waiting:
+                stats["queued"] -= 1
+
+        stats["running"] += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self.executor, functools.partial(fn, *args))
+        except Exception:
+            stats["failed"] += 1
+            raise
+        finally:
+            stats["running"] -= 1
+            limit.release()
+        stats["completed"] += 1
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool configuration plus queue depth and throughput counters per tool."""
+        return {
+            "mode": self.mode,
+            "max_workers": self.max_workers,
+            "max_concurrency_per_tool": self.max_concurrency,
+            "tools": {tool: dict(counters) for tool, counters in self._stats.items()},
+        }
+
+    def shutdown(self) -> None:
+        """Stop the executor, cancelling work that has not started yet."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Shared pool for the travel MCP server tools
+worker_pool = ToolWorkerPool(
+    max_workers=int(os.getenv("TOOL_WORKERS", "0")) or None,
+    mode=os.getenv("TOOL_WORKER_MODE", "thread"),
+    max_concurrency=int(os.getenv("TOOL_MAX_CONCURRENCY", "16")),
+)
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared async HTTP client for upstream calls.
+
+    One client means one connection pool: keep-alive connections and TLS
+    sessions are reused across every tool call and every connected agent.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(float(os.getenv("UPSTREAM_TIMEOUT_SECONDS", "10"))),
+            limits=httpx.Limits(
+                max_connections=int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "100")),
+                max_keepalive_connections=int(os.getenv("UPSTREAM_MAX_KEEPALIVE", "20")),
+            ),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and its pooled connections."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
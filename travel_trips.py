@@ -0,0 +1,162 @@
+"""
+Trip Bundles
+Vectorized flight + hotel bundle pricing for the travel MCP server
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+import numpy as np
+
+from travel_cities import resolve_city
+from travel_flights import MINUTES_PER_DAY, FlightInventory, get_flight_inventory
+from travel_hotels import HotelCalendar, get_hotel_calendar
+from travel_paging import MAX_PAGE_SIZE, price_keys, rank_page
+from travel_rates import RateSnapshot, get_currency_rates
+
+MAX_FLEX_DAYS = 3
+MIN_RETURN_GAP_MINUTES = 120
+
+
+def plan_trip(
+    origin: str,
+    destination: str,
+    departure_date: str,
+    return_date: str,
+    travelers: int = 1,
+    budget: Optional[float] = None,
+    currency: str = "USD",
+    flex_days: int = 0,
+    top_n: int = 5,
+    inventory: Optional[FlightInventory] = None,
+    calendar: Optional[HotelCalendar] = None,
+    snapshot: Optional[RateSnapshot] = None
+) -> Dict:
+    """
+    Cheapest round-trip flight + hotel bundles, priced in one NumPy broadcast.
+
+    The outbound flight leaves on departure_date and the hotel stay starts that
+    night. With flex_days > 0 the stay (and return flight) may end up to that many
+    days before or after return_date. Every (outbound, stay length, return, room)
+    combination is priced at once as a 4-D array:
+
+        total[o, k, r, h] = (outbound[o] + return[k, r]) * travelers
+                            + room[h] * rooms[h] * nights[k]
+
+    masked by room availability over each stay length, return flights leaving
+    after the outbound lands, and the budget, then ranked with a partial sort.
+
+    Args:
+        origin: Home city (e.g., "New York", "NYC")
+        destination: Trip destination (e.g., "Paris", "CDG")
+        departure_date: Outbound flight and check-in date, YYYY-MM-DD
+        return_date: Return flight and check-out date, YYYY-MM-DD
+        travelers: Number of travelers (flight seats and hotel guests)
+        budget: Maximum bundle total in the target currency, or None for no cap
+        currency: Currency for all bundle prices
+        flex_days: Allowed shift of the return date in days (0-3)
+        top_n: Number of bundles to return (1-100)
+        inventory: Flight inventory (defaults to the shared one)
+        calendar: Hotel calendar (defaults to the shared one)
+        snapshot: Currency rates (defaults to the current shared snapshot)
+
+    Returns:
+        Dictionary with bundles cheapest-first and the number of combinations evaluated
+    """
+    if travelers < 1:
+        raise ValueError("travelers must be at least 1")
+    if not 0 <= flex_days <= MAX_FLEX_DAYS:
+        raise ValueError(f"flex_days must be between 0 and {MAX_FLEX_DAYS}")
+    if not 1 <= top_n <= MAX_PAGE_SIZE:
+        raise ValueError(f"top_n must be between 1 and {MAX_PAGE_SIZE}")
+    depart = datetime.strptime(departure_date, "%Y-%m-%d").date()
+    target = datetime.strptime(return_date, "%Y-%m-%d").date()
+    if target <= depart:
+        raise ValueError("return_date must be after departure_date")
+
+    inventory = inventory or get_flight_inventory()
+    calendar = calendar or get_hotel_calendar()
+    snapshot = snapshot or get_currency_rates().snapshot
+    rate = snapshot.rate("USD", currency)
+    o = resolve_city(origin)
+    d = resolve_city(destination)
+
+    empty = {"bundles": [], "combinations_evaluated": 0, "currency": currency,
+             "exchange_rate": rate, "rates_as_of": snapshot.as_of}
+    out_day = inventory.check_day(departure_date)
+    first_night, _ = calendar.check_stay(departure_date, return_date)
+    if o == d:
+        return empty
+
+    # Stay lengths to consider, clipped to the flight and hotel horizons
+    total_nights = (target - depart).days
+    nights = np.arange(max(1, total_nights - flex_days), total_nights + flex_days + 1)
+    nights = nights[(out_day + nights < inventory.days) & (first_night + nights <= calendar.days)]
+    outbound = inventory.lookup(o, d, out_day, travelers)
+    if len(nights) == 0 or len(outbound) == 0:
+        return empty
+
+    # Return flights padded into a (stay length, flight) matrix
+    returns = [inventory.lookup(d, o, out_day + int(k), travelers) for k in nights]
+    width = max(len(r) for r in returns)
+    if width == 0:
+        return empty
+    ret_pos = np.full((len(nights), width), -1, dtype=np.int64)
+    for i, r in enumerate(returns):
+        ret_pos[i, :len(r)] = r
+    ret_valid = ret_pos >= 0
+    safe_ret = np.where(ret_valid, ret_pos, 0)
+
+    # Rooms: one column slice of the calendar, availability for every stay length
+    # via a running minimum over nights
+    lo, hi = calendar.city_offsets[d], calendar.city_offsets[d + 1]
+    rooms = -(-travelers // calendar.capacity[lo:hi].astype(np.int64))
+    window = calendar.free[first_night:first_night + int(nights[-1]), lo:hi]
+    min_free = np.minimum.accumulate(window, axis=0)[nights - 1]
+    room_ok = min_free >= rooms
+    keep = np.flatnonzero(room_ok.any(axis=0))
+    if len(keep) == 0:
+        return empty
+    room_pos = lo + keep
+    rooms, min_free, room_ok = rooms[keep], min_free[:, keep], room_ok[:, keep]
+
+    out_price = inventory.price[outbound].astype(np.float64)
+    ret_price = np.where(ret_valid, inventory.price[safe_ret].astype(np.float64), np.inf)
+    hotel_price = calendar.price[room_pos].astype(np.float64) * rooms
+    out_arr = (inventory.day[outbound].astype(np.int64) * MINUTES_PER_DAY
+               + inventory.dep_minute[outbound] + inventory.duration[outbound])
+    ret_dep = inventory.day[safe_ret].astype(np.int64) * MINUTES_PER_DAY + inventory.dep_minute[safe_ret]
+
+    flights = (out_price[:, None, None] + ret_price[None, :, :]) * travelers        # (O, K, R)
+    stays = hotel_price[None, :] * nights[:, None]                                 # (K, H)
+    total = (flights[:, :, :, None] + stays[None, :, None, :]) * rate              # (O, K, R, H)
+    valid = (ret_dep[None, :, :] >= out_arr[:, None, None] + MIN_RETURN_GAP_MINUTES) & ret_valid[None]
+    valid = valid[:, :, :, None] & room_ok[None, :, None, :]
+    if budget is not None:
+        valid &= total <= budget
+
+    candidates = np.flatnonzero(valid)
+    best = candidates[rank_page(price_keys(total.ravel()[candidates]), 0, top_n)]
+    oi, ki, ri, hi_ = np.unravel_index(best, total.shape)
+
+    outbound_rows = inventory.rows(outbound[oi])
+    return_rows = inventory.rows(ret_pos[ki, ri])
+    hotel_rows = calendar.rows(room_pos[hi_], min_free[ki, hi_])
+    bundles = []
+    for j in range(len(best)):
+        stay = int(nights[ki[j]])
+        bundles.append({
+            "outbound": outbound_rows[j],
+            "return_flight": return_rows[j],
+            "hotel": hotel_rows[j],
+            "check_in": departure_date,
+            "check_out": (depart + timedelta(days=stay)).isoformat(),
+            "nights": stay,
+            "rooms": int(rooms[hi_[j]]),
+            "flight_cost": round(float(flights[oi[j], ki[j], ri[j]] * rate), 2),
+            "hotel_cost": round(float(stays[ki[j], hi_[j]] * rate), 2),
+            "total_price": round(float(total[oi[j], ki[j], ri[j], hi_[j]]), 2),
+            "currency": currency,
+        })
+
+    return {**empty, "bundles": bundles, "combinations_evaluated": int(valid.size)}